@@ -3,13 +3,36 @@ bl_info = {
     "description": "Non-destructive Curve Extrusion through Geometry Nodes modifier",
     "author": "SplineDynamics",
     "version": (1, 0, 0),
-    "blender": (4, 2, 0),
+    "blender": (4, 3, 0),
     "location" : "Properties > Modifiers > Add Modifier > Spline Dynamics Tools > Extrude Curve (ECM)",    
     "category": "Object",
 }
 
 
+import hashlib
+import json
+import os
+import statistics
+import time
+from array import array
+
 import bpy
+import numpy
+from mathutils import Matrix, Vector
+
+
+ECM_MODIFIER_NAME = "Extrude Curve (ECM)"
+ECM_NODE_GROUP_NAME = "ECM_ExtrudeCurve"
+#prebuilt copy of the node group, written by tools/build_asset.py
+ECM_ASSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "ecm_extrudecurve.blend")
+#bump whenever ecm_build_node_group() changes, groups without a version tag count as 0
+ECM_GRAPH_VERSION = 11
+#Bake node holding the filled caps and wall rings, see ecm_bake_cap_cache()
+ECM_CACHE_NODE_NAME = "Cap Cache"
+#simplify passes over the evaluated curve, each one can halve the point count
+ECM_SIMPLIFY_PASSES = 8
+#default size limit of the geometry cache in MB, see ecm_geometry_cache()
+ECM_GEOMETRY_CACHE_MB = 2048
 
 
 # ------------------------------------------------------------------------
@@ -22,27 +45,238 @@ class ECM_ExtrudeCurve(bpy.types.Operator):
     bl_description = "Create a non-destructive extrusion of curve objects using Geometry Nodes"
     bl_options = {"REGISTER", "UNDO"}
 
+    target: bpy.props.EnumProperty(
+        name="Objects",
+        description="Curve objects that get the modifier",
+        items=(
+            ('SELECTED', "Selected", "Every selected curve object"),
+            ('COLLECTION', "Active Collection", "Every curve object in the active collection and its children"),
+        ),
+        default='SELECTED',
+    )
+    height: bpy.props.FloatProperty(name="Height", description="Extrusion distance in Z", default=1.0)
+    segments: bpy.props.IntProperty(name="Segments", description="Divisions along the extrusion", default=1, min=1, max=1000)
+    viewport_segments: bpy.props.IntProperty(
+        name="Viewport Segments",
+        description="Divisions along the extrusion in the viewport, 0 uses Segments",
+        default=0, min=0, max=1000,
+    )
+    top_cap: bpy.props.BoolProperty(name="Top Cap", description="Close the top end", default=True)
+    bottom_cap: bpy.props.BoolProperty(name="Bottom Cap", description="Close the bottom end", default=True)
+
     def execute(self, context):
-        obj = context.object
-        if obj is None or obj.type != 'CURVE':
+        if self.target == 'COLLECTION':
+            objects = context.collection.all_objects
+        else:
+            objects = list(context.selected_objects)
+            if context.object is not None and context.object not in objects:
+                objects.append(context.object)
+        curves = [obj for obj in objects if obj.type == 'CURVE']
+        if not curves:
             self.report({'ERROR'}, "Please select a curve object")
             return {'CANCELLED'}
 
+        start = time.perf_counter()
         node_group = ecm_extrudecurve_node_group()
-        mod = obj.modifiers.new(name="Extrude Curve (ECM)", type="NODES")
-        mod.node_group = node_group
+        values = {
+            "Height": self.height,
+            "Segments": self.segments,
+            "Viewport Segments": self.viewport_segments,
+            "Top Cap": self.top_cap,
+            "Bottom Cap": self.bottom_cap,
+        }
+        added = 0
+        for obj in curves:
+            if ecm_find_modifier(obj) is not None:
+                continue
+            mod = obj.modifiers.new(name=ECM_MODIFIER_NAME, type="NODES")
+            mod.node_group = node_group
+            ecm_set_modifier_inputs(mod, values)
+            added += 1
+        elapsed = time.perf_counter() - start
+
+        skipped = len(curves) - added
+        rate = added / elapsed if elapsed > 0.0 else float(added)
+        self.report({'INFO'}, "Added ECM to %d object(s), skipped %d already extruded, %.0f objects/s" % (added, skipped, rate))
         return {"FINISHED"}
 
 
+# ------------------------------------------------------------------------
+# Add-on Preferences
+# ------------------------------------------------------------------------
+class ECM_AddonPreferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    link_node_group: bpy.props.BoolProperty(
+        name="Link Node Group",
+        description="Link the bundled node group instead of appending it, so every file shares one "
+                    "datablock. Files then depend on the add-on staying installed at the same location",
+        default=False,
+    )
+    cache_directory: bpy.props.StringProperty(
+        name="Geometry Cache",
+        description="Directory where ECM results are cached for background renders and Bake ECM to Mesh, "
+                    "empty disables the cache. The ECM_CACHE_DIR environment variable overrides it",
+        subtype='DIR_PATH',
+    )
+    cache_size: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Size limit of the geometry cache, the least recently used results are removed first",
+        default=ECM_GEOMETRY_CACHE_MB, min=1,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "link_node_group")
+        layout.prop(self, "cache_directory")
+        layout.prop(self, "cache_size")
+
+
+def ecm_preferences():
+    """Return the add-on preferences, or None when not registered as an add-on"""
+    addon = bpy.context.preferences.addons.get(__package__)
+    return addon.preferences if addon is not None else None
+
+
 # ------------------------------------------------------------------------
 # Geometry Nodes Group Definition
 # ------------------------------------------------------------------------
 def ecm_extrudecurve_node_group():
-    """Return or create the ECM_ExtrudeCurve Geometry Node group"""
-    if "ECM_ExtrudeCurve" in bpy.data.node_groups:
-        return bpy.data.node_groups["ECM_ExtrudeCurve"]
+    """Return the current ECM_ExtrudeCurve Geometry Node group, loading or building it when missing
+
+    Outdated or hand edited copies found in the file are left alone (see
+    ECM_UpgradeModifiers) and a current one is added next to them.
+    """
+    node_group = ecm_current_node_group(ECM_NODE_GROUP_NAME, ECM_GRAPH_VERSION)
+    if node_group is not None:
+        return node_group
+
+    prefs = ecm_preferences()
+    node_group = ecm_load_node_group(link=prefs is not None and prefs.link_node_group)
+    if node_group is not None and ecm_node_group_status(node_group) != 'CURRENT':
+        #the bundled asset was not regenerated after a graph change
+        bpy.data.node_groups.remove(node_group)
+        node_group = None
+    if node_group is None:
+        node_group = ecm_build_node_group()
+    return node_group
+
+
+def ecm_current_node_group(name, version):
+    """Return a node group called ``name`` (or a numbered copy of it) that is current for ``version``, or None"""
+    for node_group in bpy.data.node_groups:
+        if node_group.name.startswith(name) and ecm_node_group_status(node_group, version) == 'CURRENT':
+            return node_group
+    return None
+
+
+#fingerprint check results by node group session_uid, see ecm_node_group_update()
+_ecm_group_status = {}
+
+
+def ecm_node_group_status(node_group, version=ECM_GRAPH_VERSION):
+    """Return 'CURRENT', 'OUTDATED' (older graph version) or 'EDITED' (changed by hand)
+
+    ``version`` is the current graph version of that kind of group, the
+    extrusion group's by default. The version is checked first, the
+    fingerprint is only computed for groups of the current version and
+    remembered for the session until the group is edited. Groups without
+    users are checked every time, edits to them don't reach the depsgraph.
+    """
+    if node_group.get("ecm_version", 0) < version:
+        return 'OUTDATED'
+    status = _ecm_group_status.get(node_group.session_uid)
+    if status is None:
+        status = 'CURRENT' if node_group.get("ecm_fingerprint") == ecm_node_group_fingerprint(node_group) else 'EDITED'
+        if node_group.users:
+            _ecm_group_status[node_group.session_uid] = status
+    return status
 
-    node_group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = "ECM_ExtrudeCurve")
+
+@bpy.app.handlers.persistent
+def ecm_node_group_update(scene, depsgraph):
+    """Forget the status of node groups that changed"""
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.NodeTree):
+            _ecm_group_status.pop(update.id.original.session_uid, None)
+
+
+#node settings that change the result, the node name, type, input values and links cover the rest
+ECM_FINGERPRINT_PROPERTIES = (
+    "mute", "operation", "use_clamp", "data_type", "domain", "mode", "input_type", "count_mode",
+    "target_element", "transform_space", "clamp", "is_active_output",
+)
+#item collections of zone, bake and capture nodes, each item adds a socket
+ECM_FINGERPRINT_ITEMS = ("capture_items", "bake_items", "repeat_items")
+
+
+def _ecm_fingerprint_value(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    try:
+        return tuple(_ecm_fingerprint_value(v) for v in value)
+    except TypeError:
+        return getattr(value, "name", type(value).__name__)
+
+
+def ecm_node_group_fingerprint(node_group):
+    """Hash of everything in the node group that affects its result
+
+    Covers the interface, the node types, the settings listed in
+    ECM_FINGERPRINT_PROPERTIES and ECM_FINGERPRINT_ITEMS, unlinked input
+    values and the links. Node positions, sizes and labels are ignored.
+    """
+    description = []
+    for item in node_group.interface.items_tree:
+        if item.item_type == 'SOCKET':
+            description.append((item.in_out, item.name, item.socket_type,
+                                _ecm_fingerprint_value(getattr(item, "default_value", None))))
+    for node in sorted(node_group.nodes, key=lambda n: n.name):
+        settings = [
+            (identifier, _ecm_fingerprint_value(getattr(node, identifier)))
+            for identifier in ECM_FINGERPRINT_PROPERTIES if hasattr(node, identifier)
+        ]
+        for identifier in ECM_FINGERPRINT_ITEMS:
+            for item in getattr(node, identifier, ()):
+                settings.append((identifier, item.name, getattr(item, "data_type", None),
+                                 getattr(item, "socket_type", None), getattr(item, "attribute_domain", None)))
+        inputs = [
+            (socket.identifier, _ecm_fingerprint_value(getattr(socket, "default_value", None)))
+            for socket in node.inputs if not socket.is_linked
+        ]
+        description.append((node.name, node.bl_idname, settings, inputs))
+    description.extend(sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in node_group.links
+    ))
+    return hashlib.sha1(repr(description).encode("utf-8")).hexdigest()
+
+
+def ecm_load_node_group(link=False):
+    """Append or link the node group from the bundled asset file, None when unavailable"""
+    if not os.path.isfile(ECM_ASSET_PATH):
+        return None
+    try:
+        with bpy.data.libraries.load(ECM_ASSET_PATH, link=link) as (data_from, data_to):
+            if ECM_NODE_GROUP_NAME in data_from.node_groups:
+                data_to.node_groups = [ECM_NODE_GROUP_NAME]
+    except OSError:
+        return None
+    if not data_to.node_groups:
+        return None
+    return data_to.node_groups[0]
+
+
+def ecm_build_node_group():
+    """Create the ECM_ExtrudeCurve Geometry Node group through the Python API
+
+    This is the reference definition of the graph: the bundled asset is
+    generated from it by tools/build_asset.py, and it is used directly
+    whenever the asset is missing.
+    """
+    node_group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = ECM_NODE_GROUP_NAME)
 
     node_group.color_tag = 'NONE'
     node_group.description = ""
@@ -96,6 +330,70 @@ def ecm_extrudecurve_node_group():
     bottom_cap_socket.attribute_domain = 'POINT'
     bottom_cap_socket.description = "Close the bottom end"
 
+    #Panel Topology
+    topology_panel = node_group.interface.new_panel("Topology", default_closed=True)
+    #Socket Instanced Segments
+    instanced_segments_socket = node_group.interface.new_socket(name = "Instanced Segments", in_out='INPUT', socket_type = 'NodeSocketBool', parent = topology_panel)
+    instanced_segments_socket.default_value = False
+    instanced_segments_socket.attribute_domain = 'POINT'
+    instanced_segments_socket.description = "Stack instanced single segment strips and weld them, instead of building the side grid directly"
+
+    #Socket Merge Distance
+    merge_distance_socket = node_group.interface.new_socket(name = "Merge Distance", in_out='INPUT', socket_type = 'NodeSocketFloat', parent = topology_panel)
+    merge_distance_socket.default_value = 0.0010000000474974513
+    merge_distance_socket.min_value = 0.0
+    merge_distance_socket.max_value = 3.4028234663852886e+38
+    merge_distance_socket.subtype = 'DISTANCE'
+    merge_distance_socket.attribute_domain = 'POINT'
+    merge_distance_socket.description = "Distance within which the caps and segments are welded together, kept below half the ring spacing"
+
+    #Socket Weld Seams Only
+    weld_seams_only_socket = node_group.interface.new_socket(name = "Weld Seams Only", in_out='INPUT', socket_type = 'NodeSocketBool', parent = topology_panel)
+    weld_seams_only_socket.default_value = True
+    weld_seams_only_socket.attribute_domain = 'POINT'
+    weld_seams_only_socket.description = "Only weld the rings where caps and segments meet, instead of every vertex"
+
+    #Socket Simplify Tolerance
+    simplify_tolerance_socket = node_group.interface.new_socket(name = "Simplify Tolerance", in_out='INPUT', socket_type = 'NodeSocketFloat', parent = topology_panel)
+    simplify_tolerance_socket.default_value = 0.0
+    simplify_tolerance_socket.min_value = 0.0
+    simplify_tolerance_socket.max_value = 3.4028234663852886e+38
+    simplify_tolerance_socket.subtype = 'DISTANCE'
+    simplify_tolerance_socket.attribute_domain = 'POINT'
+    simplify_tolerance_socket.description = "Remove curve points until the outline moves by up to this distance, 0 keeps every point"
+
+    #Panel Viewport
+    viewport_panel = node_group.interface.new_panel("Viewport", default_closed=True)
+    #Socket Viewport Segments
+    viewport_segments_socket = node_group.interface.new_socket(name = "Viewport Segments", in_out='INPUT', socket_type = 'NodeSocketInt', parent = viewport_panel)
+    viewport_segments_socket.default_value = 0
+    viewport_segments_socket.min_value = 0
+    viewport_segments_socket.max_value = 1000
+    viewport_segments_socket.subtype = 'NONE'
+    viewport_segments_socket.attribute_domain = 'POINT'
+    viewport_segments_socket.description = "Divisions along the extrusion in the viewport, 0 uses Segments. Renders always use Segments"
+
+    #Socket Auto LOD
+    auto_lod_socket = node_group.interface.new_socket(name = "Auto LOD", in_out='INPUT', socket_type = 'NodeSocketBool', parent = viewport_panel)
+    auto_lod_socket.default_value = False
+    auto_lod_socket.attribute_domain = 'POINT'
+    auto_lod_socket.description = "Reduce the viewport segments with the distance to the scene camera"
+
+    #Socket LOD Distance
+    lod_distance_socket = node_group.interface.new_socket(name = "LOD Distance", in_out='INPUT', socket_type = 'NodeSocketFloat', parent = viewport_panel)
+    lod_distance_socket.default_value = 10.0
+    lod_distance_socket.min_value = 0.009999999776482582
+    lod_distance_socket.max_value = 3.4028234663852886e+38
+    lod_distance_socket.subtype = 'DISTANCE'
+    lod_distance_socket.attribute_domain = 'POINT'
+    lod_distance_socket.description = "Camera distance up to which Auto LOD keeps every viewport segment, twice as far keeps half of them"
+
+    #Socket Instanced Preview
+    instanced_preview_socket = node_group.interface.new_socket(name = "Instanced Preview", in_out='INPUT', socket_type = 'NodeSocketBool', parent = viewport_panel)
+    instanced_preview_socket.default_value = False
+    instanced_preview_socket.attribute_domain = 'POINT'
+    instanced_preview_socket.description = "Show the side walls as instances of one shared segment strip in the viewport, without realizing or welding them. Renders build the full mesh"
+
    #initialize node_group nodes
     #node Group Input
     group_input = node_group.nodes.new("NodeGroupInput")
@@ -107,12 +405,23 @@ def ecm_extrudecurve_node_group():
     group_output.is_active_output = True
 
     #node Fill Curve
+    #shared by the side, bottom and top branches so the curve is only triangulated once
     fill_curve = node_group.nodes.new("GeometryNodeFillCurve")
-    fill_curve.label = "Fill Curve - Side"
+    fill_curve.label = "Fill Curve"
     fill_curve.name = "Fill Curve"
     fill_curve.mode = 'NGONS'
-    #Group ID
-    fill_curve.inputs[1].default_value = 0
+
+    #node Cap Cache
+    #only depends on the curve, so baking it skips the fill when Height or Segments change
+    cap_cache = node_group.nodes.new("GeometryNodeBake")
+    cap_cache.label = "Cap Cache"
+    cap_cache.name = ECM_CACHE_NODE_NAME
+    cap_cache.bake_items[0].name = "Fill"
+    #index of the spline whose Height the filled faces take, see Accumulate Field.001,
+    #attribute items are stored on the geometry item above them
+    cap_cache.bake_items.new('INT', "Height Group")
+    cap_cache.bake_items[1].attribute_domain = 'POINT'
+    cap_cache.bake_items.new('GEOMETRY', "Rings")
 
     #node Extrude Mesh
     extrude_mesh = node_group.nodes.new("GeometryNodeExtrudeMesh")
@@ -131,22 +440,6 @@ def ecm_extrudecurve_node_group():
     delete_geometry.domain = 'FACE'
     delete_geometry.mode = 'ALL'
 
-    #node Fill Curve.001
-    fill_curve_001 = node_group.nodes.new("GeometryNodeFillCurve")
-    fill_curve_001.label = "Fill Curve - Bottom"
-    fill_curve_001.name = "Fill Curve.001"
-    fill_curve_001.mode = 'NGONS'
-    #Group ID
-    fill_curve_001.inputs[1].default_value = 0
-
-    #node Fill Curve.002
-    fill_curve_002 = node_group.nodes.new("GeometryNodeFillCurve")
-    fill_curve_002.label = "Fill Curve  - Top"
-    fill_curve_002.name = "Fill Curve.002"
-    fill_curve_002.mode = 'NGONS'
-    #Group ID
-    fill_curve_002.inputs[1].default_value = 0
-
     #node Join Geometry
     join_geometry = node_group.nodes.new("GeometryNodeJoinGeometry")
     join_geometry.name = "Join Geometry"
@@ -182,16 +475,94 @@ def ecm_extrudecurve_node_group():
     merge_by_distance = node_group.nodes.new("GeometryNodeMergeByDistance")
     merge_by_distance.name = "Merge by Distance"
     merge_by_distance.mode = 'ALL'
-    #Selection
-    merge_by_distance.inputs[1].default_value = True
     #Distance
     merge_by_distance.inputs[2].default_value = 0.0010000000474974513
 
+    #node Math.019
+    math_019 = node_group.nodes.new("ShaderNodeMath")
+    math_019.name = "Math.019"
+    math_019.operation = 'ABSOLUTE'
+    math_019.use_clamp = False
+
+    #node Math.020
+    #the weld stays below half of it, Weld Seams Only can't keep the two rings of an instanced strip apart
+    math_020 = node_group.nodes.new("ShaderNodeMath")
+    math_020.label = "Ring Spacing"
+    math_020.name = "Math.020"
+    math_020.operation = 'DIVIDE'
+    math_020.use_clamp = False
+
+    #node Compare.017
+    #flat splines have no rings to keep apart
+    compare_017 = node_group.nodes.new("FunctionNodeCompare")
+    compare_017.name = "Compare.017"
+    compare_017.data_type = 'FLOAT'
+    compare_017.mode = 'ELEMENT'
+    compare_017.operation = 'GREATER_THAN'
+    #B
+    compare_017.inputs[1].default_value = 0.0
+
+    #node Attribute Statistic.002
+    attribute_statistic_002 = node_group.nodes.new("GeometryNodeAttributeStatistic")
+    attribute_statistic_002.label = "Closest Rings"
+    attribute_statistic_002.name = "Attribute Statistic.002"
+    attribute_statistic_002.data_type = 'FLOAT'
+    attribute_statistic_002.domain = 'POINT'
+
+    #node Math.021
+    #the instanced strips are stacked at the mean height
+    math_021 = node_group.nodes.new("ShaderNodeMath")
+    math_021.label = "Strip Height"
+    math_021.name = "Math.021"
+    math_021.operation = 'ABSOLUTE'
+    math_021.use_clamp = False
+
+    #node Math.022
+    math_022 = node_group.nodes.new("ShaderNodeMath")
+    math_022.name = "Math.022"
+    math_022.operation = 'MINIMUM'
+    math_022.use_clamp = False
+
+    #node Switch.013
+    switch_013 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_013.name = "Switch.013"
+    switch_013.input_type = 'FLOAT'
+
+    #node Math.023
+    math_023 = node_group.nodes.new("ShaderNodeMath")
+    math_023.label = "Weld Limit"
+    math_023.name = "Math.023"
+    math_023.operation = 'MULTIPLY'
+    math_023.use_clamp = False
+    #Value_001
+    math_023.inputs[1].default_value = 0.5
+
+    #node Math.024
+    math_024 = node_group.nodes.new("ShaderNodeMath")
+    math_024.name = "Math.024"
+    math_024.operation = 'MINIMUM'
+    math_024.use_clamp = False
+
+    #node Compare.018
+    compare_018 = node_group.nodes.new("FunctionNodeCompare")
+    compare_018.name = "Compare.018"
+    compare_018.data_type = 'FLOAT'
+    compare_018.mode = 'ELEMENT'
+    compare_018.operation = 'GREATER_THAN'
+    #B
+    compare_018.inputs[1].default_value = 0.0
+
+    #node Switch.014
+    #a distance of 0 welds nothing, not even the collapsed rings, so flat outlines keep Merge Distance
+    switch_014 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_014.label = "Weld Distance"
+    switch_014.name = "Switch.014"
+    switch_014.input_type = 'FLOAT'
+
     #node Flip Faces
+    #the bottom cap faces down, unless the height is negative and it becomes the top
     flip_faces = node_group.nodes.new("GeometryNodeFlipFaces")
     flip_faces.name = "Flip Faces"
-    #Selection
-    flip_faces.inputs[1].default_value = True
 
     #node Math
     math = node_group.nodes.new("ShaderNodeMath")
@@ -261,15 +632,9 @@ def ecm_extrudecurve_node_group():
     realize_instances.inputs[3].default_value = 0
 
     #node Flip Faces.001
+    #walls, caps and strips are flipped separately for negative heights, since the height can vary per spline
     flip_faces_001 = node_group.nodes.new("GeometryNodeFlipFaces")
     flip_faces_001.name = "Flip Faces.001"
-    #Selection
-    flip_faces_001.inputs[1].default_value = True
-
-    #node Switch.002
-    switch_002 = node_group.nodes.new("GeometryNodeSwitch")
-    switch_002.name = "Switch.002"
-    switch_002.input_type = 'GEOMETRY'
 
     #node Compare.001
     compare_001 = node_group.nodes.new("FunctionNodeCompare")
@@ -280,21 +645,818 @@ def ecm_extrudecurve_node_group():
     #B
     compare_001.inputs[1].default_value = 0.0
 
+    #node Boolean Math
+    #either cap is on
+    boolean_math = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math.name = "Boolean Math"
+    boolean_math.operation = 'OR'
+
+    #node Resample Curve
+    resample_curve = node_group.nodes.new("GeometryNodeResampleCurve")
+    resample_curve.name = "Resample Curve"
+    resample_curve.mode = 'EVALUATED'
+    #Selection
+    resample_curve.inputs[1].default_value = True
+
+    #node Transform Geometry
+    #Fill Curve works in 2D, flatten the rings the same way
+    transform_geometry = node_group.nodes.new("GeometryNodeTransform")
+    transform_geometry.name = "Transform Geometry"
+    #Translation
+    transform_geometry.inputs[1].default_value = (0.0, 0.0, 0.0)
+    #Rotation
+    transform_geometry.inputs[2].default_value = (0.0, 0.0, 0.0)
+    #Scale
+    transform_geometry.inputs[3].default_value = (1.0, 1.0, 0.0)
+
+    #node Set Spline Cyclic
+    #Fill Curve closes open splines, so the walls have to as well
+    set_spline_cyclic = node_group.nodes.new("GeometryNodeSetSplineCyclic")
+    set_spline_cyclic.name = "Set Spline Cyclic"
+    #Selection
+    set_spline_cyclic.inputs[1].default_value = True
+    #Cyclic
+    set_spline_cyclic.inputs[2].default_value = True
+
+    #node Position
+    position = node_group.nodes.new("GeometryNodeInputPosition")
+    position.name = "Position"
+
+    #node Curve Tangent
+    curve_tangent = node_group.nodes.new("GeometryNodeInputTangent")
+    curve_tangent.name = "Curve Tangent"
+
+    #node Vector Math.001
+    vector_math_001 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_001.name = "Vector Math.001"
+    vector_math_001.operation = 'CROSS_PRODUCT'
+    #Vector
+    vector_math_001.inputs[0].default_value = (0.0, 0.0, 1.0)
+
+    #node Bounding Box
+    bounding_box = node_group.nodes.new("GeometryNodeBoundBox")
+    bounding_box.name = "Bounding Box"
+
+    #node Vector Math.012
+    vector_math_012 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_012.name = "Vector Math.012"
+    vector_math_012.operation = 'DISTANCE'
+
+    #node Math.017
+    #a fixed step misses the fill on large outlines and drowns in float error on small ones
+    math_017 = node_group.nodes.new("ShaderNodeMath")
+    math_017.label = "Side Offset"
+    math_017.name = "Math.017"
+    math_017.operation = 'MULTIPLY'
+    math_017.use_clamp = False
+    #Value_001
+    math_017.inputs[1].default_value = 9.999999747378752e-06
+
+    #node Math.018
+    math_018 = node_group.nodes.new("ShaderNodeMath")
+    math_018.name = "Math.018"
+    math_018.operation = 'MULTIPLY'
+    math_018.use_clamp = False
+    #Value_001
+    math_018.inputs[1].default_value = 0.5
+
+    #node Vector Math.002
+    vector_math_002 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_002.name = "Vector Math.002"
+    vector_math_002.operation = 'SCALE'
+
+    #node Vector Math.003
+    vector_math_003 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_003.name = "Vector Math.003"
+    vector_math_003.operation = 'ADD'
+
+    #node Geometry Proximity
+    #the fill tells on which side of each spline the solid lies, holes included
+    geometry_proximity = node_group.nodes.new("GeometryNodeProximity")
+    geometry_proximity.name = "Geometry Proximity"
+    geometry_proximity.target_element = 'FACES'
+
+    #node Compare.003
+    compare_003 = node_group.nodes.new("FunctionNodeCompare")
+    compare_003.label = "Solid on Left"
+    compare_003.name = "Compare.003"
+    compare_003.data_type = 'FLOAT'
+    compare_003.mode = 'ELEMENT'
+    compare_003.operation = 'LESS_THAN'
+
+    #node Capture Attribute.001
+    #Evaluate on Domain would read Position at the spline's middle, average the per point results instead
+    capture_attribute_001 = node_group.nodes.new("GeometryNodeCaptureAttribute")
+    capture_attribute_001.label = "Solid Side"
+    capture_attribute_001.name = "Capture Attribute.001"
+    capture_attribute_001.capture_items.new('FLOAT', "Value")
+    capture_attribute_001.domain = 'POINT'
+
+    #node Evaluate on Domain.001
+    evaluate_on_domain_001 = node_group.nodes.new("GeometryNodeFieldOnDomain")
+    evaluate_on_domain_001.name = "Evaluate on Domain.001"
+    evaluate_on_domain_001.data_type = 'FLOAT'
+    evaluate_on_domain_001.domain = 'CURVE'
+
+    #node Compare.004
+    compare_004 = node_group.nodes.new("FunctionNodeCompare")
+    compare_004.label = "Reverse Spline"
+    compare_004.name = "Compare.004"
+    compare_004.data_type = 'FLOAT'
+    compare_004.mode = 'ELEMENT'
+    compare_004.operation = 'LESS_THAN'
+    #B
+    compare_004.inputs[1].default_value = 0.5
+
+    #node Reverse Curve
+    #the grid walls face to the right of the spline direction, keep the solid on the left
+    reverse_curve = node_group.nodes.new("GeometryNodeReverseCurve")
+    reverse_curve.name = "Reverse Curve"
+
+    #node Mesh Line.001
+    #one point per ring of the side grid, all at the origin so the rings sit on the curve
+    mesh_line_001 = node_group.nodes.new("GeometryNodeMeshLine")
+    mesh_line_001.name = "Mesh Line.001"
+    mesh_line_001.mode = 'OFFSET'
+    #Start Location
+    mesh_line_001.inputs[2].default_value = (0.0, 0.0, 0.0)
+    #Offset
+    mesh_line_001.inputs[3].default_value = (0.0, 0.0, 0.0)
+
+    #node Mesh to Curve
+    mesh_to_curve = node_group.nodes.new("GeometryNodeMeshToCurve")
+    mesh_to_curve.name = "Mesh to Curve"
+    #Selection
+    mesh_to_curve.inputs[1].default_value = True
+
+    #node Index.001
+    index_001 = node_group.nodes.new("GeometryNodeInputIndex")
+    index_001.name = "Index.001"
+
+    #node Math.002
+    math_002 = node_group.nodes.new("ShaderNodeMath")
+    math_002.name = "Math.002"
+    math_002.operation = 'DIVIDE'
+    math_002.use_clamp = False
+
+    #node Math.003
+    #rings run from the top down, which makes the quads face outwards
+    math_003 = node_group.nodes.new("ShaderNodeMath")
+    math_003.name = "Math.003"
+    math_003.operation = 'SUBTRACT'
+    math_003.use_clamp = False
+    #Value
+    math_003.inputs[0].default_value = 1.0
+
+    #node Capture Attribute
+    capture_attribute = node_group.nodes.new("GeometryNodeCaptureAttribute")
+    capture_attribute.label = "Ring Factor"
+    capture_attribute.name = "Capture Attribute"
+    capture_attribute.capture_items.new('FLOAT', "Value")
+    capture_attribute.domain = 'POINT'
+
+    #node Curve to Mesh.001
+    curve_to_mesh_001 = node_group.nodes.new("GeometryNodeCurveToMesh")
+    curve_to_mesh_001.label = "Side Grid"
+    curve_to_mesh_001.name = "Curve to Mesh.001"
+    #Fill Caps
+    curve_to_mesh_001.inputs[2].default_value = False
+
+    #node Separate XYZ.001
+    separate_xyz_001 = node_group.nodes.new("ShaderNodeSeparateXYZ")
+    separate_xyz_001.name = "Separate XYZ.001"
+
+    #node Math.004
+    math_004 = node_group.nodes.new("ShaderNodeMath")
+    math_004.name = "Math.004"
+    math_004.operation = 'MULTIPLY'
+    math_004.use_clamp = False
+
+    #node Combine XYZ.002
+    combine_xyz_002 = node_group.nodes.new("ShaderNodeCombineXYZ")
+    combine_xyz_002.name = "Combine XYZ.002"
+
+    #node Set Position
+    set_position = node_group.nodes.new("GeometryNodeSetPosition")
+    set_position.name = "Set Position"
+    #Selection
+    set_position.inputs[1].default_value = True
+    #Offset
+    set_position.inputs[3].default_value = (0.0, 0.0, 0.0)
+
+    #node Switch.005
+    switch_005 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_005.label = "Side Topology"
+    switch_005.name = "Switch.005"
+    switch_005.input_type = 'GEOMETRY'
+
+    #node Boolean Math.001
+    #the grid walls come out connected, only caps or instanced strips need welding
+    boolean_math_001 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_001.name = "Boolean Math.001"
+    boolean_math_001.operation = 'OR'
+
+    #node Switch.006
+    switch_006 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_006.label = "Weld"
+    switch_006.name = "Switch.006"
+    switch_006.input_type = 'GEOMETRY'
+
+    #node Compare.005
+    #the ring factor is 1 on the top and 0 on the bottom ring of the side grid, caps and strips don't carry it
+    compare_005 = node_group.nodes.new("FunctionNodeCompare")
+    compare_005.name = "Compare.005"
+    compare_005.data_type = 'FLOAT'
+    compare_005.mode = 'ELEMENT'
+    compare_005.operation = 'GREATER_THAN'
+    #B
+    compare_005.inputs[1].default_value = 0.0
+
+    #node Compare.006
+    compare_006 = node_group.nodes.new("FunctionNodeCompare")
+    compare_006.name = "Compare.006"
+    compare_006.data_type = 'FLOAT'
+    compare_006.mode = 'ELEMENT'
+    compare_006.operation = 'LESS_THAN'
+    #B
+    compare_006.inputs[1].default_value = 1.0
+
+    #node Boolean Math.002
+    boolean_math_002 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_002.label = "Seam"
+    boolean_math_002.name = "Boolean Math.002"
+    boolean_math_002.operation = 'NAND'
+
+    #node Boolean Math.003
+    boolean_math_003 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_003.name = "Boolean Math.003"
+    boolean_math_003.operation = 'IMPLY'
+
+    #node Is Viewport
+    is_viewport = node_group.nodes.new("GeometryNodeIsViewport")
+    is_viewport.name = "Is Viewport"
+
+    #node Compare.007
+    compare_007 = node_group.nodes.new("FunctionNodeCompare")
+    compare_007.name = "Compare.007"
+    compare_007.data_type = 'INT'
+    compare_007.mode = 'ELEMENT'
+    compare_007.operation = 'GREATER_THAN'
+    #B_INT
+    compare_007.inputs[3].default_value = 0
+
+    #node Switch.007
+    switch_007 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_007.label = "Viewport Base"
+    switch_007.name = "Switch.007"
+    switch_007.input_type = 'INT'
+
+    #node Active Camera
+    active_camera = node_group.nodes.new("GeometryNodeInputActiveCamera")
+    active_camera.name = "Active Camera"
+
+    #node Object Info
+    #relative to the modified object, so the location is the camera offset in its local space
+    object_info = node_group.nodes.new("GeometryNodeObjectInfo")
+    object_info.name = "Object Info"
+    object_info.transform_space = 'RELATIVE'
+    #As Instance
+    object_info.inputs[1].default_value = False
+
+    #node Vector Math.004
+    vector_math_004 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_004.name = "Vector Math.004"
+    vector_math_004.operation = 'LENGTH'
+
+    #node Math.005
+    #keeps the division finite when the camera sits on the object origin
+    math_005 = node_group.nodes.new("ShaderNodeMath")
+    math_005.name = "Math.005"
+    math_005.operation = 'MAXIMUM'
+    math_005.use_clamp = False
+    #Value_001
+    math_005.inputs[1].default_value = 0.0010000000474974513
+
+    #node Math.006
+    math_006 = node_group.nodes.new("ShaderNodeMath")
+    math_006.label = "LOD Factor"
+    math_006.name = "Math.006"
+    math_006.operation = 'DIVIDE'
+    math_006.use_clamp = True
+
+    #node Math.007
+    math_007 = node_group.nodes.new("ShaderNodeMath")
+    math_007.name = "Math.007"
+    math_007.operation = 'MULTIPLY'
+    math_007.use_clamp = False
+
+    #node Math.008
+    #never drops below one segment since the factor stays above 0
+    math_008 = node_group.nodes.new("ShaderNodeMath")
+    math_008.name = "Math.008"
+    math_008.operation = 'CEIL'
+    math_008.use_clamp = False
+
+    #node Switch.008
+    switch_008 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_008.label = "Auto LOD"
+    switch_008.name = "Switch.008"
+    switch_008.input_type = 'INT'
+
+    #node Switch.009
+    #every node that used the Segments input reads the effective count from here
+    switch_009 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_009.label = "Effective Segments"
+    switch_009.name = "Switch.009"
+    switch_009.input_type = 'INT'
+
+    #node Sample Index
+    #Fill Curve drops every attribute, so the faces read Height back from the spline their group started with
+    sample_index = node_group.nodes.new("GeometryNodeSampleIndex")
+    sample_index.label = "Cap Height"
+    sample_index.name = "Sample Index"
+    sample_index.clamp = False
+    sample_index.data_type = 'FLOAT'
+    sample_index.domain = 'CURVE'
+
+    #node Attribute Statistic
+    #single values for the nodes that can't take a field: the profile and the instanced path
+    attribute_statistic = node_group.nodes.new("GeometryNodeAttributeStatistic")
+    attribute_statistic.label = "Segments Range"
+    attribute_statistic.name = "Attribute Statistic"
+    attribute_statistic.data_type = 'FLOAT'
+    attribute_statistic.domain = 'POINT'
+    #Selection
+    attribute_statistic.inputs[1].default_value = True
+
+    #node Attribute Statistic.001
+    attribute_statistic_001 = node_group.nodes.new("GeometryNodeAttributeStatistic")
+    attribute_statistic_001.label = "Mean Height"
+    attribute_statistic_001.name = "Attribute Statistic.001"
+    attribute_statistic_001.data_type = 'FLOAT'
+    attribute_statistic_001.domain = 'POINT'
+    #Selection
+    attribute_statistic_001.inputs[1].default_value = True
+
+    #node Math.012
+    math_012 = node_group.nodes.new("ShaderNodeMath")
+    math_012.name = "Math.012"
+    math_012.operation = 'MULTIPLY'
+    math_012.use_clamp = False
+    #Value_001
+    math_012.inputs[1].default_value = 1000.0
+
+    #node Math.013
+    #splines of different heights are filled apart, holes still cut the outline of the same height
+    math_013 = node_group.nodes.new("ShaderNodeMath")
+    math_013.label = "Height Key"
+    math_013.name = "Math.013"
+    math_013.operation = 'ROUND'
+    math_013.use_clamp = False
+
+    #node Hash Value
+    #hashed as a float, an int cast of large heights would overflow, seeded with the object so that
+    #the objects of a collection are filled apart. The node is new in Blender 4.3, the add-on's minimum
+    hash_value = node_group.nodes.new("FunctionNodeHashValue")
+    hash_value.name = "Hash Value"
+    hash_value.data_type = 'FLOAT'
+
+    #node Accumulate Field
+    accumulate_field = node_group.nodes.new("GeometryNodeAccumulateField")
+    accumulate_field.name = "Accumulate Field"
+    accumulate_field.data_type = 'INT'
+    accumulate_field.domain = 'CURVE'
+    #Value
+    accumulate_field.inputs[0].default_value = 1
+
+    #node Compare.016
+    compare_016 = node_group.nodes.new("FunctionNodeCompare")
+    compare_016.label = "First of Height"
+    compare_016.name = "Compare.016"
+    compare_016.data_type = 'INT'
+    compare_016.mode = 'ELEMENT'
+    compare_016.operation = 'EQUAL'
+    #B_INT
+    compare_016.inputs[3].default_value = 0
+
+    #node Index.002
+    index_002 = node_group.nodes.new("GeometryNodeInputIndex")
+    index_002.name = "Index.002"
+
+    #node Switch.012
+    switch_012 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_012.name = "Switch.012"
+    switch_012.input_type = 'INT'
+    #False
+    switch_012.inputs[1].default_value = 0
+
+    #node Accumulate Field.001
+    #index of the first spline of each height, a group ID that stays in range however many heights there are
+    accumulate_field_001 = node_group.nodes.new("GeometryNodeAccumulateField")
+    accumulate_field_001.label = "Height Group"
+    accumulate_field_001.name = "Accumulate Field.001"
+    accumulate_field_001.data_type = 'INT'
+    accumulate_field_001.domain = 'CURVE'
+
+    #node Split to Instances
+    #one instance per height group, the group index survives the fill as an instance attribute
+    split_to_instances = node_group.nodes.new("GeometryNodeSplitToInstances")
+    split_to_instances.name = "Split to Instances"
+    split_to_instances.domain = 'CURVE'
+    #Selection
+    split_to_instances.inputs[1].default_value = True
+
+    #node Store Named Attribute
+    #Fill Curve drops anonymous attributes of the instances, named ones are kept
+    store_named_attribute = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute.name = "Store Named Attribute"
+    store_named_attribute.data_type = 'INT'
+    store_named_attribute.domain = 'INSTANCE'
+    #Selection
+    store_named_attribute.inputs[1].default_value = True
+    #Name
+    store_named_attribute.inputs[2].default_value = "ecm_height_group"
+
+    #node Named Attribute
+    named_attribute = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute.name = "Named Attribute"
+    named_attribute.data_type = 'INT'
+    #Name
+    named_attribute.inputs[0].default_value = "ecm_height_group"
+
+    #node Remove Named Attribute
+    #the cache keeps the group as a bake item, the mesh leaves without it
+    remove_named_attribute = node_group.nodes.new("GeometryNodeRemoveAttribute")
+    remove_named_attribute.name = "Remove Named Attribute"
+    remove_named_attribute.pattern_mode = 'EXACT'
+    #Name
+    remove_named_attribute.inputs[1].default_value = "ecm_height_group"
+
+    #node Realize Instances.001
+    realize_instances_001 = node_group.nodes.new("GeometryNodeRealizeInstances")
+    realize_instances_001.name = "Realize Instances.001"
+    #Selection
+    realize_instances_001.inputs[1].default_value = True
+    #Realize All
+    realize_instances_001.inputs[2].default_value = True
+    #Depth
+    realize_instances_001.inputs[3].default_value = 0
+
+    #node Named Attribute.001
+    #set by the collection group on every curve of one object, 0 everywhere otherwise
+    named_attribute_001 = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute_001.label = "Object"
+    named_attribute_001.name = "Named Attribute.001"
+    named_attribute_001.data_type = 'INT'
+    #Name
+    named_attribute_001.inputs[0].default_value = "ecm_object"
+
+    #node Sample Index.001
+    sample_index_001 = node_group.nodes.new("GeometryNodeSampleIndex")
+    sample_index_001.name = "Sample Index.001"
+    sample_index_001.clamp = False
+    sample_index_001.data_type = 'INT'
+    sample_index_001.domain = 'CURVE'
+
+    #node Store Named Attribute.001
+    #the walls inherit the object from the rings, the caps get it back like Height
+    store_named_attribute_001 = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute_001.name = "Store Named Attribute.001"
+    store_named_attribute_001.data_type = 'INT'
+    store_named_attribute_001.domain = 'POINT'
+    #Selection
+    store_named_attribute_001.inputs[1].default_value = True
+    #Name
+    store_named_attribute_001.inputs[2].default_value = "ecm_object"
+
+    #node Split to Instances.001
+    #Merge by Distance works on every instance on its own, so objects touching each other aren't welded together
+    split_to_instances_001 = node_group.nodes.new("GeometryNodeSplitToInstances")
+    split_to_instances_001.name = "Split to Instances.001"
+    split_to_instances_001.domain = 'POINT'
+    #Selection
+    split_to_instances_001.inputs[1].default_value = True
+
+    #node Realize Instances.002
+    realize_instances_002 = node_group.nodes.new("GeometryNodeRealizeInstances")
+    realize_instances_002.name = "Realize Instances.002"
+    #Selection
+    realize_instances_002.inputs[1].default_value = True
+    #Realize All
+    realize_instances_002.inputs[2].default_value = True
+    #Depth
+    realize_instances_002.inputs[3].default_value = 0
+
+    #node Remove Named Attribute.001
+    remove_named_attribute_001 = node_group.nodes.new("GeometryNodeRemoveAttribute")
+    remove_named_attribute_001.name = "Remove Named Attribute.001"
+    remove_named_attribute_001.pattern_mode = 'EXACT'
+    #Name
+    remove_named_attribute_001.inputs[1].default_value = "ecm_object"
+
+    #node Math.014
+    math_014 = node_group.nodes.new("ShaderNodeMath")
+    math_014.label = "Ring Index"
+    math_014.name = "Math.014"
+    math_014.operation = 'MULTIPLY'
+    math_014.use_clamp = False
+
+    #node Math.015
+    math_015 = node_group.nodes.new("ShaderNodeMath")
+    math_015.name = "Math.015"
+    math_015.operation = 'MAXIMUM'
+    math_015.use_clamp = False
+    #Value_001
+    math_015.inputs[1].default_value = 1.0
+
+    #node Math.016
+    #rings above the spline's own segment count collapse onto its top ring and get welded away
+    math_016 = node_group.nodes.new("ShaderNodeMath")
+    math_016.label = "Spline Ring Factor"
+    math_016.name = "Math.016"
+    math_016.operation = 'DIVIDE'
+    math_016.use_clamp = True
+
+    #node Compare.012
+    compare_012 = node_group.nodes.new("FunctionNodeCompare")
+    compare_012.name = "Compare.012"
+    compare_012.data_type = 'FLOAT'
+    compare_012.mode = 'ELEMENT'
+    compare_012.operation = 'LESS_THAN'
+    #B
+    compare_012.inputs[1].default_value = 0.0
+
+    #node Compare.013
+    compare_013 = node_group.nodes.new("FunctionNodeCompare")
+    compare_013.name = "Compare.013"
+    compare_013.data_type = 'FLOAT'
+    compare_013.mode = 'ELEMENT'
+    compare_013.operation = 'LESS_THAN'
+    #B
+    compare_013.inputs[1].default_value = 0.0
+
+    #node Compare.014
+    compare_014 = node_group.nodes.new("FunctionNodeCompare")
+    compare_014.name = "Compare.014"
+    compare_014.data_type = 'FLOAT'
+    compare_014.mode = 'ELEMENT'
+    compare_014.operation = 'GREATER_EQUAL'
+    #B
+    compare_014.inputs[1].default_value = 0.0
+
+    #node Compare.015
+    compare_015 = node_group.nodes.new("FunctionNodeCompare")
+    compare_015.label = "Mixed Segments"
+    compare_015.name = "Compare.015"
+    compare_015.data_type = 'FLOAT'
+    compare_015.mode = 'ELEMENT'
+    compare_015.operation = 'LESS_THAN'
+
+    #node Boolean Math.007
+    boolean_math_007 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_007.name = "Boolean Math.007"
+    boolean_math_007.operation = 'OR'
+
+    #node Flip Faces.002
+    flip_faces_002 = node_group.nodes.new("GeometryNodeFlipFaces")
+    flip_faces_002.name = "Flip Faces.002"
+
+    #node Flip Faces.003
+    flip_faces_003 = node_group.nodes.new("GeometryNodeFlipFaces")
+    flip_faces_003.name = "Flip Faces.003"
+
+    #node Compare.008
+    compare_008 = node_group.nodes.new("FunctionNodeCompare")
+    compare_008.name = "Compare.008"
+    compare_008.data_type = 'FLOAT'
+    compare_008.mode = 'ELEMENT'
+    compare_008.operation = 'GREATER_THAN'
+    #B
+    compare_008.inputs[1].default_value = 0.0
+
+    #node Switch.010
+    #a tolerance of 0 skips the zone entirely
+    switch_010 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_010.label = "Simplify Passes"
+    switch_010.name = "Switch.010"
+    switch_010.input_type = 'INT'
+    #False
+    switch_010.inputs[1].default_value = 0
+    #True
+    switch_010.inputs[2].default_value = ECM_SIMPLIFY_PASSES
+
+    #node Math.009
+    #the passes add up to the tolerance at most, so the result never strays further from the curve
+    math_009 = node_group.nodes.new("ShaderNodeMath")
+    math_009.label = "Pass Tolerance"
+    math_009.name = "Math.009"
+    math_009.operation = 'DIVIDE'
+    math_009.use_clamp = False
+    #Value_001
+    math_009.inputs[1].default_value = float(ECM_SIMPLIFY_PASSES)
+
+    #node Repeat Input
+    repeat_input = node_group.nodes.new("GeometryNodeRepeatInput")
+    repeat_input.name = "Repeat Input"
+    #node Repeat Output
+    repeat_output = node_group.nodes.new("GeometryNodeRepeatOutput")
+    repeat_output.label = "Simplify"
+    repeat_output.name = "Repeat Output"
+    repeat_output.active_index = 0
+    repeat_output.inspection_index = 0
+    repeat_output.repeat_items.clear()
+    # Create item "Geometry"
+    repeat_output.repeat_items.new('GEOMETRY', "Geometry")
+    repeat_input.pair_with_output(repeat_output)
+
+    #node Position.001
+    position_001 = node_group.nodes.new("GeometryNodeInputPosition")
+    position_001.name = "Position.001"
+
+    #node Offset Point in Curve.001
+    offset_point_in_curve_001 = node_group.nodes.new("GeometryNodeOffsetPointInCurve")
+    offset_point_in_curve_001.name = "Offset Point in Curve.001"
+    #Offset
+    offset_point_in_curve_001.inputs[1].default_value = -1
+
+    #node Offset Point in Curve.002
+    offset_point_in_curve_002 = node_group.nodes.new("GeometryNodeOffsetPointInCurve")
+    offset_point_in_curve_002.name = "Offset Point in Curve.002"
+    #Offset
+    offset_point_in_curve_002.inputs[1].default_value = 1
+
+    #node Evaluate at Index.001
+    evaluate_at_index_001 = node_group.nodes.new("GeometryNodeFieldAtIndex")
+    evaluate_at_index_001.label = "Previous"
+    evaluate_at_index_001.name = "Evaluate at Index.001"
+    evaluate_at_index_001.data_type = 'FLOAT_VECTOR'
+    evaluate_at_index_001.domain = 'POINT'
+
+    #node Evaluate at Index.002
+    evaluate_at_index_002 = node_group.nodes.new("GeometryNodeFieldAtIndex")
+    evaluate_at_index_002.label = "Next"
+    evaluate_at_index_002.name = "Evaluate at Index.002"
+    evaluate_at_index_002.data_type = 'FLOAT_VECTOR'
+    evaluate_at_index_002.domain = 'POINT'
+
+    #node Vector Math.005
+    vector_math_005 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_005.name = "Vector Math.005"
+    vector_math_005.operation = 'SUBTRACT'
+
+    #node Vector Math.006
+    vector_math_006 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_006.name = "Vector Math.006"
+    vector_math_006.operation = 'SUBTRACT'
+
+    #node Vector Math.007
+    vector_math_007 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_007.name = "Vector Math.007"
+    vector_math_007.operation = 'DOT_PRODUCT'
+
+    #node Vector Math.008
+    vector_math_008 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_008.name = "Vector Math.008"
+    vector_math_008.operation = 'DOT_PRODUCT'
+
+    #node Math.010
+    #clamped, so the distance is to the segment between the neighbours and not to its line
+    math_010 = node_group.nodes.new("ShaderNodeMath")
+    math_010.name = "Math.010"
+    math_010.operation = 'DIVIDE'
+    math_010.use_clamp = True
+
+    #node Vector Math.009
+    vector_math_009 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_009.name = "Vector Math.009"
+    vector_math_009.operation = 'SCALE'
+
+    #node Vector Math.010
+    vector_math_010 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_010.name = "Vector Math.010"
+    vector_math_010.operation = 'ADD'
+
+    #node Vector Math.011
+    vector_math_011 = node_group.nodes.new("ShaderNodeVectorMath")
+    vector_math_011.label = "Deviation"
+    vector_math_011.name = "Vector Math.011"
+    vector_math_011.operation = 'DISTANCE'
+
+    #node Compare.009
+    compare_009 = node_group.nodes.new("FunctionNodeCompare")
+    compare_009.name = "Compare.009"
+    compare_009.data_type = 'FLOAT'
+    compare_009.mode = 'ELEMENT'
+    compare_009.operation = 'LESS_EQUAL'
+
+    #node Spline Parameter
+    spline_parameter = node_group.nodes.new("GeometryNodeSplineParameter")
+    spline_parameter.name = "Spline Parameter"
+
+    #node Math.011
+    #only every other point is a candidate, so the neighbours used to measure it are kept
+    math_011 = node_group.nodes.new("ShaderNodeMath")
+    math_011.name = "Math.011"
+    math_011.operation = 'FLOORED_MODULO'
+    math_011.use_clamp = False
+    #Value_001
+    math_011.inputs[1].default_value = 2.0
+
+    #node Compare.010
+    compare_010 = node_group.nodes.new("FunctionNodeCompare")
+    compare_010.label = "Odd"
+    compare_010.name = "Compare.010"
+    compare_010.data_type = 'FLOAT'
+    compare_010.mode = 'ELEMENT'
+    compare_010.operation = 'GREATER_THAN'
+    #B
+    compare_010.inputs[1].default_value = 0.5
+
+    #node Spline Length
+    spline_length = node_group.nodes.new("GeometryNodeSplineLength")
+    spline_length.name = "Spline Length"
+
+    #node Compare.011
+    #a spline of 5 points keeps at least 3
+    compare_011 = node_group.nodes.new("FunctionNodeCompare")
+    compare_011.name = "Compare.011"
+    compare_011.data_type = 'INT'
+    compare_011.mode = 'ELEMENT'
+    compare_011.operation = 'GREATER_THAN'
+    #B_INT
+    compare_011.inputs[3].default_value = 4
+
+    #node Boolean Math.004
+    boolean_math_004 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_004.name = "Boolean Math.004"
+    boolean_math_004.operation = 'AND'
+
+    #node Boolean Math.005
+    boolean_math_005 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_005.name = "Boolean Math.005"
+    boolean_math_005.operation = 'AND'
+
+    #node Boolean Math.006
+    #the last point of an open spline has no next point and stays
+    boolean_math_006 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_006.name = "Boolean Math.006"
+    boolean_math_006.operation = 'AND'
+
+    #node Delete Geometry.002
+    delete_geometry_002 = node_group.nodes.new("GeometryNodeDeleteGeometry")
+    delete_geometry_002.name = "Delete Geometry.002"
+    delete_geometry_002.domain = 'POINT'
+    delete_geometry_002.mode = 'ALL'
+
+    #node Boolean Math.008
+    boolean_math_008 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_008.label = "Keep Instances"
+    boolean_math_008.name = "Boolean Math.008"
+    boolean_math_008.operation = 'AND'
+
+    #node Boolean Math.009
+    boolean_math_009 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_009.name = "Boolean Math.009"
+    boolean_math_009.operation = 'OR'
+
+    #node Switch.011
+    #instances of the one strip stay unrealized in the preview
+    switch_011 = node_group.nodes.new("GeometryNodeSwitch")
+    switch_011.label = "Realize"
+    switch_011.name = "Switch.011"
+    switch_011.input_type = 'GEOMETRY'
+
+    #node Boolean Math.010
+    #the weld would only see the caps, instances are left alone
+    boolean_math_010 = node_group.nodes.new("FunctionNodeBooleanMath")
+    boolean_math_010.name = "Boolean Math.010"
+    boolean_math_010.operation = 'NIMPLY'
+
     
     #Set locations
     group_input.location = (-914.1019287109375, -214.44473266601562)
     group_output.location = (2496.602294921875, -107.43557739257812)
     fill_curve.location = (-410.20501708984375, 43.73919677734375)
+    cap_cache.location = (-200.0, 160.0)
     extrude_mesh.location = (62.53750991821289, 86.04241180419922)
     delete_geometry.location = (288.0355529785156, 96.89566040039062)
-    fill_curve_001.location = (-135.30230712890625, -231.11346435546875)
-    fill_curve_002.location = (-136.7638702392578, -394.2537841796875)
     join_geometry.location = (1657.5579833984375, -56.1291389465332)
     switch.location = (327.56903076171875, -109.78105926513672)
     switch_001.location = (463.58636474609375, -290.51336669921875)
     extrude_mesh_001.location = (47.495262145996094, -382.26019287109375)
     delete_geometry_001.location = (262.5473937988281, -360.5662841796875)
     merge_by_distance.location = (1887.29931640625, -72.58911895751953)
+    math_019.location = (1247.0, -620.0)
+    math_020.location = (1407.0, -620.0)
+    compare_017.location = (1567.0, -560.0)
+    attribute_statistic_002.location = (1567.0, -700.0)
+    math_021.location = (1407.0, -780.0)
+    math_022.location = (1727.0, -760.0)
+    switch_013.location = (1887.0, -700.0)
+    math_023.location = (2047.0, -700.0)
+    math_024.location = (2207.0, -760.0)
+    compare_018.location = (2207.0, -620.0)
+    switch_014.location = (2367.0, -660.0)
     flip_faces.location = (128.00955200195312, -227.7783203125)
     math.location = (-206.6744842529297, -40.98670959472656)
     instance_on_points.location = (1271.6912841796875, 255.62095642089844)
@@ -305,24 +1467,146 @@ def ecm_extrudecurve_node_group():
     compare.location = (1028.47705078125, 99.3311767578125)
     index.location = (767.3814086914062, 80.76202392578125)
     realize_instances.location = (1477.8134765625, 130.27734375)
-    flip_faces_001.location = (2119.72802734375, -260.9518127441406)
-    switch_002.location = (2295.09228515625, -103.82646179199219)
-    compare_001.location = (1890.8580322265625, -255.4117431640625)
+    flip_faces_001.location = (1460.0, 280.0)
+    compare_001.location = (1260.0, 200.0)
+    boolean_math.location = (-206.6744842529297, -520.0)
+    resample_curve.location = (-640.0, 320.0)
+    transform_geometry.location = (-440.0, 320.0)
+    set_spline_cyclic.location = (-240.0, 320.0)
+    position.location = (-240.0, 900.0)
+    curve_tangent.location = (-240.0, 800.0)
+    vector_math_001.location = (-40.0, 800.0)
+    vector_math_002.location = (160.0, 800.0)
+    vector_math_003.location = (360.0, 800.0)
+    geometry_proximity.location = (560.0, 800.0)
+    compare_003.location = (760.0, 800.0)
+    bounding_box.location = (-240.0, 1040.0)
+    vector_math_012.location = (-40.0, 1040.0)
+    math_017.location = (160.0, 1040.0)
+    math_018.location = (560.0, 1040.0)
+    capture_attribute_001.location = (960.0, 800.0)
+    evaluate_on_domain_001.location = (1160.0, 900.0)
+    compare_004.location = (1360.0, 900.0)
+    reverse_curve.location = (1560.0, 620.0)
+    mesh_line_001.location = (960.0, 520.0)
+    mesh_to_curve.location = (1160.0, 520.0)
+    index_001.location = (960.0, 380.0)
+    math_002.location = (1160.0, 380.0)
+    math_003.location = (1360.0, 380.0)
+    capture_attribute.location = (1560.0, 460.0)
+    curve_to_mesh_001.location = (1760.0, 560.0)
+    separate_xyz_001.location = (1760.0, 380.0)
+    math_004.location = (1960.0, 380.0)
+    combine_xyz_002.location = (2160.0, 380.0)
+    set_position.location = (2360.0, 560.0)
+    switch_005.location = (1657.5579833984375, 180.0)
+    boolean_math_001.location = (1887.29931640625, -420.0)
+    switch_006.location = (2087.29931640625, -60.0)
+    compare_005.location = (1477.8134765625, -200.0)
+    compare_006.location = (1477.8134765625, -360.0)
+    boolean_math_002.location = (1657.5579833984375, -260.0)
+    boolean_math_003.location = (1657.5579833984375, -420.0)
+    is_viewport.location = (-440.0, -760.0)
+    compare_007.location = (-700.0, -760.0)
+    switch_007.location = (-440.0, -900.0)
+    active_camera.location = (-1300.0, -1060.0)
+    object_info.location = (-1100.0, -1060.0)
+    vector_math_004.location = (-900.0, -1060.0)
+    math_005.location = (-700.0, -1060.0)
+    math_006.location = (-500.0, -1060.0)
+    math_007.location = (-300.0, -1060.0)
+    math_008.location = (-100.0, -1060.0)
+    switch_008.location = (-200.0, -900.0)
+    switch_009.location = (40.0, -760.0)
+    sample_index.location = (360.0, 1100.0)
+    attribute_statistic.location = (160.0, 620.0)
+    attribute_statistic_001.location = (160.0, 420.0)
+    math_012.location = (-640.0, 100.0)
+    math_013.location = (-640.0, -60.0)
+    hash_value.location = (-640.0, -220.0)
+    accumulate_field.location = (-440.0, -220.0)
+    compare_016.location = (-240.0, -220.0)
+    index_002.location = (-240.0, -380.0)
+    switch_012.location = (-40.0, -220.0)
+    accumulate_field_001.location = (160.0, -220.0)
+    split_to_instances.location = (-610.0, 43.0)
+    realize_instances_001.location = (-210.0, 43.0)
+    store_named_attribute.location = (-410.0, 200.0)
+    named_attribute.location = (-410.0, -120.0)
+    remove_named_attribute.location = (0.0, 160.0)
+    named_attribute_001.location = (-640.0, -380.0)
+    sample_index_001.location = (200.0, 360.0)
+    store_named_attribute_001.location = (200.0, 160.0)
+    split_to_instances_001.location = (1687.0, -72.0)
+    realize_instances_002.location = (2087.0, -72.0)
+    remove_named_attribute_001.location = (2296.0, -107.0)
+    math_014.location = (1560.0, 700.0)
+    math_015.location = (1560.0, 540.0)
+    math_016.location = (1760.0, 620.0)
+    compare_012.location = (300.0, -560.0)
+    compare_013.location = (560.0, 1100.0)
+    compare_014.location = (560.0, 940.0)
+    compare_015.location = (1657.5579833984375, -580.0)
+    boolean_math_007.location = (1887.29931640625, -420.0)
+    flip_faces_002.location = (520.0, 240.0)
+    flip_faces_003.location = (300.0, -440.0)
+    compare_008.location = (-1160.0, 560.0)
+    switch_010.location = (-960.0, 560.0)
+    math_009.location = (-960.0, 720.0)
+    repeat_input.location = (-2660.0, 560.0)
+    repeat_output.location = (-860.0, 320.0)
+    position_001.location = (-2660.0, 1000.0)
+    offset_point_in_curve_001.location = (-2660.0, 1200.0)
+    offset_point_in_curve_002.location = (-2660.0, 1400.0)
+    evaluate_at_index_001.location = (-2460.0, 1200.0)
+    evaluate_at_index_002.location = (-2460.0, 1400.0)
+    vector_math_005.location = (-2260.0, 1400.0)
+    vector_math_006.location = (-2260.0, 1200.0)
+    vector_math_007.location = (-2060.0, 1200.0)
+    vector_math_008.location = (-2060.0, 1400.0)
+    math_010.location = (-1860.0, 1300.0)
+    vector_math_009.location = (-1660.0, 1400.0)
+    vector_math_010.location = (-1460.0, 1400.0)
+    vector_math_011.location = (-1260.0, 1200.0)
+    compare_009.location = (-1060.0, 1200.0)
+    spline_parameter.location = (-1660.0, 900.0)
+    math_011.location = (-1460.0, 900.0)
+    compare_010.location = (-1260.0, 900.0)
+    spline_length.location = (-1460.0, 700.0)
+    compare_011.location = (-1260.0, 700.0)
+    boolean_math_004.location = (-860.0, 1000.0)
+    boolean_math_005.location = (-860.0, 840.0)
+    boolean_math_006.location = (-860.0, 680.0)
+    delete_geometry_002.location = (-1060.0, 400.0)
+    boolean_math_008.location = (-200.0, -620.0)
+    boolean_math_009.location = (1460.0, 360.0)
+    switch_011.location = (1477.8134765625, 260.0)
+    boolean_math_010.location = (1887.29931640625, -560.0)
 
     #Set dimensions
     group_input.width, group_input.height = 140.0, 100.0
     group_output.width, group_output.height = 140.0, 100.0
     fill_curve.width, fill_curve.height = 140.0, 100.0
+    cap_cache.width, cap_cache.height = 140.0, 100.0
     extrude_mesh.width, extrude_mesh.height = 140.0, 100.0
     delete_geometry.width, delete_geometry.height = 140.0, 100.0
-    fill_curve_001.width, fill_curve_001.height = 140.0, 100.0
-    fill_curve_002.width, fill_curve_002.height = 140.0, 100.0
     join_geometry.width, join_geometry.height = 140.0, 100.0
     switch.width, switch.height = 140.0, 100.0
     switch_001.width, switch_001.height = 140.0, 100.0
     extrude_mesh_001.width, extrude_mesh_001.height = 140.0, 100.0
     delete_geometry_001.width, delete_geometry_001.height = 140.0, 100.0
     merge_by_distance.width, merge_by_distance.height = 140.0, 100.0
+    math_019.width, math_019.height = 140.0, 100.0
+    math_020.width, math_020.height = 140.0, 100.0
+    compare_017.width, compare_017.height = 140.0, 100.0
+    attribute_statistic_002.width, attribute_statistic_002.height = 140.0, 100.0
+    math_021.width, math_021.height = 140.0, 100.0
+    math_022.width, math_022.height = 140.0, 100.0
+    switch_013.width, switch_013.height = 140.0, 100.0
+    math_023.width, math_023.height = 140.0, 100.0
+    math_024.width, math_024.height = 140.0, 100.0
+    compare_018.width, compare_018.height = 140.0, 100.0
+    switch_014.width, switch_014.height = 140.0, 100.0
     flip_faces.width, flip_faces.height = 140.0, 100.0
     math.width, math.height = 140.0, 100.0
     instance_on_points.width, instance_on_points.height = 140.0, 100.0
@@ -334,46 +1618,230 @@ def ecm_extrudecurve_node_group():
     index.width, index.height = 140.0, 100.0
     realize_instances.width, realize_instances.height = 140.0, 100.0
     flip_faces_001.width, flip_faces_001.height = 140.0, 100.0
-    switch_002.width, switch_002.height = 140.0, 100.0
     compare_001.width, compare_001.height = 140.0, 100.0
+    boolean_math.width, boolean_math.height = 140.0, 100.0
+    resample_curve.width, resample_curve.height = 140.0, 100.0
+    transform_geometry.width, transform_geometry.height = 140.0, 100.0
+    set_spline_cyclic.width, set_spline_cyclic.height = 140.0, 100.0
+    position.width, position.height = 140.0, 100.0
+    curve_tangent.width, curve_tangent.height = 140.0, 100.0
+    vector_math_001.width, vector_math_001.height = 140.0, 100.0
+    vector_math_002.width, vector_math_002.height = 140.0, 100.0
+    vector_math_003.width, vector_math_003.height = 140.0, 100.0
+    geometry_proximity.width, geometry_proximity.height = 140.0, 100.0
+    compare_003.width, compare_003.height = 140.0, 100.0
+    bounding_box.width, bounding_box.height = 140.0, 100.0
+    vector_math_012.width, vector_math_012.height = 140.0, 100.0
+    math_017.width, math_017.height = 140.0, 100.0
+    math_018.width, math_018.height = 140.0, 100.0
+    capture_attribute_001.width, capture_attribute_001.height = 140.0, 100.0
+    evaluate_on_domain_001.width, evaluate_on_domain_001.height = 140.0, 100.0
+    compare_004.width, compare_004.height = 140.0, 100.0
+    reverse_curve.width, reverse_curve.height = 140.0, 100.0
+    mesh_line_001.width, mesh_line_001.height = 140.0, 100.0
+    mesh_to_curve.width, mesh_to_curve.height = 140.0, 100.0
+    index_001.width, index_001.height = 140.0, 100.0
+    math_002.width, math_002.height = 140.0, 100.0
+    math_003.width, math_003.height = 140.0, 100.0
+    capture_attribute.width, capture_attribute.height = 140.0, 100.0
+    curve_to_mesh_001.width, curve_to_mesh_001.height = 140.0, 100.0
+    separate_xyz_001.width, separate_xyz_001.height = 140.0, 100.0
+    math_004.width, math_004.height = 140.0, 100.0
+    combine_xyz_002.width, combine_xyz_002.height = 140.0, 100.0
+    set_position.width, set_position.height = 140.0, 100.0
+    switch_005.width, switch_005.height = 140.0, 100.0
+    boolean_math_001.width, boolean_math_001.height = 140.0, 100.0
+    switch_006.width, switch_006.height = 140.0, 100.0
+    compare_005.width, compare_005.height = 140.0, 100.0
+    compare_006.width, compare_006.height = 140.0, 100.0
+    boolean_math_002.width, boolean_math_002.height = 140.0, 100.0
+    boolean_math_003.width, boolean_math_003.height = 140.0, 100.0
+    is_viewport.width, is_viewport.height = 140.0, 100.0
+    compare_007.width, compare_007.height = 140.0, 100.0
+    switch_007.width, switch_007.height = 140.0, 100.0
+    active_camera.width, active_camera.height = 140.0, 100.0
+    object_info.width, object_info.height = 140.0, 100.0
+    vector_math_004.width, vector_math_004.height = 140.0, 100.0
+    math_005.width, math_005.height = 140.0, 100.0
+    math_006.width, math_006.height = 140.0, 100.0
+    math_007.width, math_007.height = 140.0, 100.0
+    math_008.width, math_008.height = 140.0, 100.0
+    switch_008.width, switch_008.height = 140.0, 100.0
+    switch_009.width, switch_009.height = 140.0, 100.0
+    sample_index.width, sample_index.height = 140.0, 100.0
+    attribute_statistic.width, attribute_statistic.height = 140.0, 100.0
+    attribute_statistic_001.width, attribute_statistic_001.height = 140.0, 100.0
+    math_012.width, math_012.height = 140.0, 100.0
+    math_013.width, math_013.height = 140.0, 100.0
+    hash_value.width, hash_value.height = 140.0, 100.0
+    accumulate_field.width, accumulate_field.height = 140.0, 100.0
+    compare_016.width, compare_016.height = 140.0, 100.0
+    index_002.width, index_002.height = 140.0, 100.0
+    switch_012.width, switch_012.height = 140.0, 100.0
+    accumulate_field_001.width, accumulate_field_001.height = 140.0, 100.0
+    split_to_instances.width, split_to_instances.height = 140.0, 100.0
+    realize_instances_001.width, realize_instances_001.height = 140.0, 100.0
+    store_named_attribute.width, store_named_attribute.height = 140.0, 100.0
+    named_attribute.width, named_attribute.height = 140.0, 100.0
+    remove_named_attribute.width, remove_named_attribute.height = 140.0, 100.0
+    named_attribute_001.width, named_attribute_001.height = 140.0, 100.0
+    sample_index_001.width, sample_index_001.height = 140.0, 100.0
+    store_named_attribute_001.width, store_named_attribute_001.height = 140.0, 100.0
+    split_to_instances_001.width, split_to_instances_001.height = 140.0, 100.0
+    realize_instances_002.width, realize_instances_002.height = 140.0, 100.0
+    remove_named_attribute_001.width, remove_named_attribute_001.height = 140.0, 100.0
+    math_014.width, math_014.height = 140.0, 100.0
+    math_015.width, math_015.height = 140.0, 100.0
+    math_016.width, math_016.height = 140.0, 100.0
+    compare_012.width, compare_012.height = 140.0, 100.0
+    compare_013.width, compare_013.height = 140.0, 100.0
+    compare_014.width, compare_014.height = 140.0, 100.0
+    compare_015.width, compare_015.height = 140.0, 100.0
+    boolean_math_007.width, boolean_math_007.height = 140.0, 100.0
+    flip_faces_002.width, flip_faces_002.height = 140.0, 100.0
+    flip_faces_003.width, flip_faces_003.height = 140.0, 100.0
+    compare_008.width, compare_008.height = 140.0, 100.0
+    switch_010.width, switch_010.height = 140.0, 100.0
+    math_009.width, math_009.height = 140.0, 100.0
+    repeat_input.width, repeat_input.height = 140.0, 100.0
+    repeat_output.width, repeat_output.height = 140.0, 100.0
+    position_001.width, position_001.height = 140.0, 100.0
+    offset_point_in_curve_001.width, offset_point_in_curve_001.height = 140.0, 100.0
+    offset_point_in_curve_002.width, offset_point_in_curve_002.height = 140.0, 100.0
+    evaluate_at_index_001.width, evaluate_at_index_001.height = 140.0, 100.0
+    evaluate_at_index_002.width, evaluate_at_index_002.height = 140.0, 100.0
+    vector_math_005.width, vector_math_005.height = 140.0, 100.0
+    vector_math_006.width, vector_math_006.height = 140.0, 100.0
+    vector_math_007.width, vector_math_007.height = 140.0, 100.0
+    vector_math_008.width, vector_math_008.height = 140.0, 100.0
+    math_010.width, math_010.height = 140.0, 100.0
+    vector_math_009.width, vector_math_009.height = 140.0, 100.0
+    vector_math_010.width, vector_math_010.height = 140.0, 100.0
+    vector_math_011.width, vector_math_011.height = 140.0, 100.0
+    compare_009.width, compare_009.height = 140.0, 100.0
+    spline_parameter.width, spline_parameter.height = 140.0, 100.0
+    math_011.width, math_011.height = 140.0, 100.0
+    compare_010.width, compare_010.height = 140.0, 100.0
+    spline_length.width, spline_length.height = 140.0, 100.0
+    compare_011.width, compare_011.height = 140.0, 100.0
+    boolean_math_004.width, boolean_math_004.height = 140.0, 100.0
+    boolean_math_005.width, boolean_math_005.height = 140.0, 100.0
+    boolean_math_006.width, boolean_math_006.height = 140.0, 100.0
+    delete_geometry_002.width, delete_geometry_002.height = 140.0, 100.0
+    boolean_math_008.width, boolean_math_008.height = 140.0, 100.0
+    boolean_math_009.width, boolean_math_009.height = 140.0, 100.0
+    switch_011.width, switch_011.height = 140.0, 100.0
+    boolean_math_010.width, boolean_math_010.height = 140.0, 100.0
 
     #initialize node_group links
-    #fill_curve.Mesh -> extrude_mesh.Mesh
-    node_group.links.new(fill_curve.outputs[0], extrude_mesh.inputs[0])
+    #realize_instances_001.Geometry -> cap_cache.Fill
+    node_group.links.new(realize_instances_001.outputs[0], cap_cache.inputs[0])
+    #set_spline_cyclic.Geometry -> cap_cache.Rings
+    node_group.links.new(set_spline_cyclic.outputs[0], cap_cache.inputs[2])
+    #store_named_attribute_001.Geometry -> extrude_mesh.Mesh
+    node_group.links.new(store_named_attribute_001.outputs[0], extrude_mesh.inputs[0])
     #extrude_mesh.Top -> delete_geometry.Selection
     node_group.links.new(extrude_mesh.outputs[1], delete_geometry.inputs[1])
     #extrude_mesh.Mesh -> delete_geometry.Geometry
     node_group.links.new(extrude_mesh.outputs[0], delete_geometry.inputs[0])
     #extrude_mesh_001.Mesh -> delete_geometry_001.Geometry
     node_group.links.new(extrude_mesh_001.outputs[0], delete_geometry_001.inputs[0])
-    #fill_curve_002.Mesh -> extrude_mesh_001.Mesh
-    node_group.links.new(fill_curve_002.outputs[0], extrude_mesh_001.inputs[0])
+    #store_named_attribute_001.Geometry -> extrude_mesh_001.Mesh
+    node_group.links.new(store_named_attribute_001.outputs[0], extrude_mesh_001.inputs[0])
     #extrude_mesh_001.Side -> delete_geometry_001.Selection
     node_group.links.new(extrude_mesh_001.outputs[2], delete_geometry_001.inputs[1])
-    #group_input.Height -> extrude_mesh_001.Offset Scale
-    node_group.links.new(group_input.outputs[1], extrude_mesh_001.inputs[3])
     #group_input.Top Cap -> switch_001.Switch
     node_group.links.new(group_input.outputs[3], switch_001.inputs[0])
     #group_input.Bottom Cap -> switch.Switch
     node_group.links.new(group_input.outputs[4], switch.inputs[0])
-    #delete_geometry_001.Geometry -> switch_001.True
-    node_group.links.new(delete_geometry_001.outputs[0], switch_001.inputs[2])
     #switch_001.Output -> join_geometry.Geometry
     node_group.links.new(switch_001.outputs[0], join_geometry.inputs[0])
-    #join_geometry.Geometry -> merge_by_distance.Geometry
-    node_group.links.new(join_geometry.outputs[0], merge_by_distance.inputs[0])
-    #fill_curve_001.Mesh -> flip_faces.Mesh
-    node_group.links.new(fill_curve_001.outputs[0], flip_faces.inputs[0])
+    #split_to_instances_001.Instances -> merge_by_distance.Geometry
+    node_group.links.new(split_to_instances_001.outputs[0], merge_by_distance.inputs[0])
+    #join_geometry.Geometry -> switch_006.False
+    node_group.links.new(join_geometry.outputs[0], switch_006.inputs[1])
+    #realize_instances_002.Geometry -> switch_006.True
+    node_group.links.new(realize_instances_002.outputs[0], switch_006.inputs[2])
+    #group_input.Instanced Segments -> boolean_math_001.Boolean
+    node_group.links.new(group_input.outputs[5], boolean_math_001.inputs[0])
+    #boolean_math.Boolean -> boolean_math_001.Boolean
+    node_group.links.new(boolean_math.outputs[0], boolean_math_001.inputs[1])
+    #group_input.Height -> math_019.Value
+    node_group.links.new(group_input.outputs[1], math_019.inputs[0])
+    #math_019.Value -> math_020.Value
+    node_group.links.new(math_019.outputs[0], math_020.inputs[0])
+    #math_015.Value -> math_020.Value
+    node_group.links.new(math_015.outputs[0], math_020.inputs[1])
+    #math_020.Value -> compare_017.A
+    node_group.links.new(math_020.outputs[0], compare_017.inputs[0])
+    #cap_cache.Rings -> attribute_statistic_002.Geometry
+    node_group.links.new(cap_cache.outputs[2], attribute_statistic_002.inputs[0])
+    #compare_017.Result -> attribute_statistic_002.Selection
+    node_group.links.new(compare_017.outputs[0], attribute_statistic_002.inputs[1])
+    #math_020.Value -> attribute_statistic_002.Attribute
+    node_group.links.new(math_020.outputs[0], attribute_statistic_002.inputs[2])
+    #math.Value -> math_021.Value
+    node_group.links.new(math.outputs[0], math_021.inputs[0])
+    #attribute_statistic_002.Min -> math_022.Value
+    node_group.links.new(attribute_statistic_002.outputs[3], math_022.inputs[0])
+    #math_021.Value -> math_022.Value
+    node_group.links.new(math_021.outputs[0], math_022.inputs[1])
+    #group_input.Instanced Segments -> switch_013.Switch
+    node_group.links.new(group_input.outputs[5], switch_013.inputs[0])
+    #attribute_statistic_002.Min -> switch_013.False
+    node_group.links.new(attribute_statistic_002.outputs[3], switch_013.inputs[1])
+    #math_022.Value -> switch_013.True
+    node_group.links.new(math_022.outputs[0], switch_013.inputs[2])
+    #switch_013.Output -> math_023.Value
+    node_group.links.new(switch_013.outputs[0], math_023.inputs[0])
+    #group_input.Merge Distance -> math_024.Value
+    node_group.links.new(group_input.outputs[6], math_024.inputs[0])
+    #math_023.Value -> math_024.Value
+    node_group.links.new(math_023.outputs[0], math_024.inputs[1])
+    #math_023.Value -> compare_018.A
+    node_group.links.new(math_023.outputs[0], compare_018.inputs[0])
+    #compare_018.Result -> switch_014.Switch
+    node_group.links.new(compare_018.outputs[0], switch_014.inputs[0])
+    #group_input.Merge Distance -> switch_014.False
+    node_group.links.new(group_input.outputs[6], switch_014.inputs[1])
+    #math_024.Value -> switch_014.True
+    node_group.links.new(math_024.outputs[0], switch_014.inputs[2])
+    #switch_014.Output -> merge_by_distance.Distance
+    node_group.links.new(switch_014.outputs[0], merge_by_distance.inputs[2])
+    #math_016.Value -> compare_005.A
+    node_group.links.new(math_016.outputs[0], compare_005.inputs[0])
+    #math_016.Value -> compare_006.A
+    node_group.links.new(math_016.outputs[0], compare_006.inputs[0])
+    #compare_005.Result -> boolean_math_002.Boolean
+    node_group.links.new(compare_005.outputs[0], boolean_math_002.inputs[0])
+    #compare_006.Result -> boolean_math_002.Boolean
+    node_group.links.new(compare_006.outputs[0], boolean_math_002.inputs[1])
+    #group_input.Weld Seams Only -> boolean_math_003.Boolean
+    node_group.links.new(group_input.outputs[7], boolean_math_003.inputs[0])
+    #boolean_math_002.Boolean -> boolean_math_003.Boolean
+    node_group.links.new(boolean_math_002.outputs[0], boolean_math_003.inputs[1])
+    #boolean_math_003.Boolean -> merge_by_distance.Selection
+    node_group.links.new(boolean_math_003.outputs[0], merge_by_distance.inputs[1])
+    #store_named_attribute_001.Geometry -> flip_faces.Mesh
+    node_group.links.new(store_named_attribute_001.outputs[0], flip_faces.inputs[0])
     #flip_faces.Mesh -> switch.True
     node_group.links.new(flip_faces.outputs[0], switch.inputs[2])
-    #group_input.Height -> math.Value
-    node_group.links.new(group_input.outputs[1], math.inputs[0])
-    #group_input.Segments -> math.Value
-    node_group.links.new(group_input.outputs[2], math.inputs[1])
     #math.Value -> extrude_mesh.Offset Scale
     node_group.links.new(math.outputs[0], extrude_mesh.inputs[3])
-    #delete_geometry.Geometry -> geometry_to_instance.Geometry
-    node_group.links.new(delete_geometry.outputs[0], geometry_to_instance.inputs[0])
+    #delete_geometry.Geometry -> flip_faces_002.Mesh
+    node_group.links.new(delete_geometry.outputs[0], flip_faces_002.inputs[0])
+    #flip_faces_002.Mesh -> geometry_to_instance.Geometry
+    node_group.links.new(flip_faces_002.outputs[0], geometry_to_instance.inputs[0])
+    #group_input.Top Cap -> boolean_math.Boolean
+    node_group.links.new(group_input.outputs[3], boolean_math.inputs[0])
+    #group_input.Bottom Cap -> boolean_math.Boolean
+    node_group.links.new(group_input.outputs[4], boolean_math.inputs[1])
+    #group_input.Geometry -> resample_curve.Curve
+    node_group.links.new(group_input.outputs[0], resample_curve.inputs[0])
+    #repeat_output.Geometry -> transform_geometry.Geometry
+    node_group.links.new(repeat_output.outputs[0], transform_geometry.inputs[0])
+    #transform_geometry.Geometry -> set_spline_cyclic.Geometry
+    node_group.links.new(transform_geometry.outputs[0], set_spline_cyclic.inputs[0])
     #geometry_to_instance.Instances -> instance_on_points.Instance
     node_group.links.new(geometry_to_instance.outputs[0], instance_on_points.inputs[2])
     #mesh_line.Mesh -> instance_on_points.Points
@@ -382,44 +1850,1845 @@ def ecm_extrudecurve_node_group():
     node_group.links.new(math_001.outputs[0], mesh_line.inputs[0])
     #combine_xyz.Vector -> mesh_line.Offset
     node_group.links.new(combine_xyz.outputs[0], mesh_line.inputs[3])
-    #group_input.Height -> combine_xyz.Z
-    node_group.links.new(group_input.outputs[1], combine_xyz.inputs[2])
-    #group_input.Segments -> math_001.Value
-    node_group.links.new(group_input.outputs[2], math_001.inputs[0])
     #index.Index -> compare.A
     node_group.links.new(index.outputs[0], compare.inputs[2])
     #compare.Result -> instance_on_points.Selection
     node_group.links.new(compare.outputs[0], instance_on_points.inputs[1])
-    #group_input.Segments -> compare.B
-    node_group.links.new(group_input.outputs[2], compare.inputs[3])
     #instance_on_points.Instances -> realize_instances.Geometry
     node_group.links.new(instance_on_points.outputs[0], realize_instances.inputs[0])
-    #group_input.Geometry -> fill_curve.Curve
-    node_group.links.new(group_input.outputs[0], fill_curve.inputs[0])
-    #group_input.Geometry -> fill_curve_001.Curve
-    node_group.links.new(group_input.outputs[0], fill_curve_001.inputs[0])
-    #group_input.Geometry -> fill_curve_002.Curve
-    node_group.links.new(group_input.outputs[0], fill_curve_002.inputs[0])
-    #flip_faces_001.Mesh -> switch_002.True
-    node_group.links.new(flip_faces_001.outputs[0], switch_002.inputs[2])
+    #store_named_attribute.Geometry -> fill_curve.Curve
+    node_group.links.new(store_named_attribute.outputs[0], fill_curve.inputs[0])
     #group_input.Height -> compare_001.A
     node_group.links.new(group_input.outputs[1], compare_001.inputs[0])
-    #compare_001.Result -> switch_002.Switch
-    node_group.links.new(compare_001.outputs[0], switch_002.inputs[0])
-    #merge_by_distance.Geometry -> flip_faces_001.Mesh
-    node_group.links.new(merge_by_distance.outputs[0], flip_faces_001.inputs[0])
-    #switch_002.Output -> group_output.Geometry
-    node_group.links.new(switch_002.outputs[0], group_output.inputs[0])
-    #merge_by_distance.Geometry -> switch_002.False
-    node_group.links.new(merge_by_distance.outputs[0], switch_002.inputs[1])
+    #compare_001.Result -> flip_faces_001.Selection
+    node_group.links.new(compare_001.outputs[0], flip_faces_001.inputs[1])
+    #switch_006.Output -> remove_named_attribute_001.Geometry
+    node_group.links.new(switch_006.outputs[0], remove_named_attribute_001.inputs[0])
+    #remove_named_attribute_001.Geometry -> group_output.Geometry
+    node_group.links.new(remove_named_attribute_001.outputs[0], group_output.inputs[0])
     #switch.Output -> join_geometry.Geometry
     node_group.links.new(switch.outputs[0], join_geometry.inputs[0])
-    #realize_instances.Geometry -> join_geometry.Geometry
-    node_group.links.new(realize_instances.outputs[0], join_geometry.inputs[0])
-    
+    #switch_005.Output -> join_geometry.Geometry
+    node_group.links.new(switch_005.outputs[0], join_geometry.inputs[0])
+    #capture_attribute_001.Geometry -> reverse_curve.Curve
+    node_group.links.new(capture_attribute_001.outputs[0], reverse_curve.inputs[0])
+    #curve_tangent.Tangent -> vector_math_001.Vector
+    node_group.links.new(curve_tangent.outputs[0], vector_math_001.inputs[1])
+    #cap_cache.Rings -> bounding_box.Geometry
+    node_group.links.new(cap_cache.outputs[2], bounding_box.inputs[0])
+    #bounding_box.Min -> vector_math_012.Vector
+    node_group.links.new(bounding_box.outputs[1], vector_math_012.inputs[0])
+    #bounding_box.Max -> vector_math_012.Vector
+    node_group.links.new(bounding_box.outputs[2], vector_math_012.inputs[1])
+    #vector_math_012.Value -> math_017.Value
+    node_group.links.new(vector_math_012.outputs[1], math_017.inputs[0])
+    #math_017.Value -> math_018.Value
+    node_group.links.new(math_017.outputs[0], math_018.inputs[0])
+    #vector_math_001.Vector -> vector_math_002.Vector
+    node_group.links.new(vector_math_001.outputs[0], vector_math_002.inputs[0])
+    #math_017.Value -> vector_math_002.Scale
+    node_group.links.new(math_017.outputs[0], vector_math_002.inputs[3])
+    #position.Position -> vector_math_003.Vector
+    node_group.links.new(position.outputs[0], vector_math_003.inputs[0])
+    #vector_math_002.Vector -> vector_math_003.Vector
+    node_group.links.new(vector_math_002.outputs[0], vector_math_003.inputs[1])
+    #cap_cache.Fill -> geometry_proximity.Geometry
+    node_group.links.new(cap_cache.outputs[0], geometry_proximity.inputs[0])
+    #vector_math_003.Vector -> geometry_proximity.Sample Position
+    node_group.links.new(vector_math_003.outputs[0], geometry_proximity.inputs[2])
+    #geometry_proximity.Distance -> compare_003.A
+    node_group.links.new(geometry_proximity.outputs[1], compare_003.inputs[0])
+    #math_018.Value -> compare_003.B
+    node_group.links.new(math_018.outputs[0], compare_003.inputs[1])
+    #cap_cache.Rings -> capture_attribute_001.Geometry
+    node_group.links.new(cap_cache.outputs[2], capture_attribute_001.inputs[0])
+    #compare_003.Result -> capture_attribute_001.Value
+    node_group.links.new(compare_003.outputs[0], capture_attribute_001.inputs[1])
+    #capture_attribute_001.Value -> evaluate_on_domain_001.Value
+    node_group.links.new(capture_attribute_001.outputs[1], evaluate_on_domain_001.inputs[0])
+    #evaluate_on_domain_001.Value -> compare_004.A
+    node_group.links.new(evaluate_on_domain_001.outputs[0], compare_004.inputs[0])
+    #compare_004.Result -> reverse_curve.Selection
+    node_group.links.new(compare_004.outputs[0], reverse_curve.inputs[1])
+    #math_001.Value -> mesh_line_001.Count
+    node_group.links.new(math_001.outputs[0], mesh_line_001.inputs[0])
+    #mesh_line_001.Mesh -> mesh_to_curve.Mesh
+    node_group.links.new(mesh_line_001.outputs[0], mesh_to_curve.inputs[0])
+    #mesh_to_curve.Curve -> capture_attribute.Geometry
+    node_group.links.new(mesh_to_curve.outputs[0], capture_attribute.inputs[0])
+    #index_001.Index -> math_002.Value
+    node_group.links.new(index_001.outputs[0], math_002.inputs[0])
+    #math_002.Value -> math_003.Value
+    node_group.links.new(math_002.outputs[0], math_003.inputs[1])
+    #math_003.Value -> capture_attribute.Value
+    node_group.links.new(math_003.outputs[0], capture_attribute.inputs[1])
+    #reverse_curve.Curve -> curve_to_mesh_001.Curve
+    node_group.links.new(reverse_curve.outputs[0], curve_to_mesh_001.inputs[0])
+    #capture_attribute.Geometry -> curve_to_mesh_001.Profile Curve
+    node_group.links.new(capture_attribute.outputs[0], curve_to_mesh_001.inputs[1])
+    #curve_to_mesh_001.Mesh -> set_position.Geometry
+    node_group.links.new(curve_to_mesh_001.outputs[0], set_position.inputs[0])
+    #position.Position -> separate_xyz_001.Vector
+    node_group.links.new(position.outputs[0], separate_xyz_001.inputs[0])
+    #group_input.Height -> math_004.Value
+    node_group.links.new(group_input.outputs[1], math_004.inputs[0])
+    #math_016.Value -> math_004.Value
+    node_group.links.new(math_016.outputs[0], math_004.inputs[1])
+    #separate_xyz_001.X -> combine_xyz_002.X
+    node_group.links.new(separate_xyz_001.outputs[0], combine_xyz_002.inputs[0])
+    #separate_xyz_001.Y -> combine_xyz_002.Y
+    node_group.links.new(separate_xyz_001.outputs[1], combine_xyz_002.inputs[1])
+    #math_004.Value -> combine_xyz_002.Z
+    node_group.links.new(math_004.outputs[0], combine_xyz_002.inputs[2])
+    #combine_xyz_002.Vector -> set_position.Position
+    node_group.links.new(combine_xyz_002.outputs[0], set_position.inputs[2])
+    #set_position.Geometry -> flip_faces_001.Mesh
+    node_group.links.new(set_position.outputs[0], flip_faces_001.inputs[0])
+    #flip_faces_001.Mesh -> switch_005.False
+    node_group.links.new(flip_faces_001.outputs[0], switch_005.inputs[1])
+    #group_input.Viewport Segments -> compare_007.A
+    node_group.links.new(group_input.outputs[9], compare_007.inputs[2])
+    #compare_007.Result -> switch_007.Switch
+    node_group.links.new(compare_007.outputs[0], switch_007.inputs[0])
+    #group_input.Segments -> switch_007.False
+    node_group.links.new(group_input.outputs[2], switch_007.inputs[1])
+    #group_input.Viewport Segments -> switch_007.True
+    node_group.links.new(group_input.outputs[9], switch_007.inputs[2])
+    #active_camera.Active Camera -> object_info.Object
+    node_group.links.new(active_camera.outputs[0], object_info.inputs[0])
+    #object_info.Location -> vector_math_004.Vector
+    node_group.links.new(object_info.outputs[1], vector_math_004.inputs[0])
+    #vector_math_004.Value -> math_005.Value
+    node_group.links.new(vector_math_004.outputs[1], math_005.inputs[0])
+    #group_input.LOD Distance -> math_006.Value
+    node_group.links.new(group_input.outputs[11], math_006.inputs[0])
+    #math_005.Value -> math_006.Value
+    node_group.links.new(math_005.outputs[0], math_006.inputs[1])
+    #switch_007.Output -> math_007.Value
+    node_group.links.new(switch_007.outputs[0], math_007.inputs[0])
+    #math_006.Value -> math_007.Value
+    node_group.links.new(math_006.outputs[0], math_007.inputs[1])
+    #math_007.Value -> math_008.Value
+    node_group.links.new(math_007.outputs[0], math_008.inputs[0])
+    #group_input.Auto LOD -> switch_008.Switch
+    node_group.links.new(group_input.outputs[10], switch_008.inputs[0])
+    #switch_007.Output -> switch_008.False
+    node_group.links.new(switch_007.outputs[0], switch_008.inputs[1])
+    #math_008.Value -> switch_008.True
+    node_group.links.new(math_008.outputs[0], switch_008.inputs[2])
+    #is_viewport.Is Viewport -> switch_009.Switch
+    node_group.links.new(is_viewport.outputs[0], switch_009.inputs[0])
+    #group_input.Segments -> switch_009.False
+    node_group.links.new(group_input.outputs[2], switch_009.inputs[1])
+    #switch_008.Output -> switch_009.True
+    node_group.links.new(switch_008.outputs[0], switch_009.inputs[2])
+    #cap_cache.Rings -> sample_index.Geometry
+    node_group.links.new(cap_cache.outputs[2], sample_index.inputs[0])
+    #group_input.Height -> sample_index.Value
+    node_group.links.new(group_input.outputs[1], sample_index.inputs[1])
+    #cap_cache.Height Group -> sample_index.Index
+    node_group.links.new(cap_cache.outputs[1], sample_index.inputs[2])
+    #sample_index.Value -> extrude_mesh_001.Offset Scale
+    node_group.links.new(sample_index.outputs[0], extrude_mesh_001.inputs[3])
+    #sample_index.Value -> compare_013.A
+    node_group.links.new(sample_index.outputs[0], compare_013.inputs[0])
+    #sample_index.Value -> compare_014.A
+    node_group.links.new(sample_index.outputs[0], compare_014.inputs[0])
+    #compare_013.Result -> flip_faces_003.Selection
+    node_group.links.new(compare_013.outputs[0], flip_faces_003.inputs[1])
+    #compare_014.Result -> flip_faces.Selection
+    node_group.links.new(compare_014.outputs[0], flip_faces.inputs[1])
+    #cap_cache.Rings -> attribute_statistic.Geometry
+    node_group.links.new(cap_cache.outputs[2], attribute_statistic.inputs[0])
+    #switch_009.Output -> attribute_statistic.Attribute
+    node_group.links.new(switch_009.outputs[0], attribute_statistic.inputs[2])
+    #cap_cache.Rings -> attribute_statistic_001.Geometry
+    node_group.links.new(cap_cache.outputs[2], attribute_statistic_001.inputs[0])
+    #group_input.Height -> attribute_statistic_001.Attribute
+    node_group.links.new(group_input.outputs[1], attribute_statistic_001.inputs[2])
+    #attribute_statistic_001.Mean -> math.Value
+    node_group.links.new(attribute_statistic_001.outputs[0], math.inputs[0])
+    #attribute_statistic.Max -> math.Value
+    node_group.links.new(attribute_statistic.outputs[4], math.inputs[1])
+    #attribute_statistic_001.Mean -> combine_xyz.Z
+    node_group.links.new(attribute_statistic_001.outputs[0], combine_xyz.inputs[2])
+    #attribute_statistic.Max -> math_001.Value
+    node_group.links.new(attribute_statistic.outputs[4], math_001.inputs[0])
+    #attribute_statistic.Max -> compare.B
+    node_group.links.new(attribute_statistic.outputs[4], compare.inputs[3])
+    #attribute_statistic.Max -> math_002.Value
+    node_group.links.new(attribute_statistic.outputs[4], math_002.inputs[1])
+    #attribute_statistic_001.Mean -> compare_012.A
+    node_group.links.new(attribute_statistic_001.outputs[0], compare_012.inputs[0])
+    #compare_012.Result -> flip_faces_002.Selection
+    node_group.links.new(compare_012.outputs[0], flip_faces_002.inputs[1])
+    #delete_geometry_001.Geometry -> flip_faces_003.Mesh
+    node_group.links.new(delete_geometry_001.outputs[0], flip_faces_003.inputs[0])
+    #flip_faces_003.Mesh -> switch_001.True
+    node_group.links.new(flip_faces_003.outputs[0], switch_001.inputs[2])
+    #group_input.Height -> math_012.Value
+    node_group.links.new(group_input.outputs[1], math_012.inputs[0])
+    #math_012.Value -> math_013.Value
+    node_group.links.new(math_012.outputs[0], math_013.inputs[0])
+    #math_013.Value -> hash_value.Value
+    node_group.links.new(math_013.outputs[0], hash_value.inputs[0])
+    #hash_value.Hash -> accumulate_field.Group ID
+    node_group.links.new(hash_value.outputs[0], accumulate_field.inputs[1])
+    #accumulate_field.Trailing -> compare_016.A
+    node_group.links.new(accumulate_field.outputs[1], compare_016.inputs[2])
+    #compare_016.Result -> switch_012.Switch
+    node_group.links.new(compare_016.outputs[0], switch_012.inputs[0])
+    #index_002.Index -> switch_012.True
+    node_group.links.new(index_002.outputs[0], switch_012.inputs[2])
+    #switch_012.Output -> accumulate_field_001.Value
+    node_group.links.new(switch_012.outputs[0], accumulate_field_001.inputs[0])
+    #hash_value.Hash -> accumulate_field_001.Group ID
+    node_group.links.new(hash_value.outputs[0], accumulate_field_001.inputs[1])
+    #repeat_output.Geometry -> split_to_instances.Geometry
+    node_group.links.new(repeat_output.outputs[0], split_to_instances.inputs[0])
+    #accumulate_field_001.Total -> split_to_instances.Group ID
+    node_group.links.new(accumulate_field_001.outputs[2], split_to_instances.inputs[2])
+    #fill_curve.Mesh -> realize_instances_001.Geometry
+    node_group.links.new(fill_curve.outputs[0], realize_instances_001.inputs[0])
+    #split_to_instances.Instances -> store_named_attribute.Geometry
+    node_group.links.new(split_to_instances.outputs[0], store_named_attribute.inputs[0])
+    #split_to_instances.Group ID -> store_named_attribute.Value
+    node_group.links.new(split_to_instances.outputs[1], store_named_attribute.inputs[3])
+    #named_attribute.Attribute -> cap_cache.Height Group
+    node_group.links.new(named_attribute.outputs[0], cap_cache.inputs[1])
+    #cap_cache.Fill -> remove_named_attribute.Geometry
+    node_group.links.new(cap_cache.outputs[0], remove_named_attribute.inputs[0])
+    #named_attribute_001.Attribute -> hash_value.Seed
+    node_group.links.new(named_attribute_001.outputs[0], hash_value.inputs[1])
+    #cap_cache.Rings -> sample_index_001.Geometry
+    node_group.links.new(cap_cache.outputs[2], sample_index_001.inputs[0])
+    #named_attribute_001.Attribute -> sample_index_001.Value
+    node_group.links.new(named_attribute_001.outputs[0], sample_index_001.inputs[1])
+    #cap_cache.Height Group -> sample_index_001.Index
+    node_group.links.new(cap_cache.outputs[1], sample_index_001.inputs[2])
+    #remove_named_attribute.Geometry -> store_named_attribute_001.Geometry
+    node_group.links.new(remove_named_attribute.outputs[0], store_named_attribute_001.inputs[0])
+    #sample_index_001.Value -> store_named_attribute_001.Value
+    node_group.links.new(sample_index_001.outputs[0], store_named_attribute_001.inputs[3])
+    #join_geometry.Geometry -> split_to_instances_001.Geometry
+    node_group.links.new(join_geometry.outputs[0], split_to_instances_001.inputs[0])
+    #named_attribute_001.Attribute -> split_to_instances_001.Group ID
+    node_group.links.new(named_attribute_001.outputs[0], split_to_instances_001.inputs[2])
+    #merge_by_distance.Geometry -> realize_instances_002.Geometry
+    node_group.links.new(merge_by_distance.outputs[0], realize_instances_002.inputs[0])
+    #capture_attribute.Value -> math_014.Value
+    node_group.links.new(capture_attribute.outputs[1], math_014.inputs[0])
+    #attribute_statistic.Max -> math_014.Value
+    node_group.links.new(attribute_statistic.outputs[4], math_014.inputs[1])
+    #switch_009.Output -> math_015.Value
+    node_group.links.new(switch_009.outputs[0], math_015.inputs[0])
+    #math_014.Value -> math_016.Value
+    node_group.links.new(math_014.outputs[0], math_016.inputs[0])
+    #math_015.Value -> math_016.Value
+    node_group.links.new(math_015.outputs[0], math_016.inputs[1])
+    #attribute_statistic.Min -> compare_015.A
+    node_group.links.new(attribute_statistic.outputs[3], compare_015.inputs[0])
+    #attribute_statistic.Max -> compare_015.B
+    node_group.links.new(attribute_statistic.outputs[4], compare_015.inputs[1])
+    #boolean_math_001.Boolean -> boolean_math_007.Boolean
+    node_group.links.new(boolean_math_001.outputs[0], boolean_math_007.inputs[0])
+    #compare_015.Result -> boolean_math_007.Boolean
+    node_group.links.new(compare_015.outputs[0], boolean_math_007.inputs[1])
+    #group_input.Simplify Tolerance -> compare_008.A
+    node_group.links.new(group_input.outputs[8], compare_008.inputs[0])
+    #compare_008.Result -> switch_010.Switch
+    node_group.links.new(compare_008.outputs[0], switch_010.inputs[0])
+    #group_input.Simplify Tolerance -> math_009.Value
+    node_group.links.new(group_input.outputs[8], math_009.inputs[0])
+    #resample_curve.Curve -> repeat_input.Geometry
+    node_group.links.new(resample_curve.outputs[0], repeat_input.inputs[1])
+    #switch_010.Output -> repeat_input.Iterations
+    node_group.links.new(switch_010.outputs[0], repeat_input.inputs[0])
+    #offset_point_in_curve_001.Point Index -> evaluate_at_index_001.Index
+    node_group.links.new(offset_point_in_curve_001.outputs[1], evaluate_at_index_001.inputs[0])
+    #position_001.Position -> evaluate_at_index_001.Value
+    node_group.links.new(position_001.outputs[0], evaluate_at_index_001.inputs[1])
+    #offset_point_in_curve_002.Point Index -> evaluate_at_index_002.Index
+    node_group.links.new(offset_point_in_curve_002.outputs[1], evaluate_at_index_002.inputs[0])
+    #position_001.Position -> evaluate_at_index_002.Value
+    node_group.links.new(position_001.outputs[0], evaluate_at_index_002.inputs[1])
+    #evaluate_at_index_002.Value -> vector_math_005.Vector
+    node_group.links.new(evaluate_at_index_002.outputs[0], vector_math_005.inputs[0])
+    #evaluate_at_index_001.Value -> vector_math_005.Vector
+    node_group.links.new(evaluate_at_index_001.outputs[0], vector_math_005.inputs[1])
+    #position_001.Position -> vector_math_006.Vector
+    node_group.links.new(position_001.outputs[0], vector_math_006.inputs[0])
+    #evaluate_at_index_001.Value -> vector_math_006.Vector
+    node_group.links.new(evaluate_at_index_001.outputs[0], vector_math_006.inputs[1])
+    #vector_math_006.Vector -> vector_math_007.Vector
+    node_group.links.new(vector_math_006.outputs[0], vector_math_007.inputs[0])
+    #vector_math_005.Vector -> vector_math_007.Vector
+    node_group.links.new(vector_math_005.outputs[0], vector_math_007.inputs[1])
+    #vector_math_005.Vector -> vector_math_008.Vector
+    node_group.links.new(vector_math_005.outputs[0], vector_math_008.inputs[0])
+    #vector_math_005.Vector -> vector_math_008.Vector
+    node_group.links.new(vector_math_005.outputs[0], vector_math_008.inputs[1])
+    #vector_math_007.Value -> math_010.Value
+    node_group.links.new(vector_math_007.outputs[1], math_010.inputs[0])
+    #vector_math_008.Value -> math_010.Value
+    node_group.links.new(vector_math_008.outputs[1], math_010.inputs[1])
+    #vector_math_005.Vector -> vector_math_009.Vector
+    node_group.links.new(vector_math_005.outputs[0], vector_math_009.inputs[0])
+    #math_010.Value -> vector_math_009.Scale
+    node_group.links.new(math_010.outputs[0], vector_math_009.inputs[3])
+    #evaluate_at_index_001.Value -> vector_math_010.Vector
+    node_group.links.new(evaluate_at_index_001.outputs[0], vector_math_010.inputs[0])
+    #vector_math_009.Vector -> vector_math_010.Vector
+    node_group.links.new(vector_math_009.outputs[0], vector_math_010.inputs[1])
+    #position_001.Position -> vector_math_011.Vector
+    node_group.links.new(position_001.outputs[0], vector_math_011.inputs[0])
+    #vector_math_010.Vector -> vector_math_011.Vector
+    node_group.links.new(vector_math_010.outputs[0], vector_math_011.inputs[1])
+    #vector_math_011.Value -> compare_009.A
+    node_group.links.new(vector_math_011.outputs[1], compare_009.inputs[0])
+    #math_009.Value -> compare_009.B
+    node_group.links.new(math_009.outputs[0], compare_009.inputs[1])
+    #spline_parameter.Index -> math_011.Value
+    node_group.links.new(spline_parameter.outputs[2], math_011.inputs[0])
+    #math_011.Value -> compare_010.A
+    node_group.links.new(math_011.outputs[0], compare_010.inputs[0])
+    #spline_length.Point Count -> compare_011.A
+    node_group.links.new(spline_length.outputs[1], compare_011.inputs[2])
+    #compare_010.Result -> boolean_math_004.Boolean
+    node_group.links.new(compare_010.outputs[0], boolean_math_004.inputs[0])
+    #compare_009.Result -> boolean_math_004.Boolean
+    node_group.links.new(compare_009.outputs[0], boolean_math_004.inputs[1])
+    #boolean_math_004.Boolean -> boolean_math_005.Boolean
+    node_group.links.new(boolean_math_004.outputs[0], boolean_math_005.inputs[0])
+    #compare_011.Result -> boolean_math_005.Boolean
+    node_group.links.new(compare_011.outputs[0], boolean_math_005.inputs[1])
+    #boolean_math_005.Boolean -> boolean_math_006.Boolean
+    node_group.links.new(boolean_math_005.outputs[0], boolean_math_006.inputs[0])
+    #offset_point_in_curve_002.Is Valid Offset -> boolean_math_006.Boolean
+    node_group.links.new(offset_point_in_curve_002.outputs[0], boolean_math_006.inputs[1])
+    #repeat_input.Geometry -> delete_geometry_002.Geometry
+    node_group.links.new(repeat_input.outputs["Geometry"], delete_geometry_002.inputs[0])
+    #boolean_math_006.Boolean -> delete_geometry_002.Selection
+    node_group.links.new(boolean_math_006.outputs[0], delete_geometry_002.inputs[1])
+    #delete_geometry_002.Geometry -> repeat_output.Geometry
+    node_group.links.new(delete_geometry_002.outputs[0], repeat_output.inputs[0])
+    #is_viewport.Is Viewport -> boolean_math_008.Boolean
+    node_group.links.new(is_viewport.outputs[0], boolean_math_008.inputs[0])
+    #group_input.Instanced Preview -> boolean_math_008.Boolean
+    node_group.links.new(group_input.outputs[12], boolean_math_008.inputs[1])
+    #group_input.Instanced Segments -> boolean_math_009.Boolean
+    node_group.links.new(group_input.outputs[5], boolean_math_009.inputs[0])
+    #boolean_math_008.Boolean -> boolean_math_009.Boolean
+    node_group.links.new(boolean_math_008.outputs[0], boolean_math_009.inputs[1])
+    #boolean_math_009.Boolean -> switch_005.Switch
+    node_group.links.new(boolean_math_009.outputs[0], switch_005.inputs[0])
+    #boolean_math_008.Boolean -> switch_011.Switch
+    node_group.links.new(boolean_math_008.outputs[0], switch_011.inputs[0])
+    #realize_instances.Geometry -> switch_011.False
+    node_group.links.new(realize_instances.outputs[0], switch_011.inputs[1])
+    #instance_on_points.Instances -> switch_011.True
+    node_group.links.new(instance_on_points.outputs[0], switch_011.inputs[2])
+    #switch_011.Output -> switch_005.True
+    node_group.links.new(switch_011.outputs[0], switch_005.inputs[2])
+    #boolean_math_007.Boolean -> boolean_math_010.Boolean
+    node_group.links.new(boolean_math_007.outputs[0], boolean_math_010.inputs[0])
+    #boolean_math_008.Boolean -> boolean_math_010.Boolean
+    node_group.links.new(boolean_math_008.outputs[0], boolean_math_010.inputs[1])
+    #boolean_math_010.Boolean -> switch_006.Switch
+    node_group.links.new(boolean_math_010.outputs[0], switch_006.inputs[0])
+
+    node_group["ecm_version"] = ECM_GRAPH_VERSION
+    node_group["ecm_fingerprint"] = ecm_node_group_fingerprint(node_group)
+    return node_group
+
+
+# ------------------------------------------------------------------------
+# Modifier Helpers
+# ------------------------------------------------------------------------
+def ecm_find_modifier(obj):
+    """Return the first ECM modifier of ``obj``, or None"""
+    for mod in obj.modifiers:
+        if mod.type == 'NODES' and mod.node_group is not None and mod.node_group.name.startswith("ECM_ExtrudeCurve"):
+            return mod
+    return None
+
+
+def ecm_set_modifier_inputs(mod, values):
+    """Set the node group inputs of ``mod`` from a ``{socket name: value}`` dict
+
+    Inputs that can read an attribute are switched to the given value, new
+    modifiers start out reading the sockets' default attributes otherwise.
+    """
+    for item in mod.node_group.interface.items_tree:
+        if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name in values:
+            mod[item.identifier] = values[item.name]
+            if item.identifier + "_use_attribute" in mod:
+                mod[item.identifier + "_use_attribute"] = False
+    mod.id_data.update_tag()
+
+
+def _ecm_modifier_inputs(mod):
+    """Read the node group inputs of ``mod`` as ``{socket name: (value, use attribute, attribute name)}``"""
+    values = {}
+    for item in mod.node_group.interface.items_tree:
+        if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.identifier in mod:
+            values[item.name] = (
+                mod[item.identifier],
+                mod.get(item.identifier + "_use_attribute"),
+                mod.get(item.identifier + "_attribute_name"),
+            )
+    return values
+
+
+#viewport only inputs, with the values renders evaluate them with
+ECM_RENDER_INPUTS = {"Viewport Segments": 0, "Auto LOD": False, "Instanced Preview": False}
+
+
+def ecm_force_render_inputs(mods):
+    """Give the viewport only inputs of ``mods`` their render values
+
+    Returns ``[(modifier, {socket name: value})]`` to pass back to
+    ecm_set_modifier_inputs() once the evaluation is done.
+    """
+    restore = []
+    for mod in mods:
+        values = _ecm_modifier_inputs(mod)
+        changed = {name: values[name][0] for name, value in ECM_RENDER_INPUTS.items()
+                   if name in values and values[name][0] != value}
+        if changed:
+            ecm_set_modifier_inputs(mod, ECM_RENDER_INPUTS)
+            restore.append((mod, changed))
+    return restore
+
+
+def ecm_upgrade_modifiers(include_edited=False):
+    """Swap outdated ECM node groups for the current ones across the whole file
+
+    Covers the extrusion group and the height, instance and collection
+    groups built around it. Modifier inputs are carried over by socket
+    name, since socket identifiers can differ between graph versions. Group
+    nodes nesting an outdated group are updated as well. Returns the number
+    of modifiers and group nodes changed.
+    """
+    replace = {'OUTDATED', 'EDITED'} if include_edited else {'OUTDATED'}
+    changed = 0
+    #the extrusion group goes first, the collection group nests it
+    for name, version, current_node_group in (
+            (ECM_NODE_GROUP_NAME, ECM_GRAPH_VERSION, ecm_extrudecurve_node_group),
+            (ECM_HEIGHT_GROUP_NAME, ECM_HEIGHT_GRAPH_VERSION, ecm_height_node_group),
+            (ECM_INSTANCE_GROUP_NAME, ECM_INSTANCE_GRAPH_VERSION, ecm_instance_node_group),
+            (ECM_COLLECTION_GROUP_NAME, ECM_COLLECTION_GRAPH_VERSION, ecm_collection_node_group)):
+        stale = {
+            node_group for node_group in bpy.data.node_groups
+            if node_group.name.startswith(name) and ecm_node_group_status(node_group, version) in replace
+        }
+        if stale:
+            changed += _ecm_swap_node_groups(stale, current_node_group())
+    return changed
+
+
+def _ecm_swap_node_groups(stale, current):
+    """Point the modifiers and group nodes using a group of ``stale`` to ``current``, return how many"""
+    changed = 0
+    for obj in bpy.data.objects:
+        if obj.library is not None:
+            continue
+        for mod in obj.modifiers:
+            if mod.type != 'NODES' or mod.node_group not in stale:
+                continue
+            values = _ecm_modifier_inputs(mod)
+            mod.node_group = current
+            for item in current.interface.items_tree:
+                if item.item_type != 'SOCKET' or item.in_out != 'INPUT' or item.name not in values:
+                    continue
+                value, use_attribute, attribute_name = values[item.name]
+                try:
+                    mod[item.identifier] = value
+                except TypeError:
+                    continue
+                if use_attribute is not None and item.identifier + "_use_attribute" in mod:
+                    mod[item.identifier + "_use_attribute"] = use_attribute
+                    mod[item.identifier + "_attribute_name"] = attribute_name or ""
+            obj.update_tag()
+            changed += 1
+
+    for tree in bpy.data.node_groups:
+        if tree.library is not None or tree in stale:
+            continue
+        for node in tree.nodes:
+            if node.bl_idname == 'GeometryNodeGroup' and node.node_tree in stale:
+                node.node_tree = current
+                changed += 1
+
+    for node_group in stale:
+        if node_group.users == 0:
+            bpy.data.node_groups.remove(node_group)
+    return changed
+
+
+class ECM_UpgradeModifiers(bpy.types.Operator):
+    """Replace outdated ECM node groups with the current ones in the whole file"""
+    bl_idname = "object.ecm_upgrade_modifiers"
+    bl_label = "Upgrade ECM Modifiers"
+    bl_description = "Swap every outdated Extrude Curve (ECM) node group in this file for the current version"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    include_edited: bpy.props.BoolProperty(
+        name="Include Edited",
+        description="Also replace node groups that were changed by hand",
+        default=False,
+    )
+
+    def execute(self, context):
+        changed = ecm_upgrade_modifiers(self.include_edited)
+        self.report({'INFO'}, "Upgraded %d ECM modifier(s) and group node(s)" % changed)
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Cap Cache
+# ------------------------------------------------------------------------
+#objects waiting for their cap cache to be rebaked, by name
+_ecm_stale_caches = set()
+#objects whose cap cache is being baked, the bake's own depsgraph updates don't make it stale
+_ecm_baking_caches = set()
+
+
+def ecm_curve_fingerprint(curve):
+    """Hash the curve data that the Fill Curve triangulation depends on"""
+    digest = hashlib.sha1()
+    digest.update(repr((curve.dimensions, curve.resolution_u, curve.render_resolution_u, curve.twist_mode)).encode())
+    for spline in curve.splines:
+        digest.update(repr((spline.type, spline.use_cyclic_u, spline.resolution_u, spline.order_u,
+                            spline.use_endpoint_u, spline.use_bezier_u, spline.material_index)).encode())
+        if spline.type == 'BEZIER':
+            points, attrs = spline.bezier_points, ("co", "handle_left", "handle_right")
+        else:
+            #co is (x, y, z, w), the NURBS weight is hashed with the position
+            points, attrs = spline.points, ("co",)
+        for attr in attrs:
+            values = array('f', [0.0]) * (len(points) * (4 if attr == "co" and spline.type != 'BEZIER' else 3))
+            points.foreach_get(attr, values)
+            digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+#modifier inputs upstream of the Cap Cache node besides Geometry. Height only splits the splines into
+#groups, one value is always one group, so only an attribute name counts for it
+ECM_CACHE_INPUTS = ("Simplify Tolerance", "Height")
+
+
+def ecm_cache_inputs_fingerprint(obj, mod):
+    """Hash what feeds the Cap Cache node of ``mod`` apart from the curve data
+
+    That is the inputs in ECM_CACHE_INPUTS and the modifiers before ``mod``,
+    which can change the curve or add the attributes Height reads.
+    """
+    inputs = _ecm_modifier_inputs(mod)
+    description = []
+    for name in ECM_CACHE_INPUTS:
+        value, use_attribute, attribute_name = inputs.get(name, (None, None, None))
+        if use_attribute:
+            description.append((name, attribute_name))
+        elif name != "Height":
+            description.append((name, _ecm_fingerprint_value(value)))
+    for earlier in obj.modifiers:
+        if earlier == mod:
+            break
+        description.append((earlier.name, earlier.type, earlier.show_viewport, earlier.show_render))
+        if earlier.type == 'NODES' and earlier.node_group is not None:
+            description.append((earlier.node_group.name, sorted(
+                (name, _ecm_fingerprint_value(values)) for name, values in _ecm_modifier_inputs(earlier).items())))
+    return hashlib.sha1(repr(description).encode("utf-8")).hexdigest()
+
+
+def _ecm_cache_bake(mod):
+    """Return the modifier bake entry of the Cap Cache node, or None"""
+    for bake in mod.bakes:
+        node = getattr(bake, "node", None)
+        if node is not None and node.name == ECM_CACHE_NODE_NAME:
+            return bake
+    return None
+
+
+def _ecm_bake_override(**members):
+    """Context override for running the bake operators outside of an operator, e.g. from a timer"""
+    window = bpy.context.window or next(iter(bpy.context.window_manager.windows), None)
+    if window is not None:
+        members["window"] = window
+    return bpy.context.temp_override(**members)
+
+
+def ecm_bake_cap_cache(obj, mod):
+    """Bake the Cap Cache node of ``mod`` and remember which curve it was baked from
+
+    Returns an error message, or None on success.
+    """
+    if not hasattr(bpy.types, "NodesModifierBake") or "node" not in bpy.types.NodesModifierBake.bl_rna.properties:
+        return "%s: Blender %s doesn't expose the bake nodes of modifiers, cap caches need a newer version" % (
+            obj.name, bpy.app.version_string)
+    bake = _ecm_cache_bake(mod)
+    if bake is None:
+        return "%s: the node group has no cap cache, run Upgrade ECM Modifiers" % obj.name
+    bake.bake_mode = 'STILL'
+    if hasattr(mod, "bake_target"):
+        #keep the cache inside the .blend where packed bakes are supported
+        mod.bake_target = 'PACKED'
+    elif not bpy.data.is_saved and not mod.bake_directory:
+        return "%s: save the file first, the cap cache is written next to it" % obj.name
+    _ecm_baking_caches.add(obj.name)
+    try:
+        with _ecm_bake_override():
+            result = bpy.ops.object.geometry_node_bake_single(
+                session_uid=obj.session_uid, modifier_name=mod.name, bake_id=bake.bake_id)
+        if 'FINISHED' not in result:
+            return "%s: baking the cap cache failed" % obj.name
+        obj["ecm_cap_cache"] = ecm_curve_fingerprint(obj.data)
+        obj["ecm_cap_cache_inputs"] = ecm_cache_inputs_fingerprint(obj, mod)
+    finally:
+        _ecm_baking_caches.discard(obj.name)
+    return None
+
+
+def ecm_free_cap_cache(obj, mod, keep=False):
+    """Delete the baked caps of ``mod`` so the curve is evaluated live again
+
+    With ``keep`` the object stays marked for caching and gets rebaked by
+    the depsgraph handler.
+    """
+    bake = _ecm_cache_bake(mod)
+    if bake is not None:
+        with _ecm_bake_override():
+            bpy.ops.object.geometry_node_bake_delete_single(
+                session_uid=obj.session_uid, modifier_name=mod.name, bake_id=bake.bake_id)
+    if keep:
+        obj["ecm_cap_cache"] = ""
+    elif "ecm_cap_cache" in obj:
+        del obj["ecm_cap_cache"]
+    if "ecm_cap_cache_inputs" in obj:
+        del obj["ecm_cap_cache_inputs"]
+
+
+def _ecm_rebake_stale_caches():
+    """Timer: free outdated cap caches right away, rebake them once the curve is out of edit mode"""
+    for name in list(_ecm_stale_caches):
+        obj = bpy.data.objects.get(name)
+        mod = ecm_find_modifier(obj) if obj is not None and "ecm_cap_cache" in obj else None
+        if mod is None:
+            _ecm_stale_caches.discard(name)
+            continue
+        if obj["ecm_cap_cache"]:
+            ecm_free_cap_cache(obj, mod, keep=True)
+        if obj.mode == 'EDIT':
+            continue
+        _ecm_stale_caches.discard(name)
+        #through the operator, so failures show up in the status bar and the Info editor
+        try:
+            with _ecm_bake_override(selected_objects=[obj]):
+                bpy.ops.object.ecm_cache_caps(action='BAKE')
+        except RuntimeError:
+            #the operator reported the error already
+            pass
+    return 0.5 if _ecm_stale_caches else None
+
+
+@bpy.app.handlers.persistent
+def ecm_cap_cache_update(scene, depsgraph):
+    """Invalidate cap caches whose curve data or upstream inputs changed
+
+    Curve updates are checked against the curve fingerprint, geometry
+    updates of the objects against ecm_cache_inputs_fingerprint(), so
+    editing Height, Segments or any other input after the cache never
+    touches it.
+    """
+    curves, objects = set(), set()
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Curve):
+            curves.add(update.id.original)
+        elif isinstance(update.id, bpy.types.Object) and update.is_updated_geometry:
+            objects.add(update.id.original)
+    if not curves and not objects:
+        return
+    for obj in bpy.data.objects:
+        if "ecm_cap_cache" not in obj or obj.name in _ecm_stale_caches or obj.name in _ecm_baking_caches:
+            continue
+        if obj.data in curves and obj["ecm_cap_cache"] != ecm_curve_fingerprint(obj.data):
+            _ecm_stale_caches.add(obj.name)
+        elif obj in objects and obj["ecm_cap_cache"]:
+            mod = ecm_find_modifier(obj)
+            if mod is not None and obj.get("ecm_cap_cache_inputs") != ecm_cache_inputs_fingerprint(obj, mod):
+                _ecm_stale_caches.add(obj.name)
+    if _ecm_stale_caches and not bpy.app.timers.is_registered(_ecm_rebake_stale_caches):
+        bpy.app.timers.register(_ecm_rebake_stale_caches, first_interval=0.0)
+
+
+class ECM_CacheCaps(bpy.types.Operator):
+    """Bake or free the cap cache of the selected ECM objects"""
+    bl_idname = "object.ecm_cache_caps"
+    bl_label = "Cache ECM Caps"
+    bl_description = ("Bake the filled caps of the selected ECM objects, so changing Height or Segments "
+                      "no longer triangulates the curve again. The cache is rebaked when the curve or Simplify Tolerance changes")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    action: bpy.props.EnumProperty(
+        name="Action",
+        items=(
+            ('BAKE', "Bake", "Bake the cap cache"),
+            ('FREE', "Free", "Delete the cap cache and evaluate the curve live"),
+        ),
+        default='BAKE',
+    )
+
+    def execute(self, context):
+        targets = [(obj, ecm_find_modifier(obj)) for obj in context.selected_objects]
+        targets = [(obj, mod) for obj, mod in targets if mod is not None]
+        if not targets:
+            self.report({'ERROR'}, "Please select an object with an ECM modifier")
+            return {'CANCELLED'}
+
+        for obj, mod in targets:
+            _ecm_stale_caches.discard(obj.name)
+            if self.action == 'FREE':
+                ecm_free_cap_cache(obj, mod)
+                continue
+            error = ecm_bake_cap_cache(obj, mod)
+            if error is not None:
+                self.report({'ERROR'}, error)
+                return {'CANCELLED'}
+        self.report({'INFO'}, "%s the cap cache of %d object(s)" % ("Baked" if self.action == 'BAKE' else "Freed", len(targets)))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Curve Simplification
+# ------------------------------------------------------------------------
+class ECM_SimplifyReport(bpy.types.Operator):
+    """Report how many curve points Simplify Tolerance removes on the selected ECM objects"""
+    bl_idname = "object.ecm_simplify_report"
+    bl_label = "Report ECM Simplification"
+    bl_description = "Count the curve points that are filled and extruded before and after Simplify Tolerance"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        from . import numpy_engine
+
+        before = after = objects = 0
+        for obj in context.selected_objects:
+            mod = ecm_find_modifier(obj) if obj.type == 'CURVE' else None
+            if mod is None:
+                continue
+            tolerance = _ecm_modifier_inputs(mod).get("Simplify Tolerance", (0.0, None, None))[0]
+            try:
+                positions, offsets, cyclic = numpy_engine.curve_arrays(obj.data)
+            except ValueError as exc:
+                self.report({'WARNING'}, "%s: %s" % (obj.name, exc))
+                continue
+            simplified, _offsets = numpy_engine.simplify(positions, offsets, cyclic, tolerance, ECM_SIMPLIFY_PASSES)
+            before += len(positions)
+            after += len(simplified)
+            objects += 1
+        if not objects:
+            self.report({'ERROR'}, "Please select a curve object with an ECM modifier")
+            return {'CANCELLED'}
+
+        reduction = 100.0 * (before - after) / before if before else 0.0
+        self.report({'INFO'}, "%d curve point(s) simplified to %d (%.1f%% fewer) on %d object(s)" % (before, after, reduction, objects))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Shape Instancing
+# ------------------------------------------------------------------------
+ECM_INSTANCE_GROUP_NAME = "ECM_InstanceShapes"
+#bump whenever ecm_instance_node_group() changes, like ECM_GRAPH_VERSION
+ECM_INSTANCE_GRAPH_VERSION = 1
+
+
+def ecm_instance_node_group():
+    """Return the current ECM_InstanceShapes Geometry Node group, building it when missing"""
+    node_group = ecm_current_node_group(ECM_INSTANCE_GROUP_NAME, ECM_INSTANCE_GRAPH_VERSION)
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = ECM_INSTANCE_GROUP_NAME)
+    node_group.description = "Instance the extruded shapes of a collection on points carrying ecm_shape and ecm_angle"
+    node_group.is_modifier = True
+
+    #initialize node_group interface
+    #Socket Geometry
+    geometry_socket = node_group.interface.new_socket(name = "Geometry", in_out='OUTPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket.attribute_domain = 'POINT'
+
+    #Socket Geometry
+    geometry_socket_1 = node_group.interface.new_socket(name = "Geometry", in_out='INPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket_1.attribute_domain = 'POINT'
+
+    #Socket Shapes
+    shapes_socket = node_group.interface.new_socket(name = "Shapes", in_out='INPUT', socket_type = 'NodeSocketCollection')
+    shapes_socket.attribute_domain = 'POINT'
+    shapes_socket.description = "Collection holding one extruded object per unique shape"
+
+    #initialize node_group nodes
+    #node Group Input
+    group_input = node_group.nodes.new("NodeGroupInput")
+    group_input.name = "Group Input"
+
+    #node Group Output
+    group_output = node_group.nodes.new("NodeGroupOutput")
+    group_output.name = "Group Output"
+    group_output.is_active_output = True
+
+    #node Collection Info
+    #children are sorted by name, which matches the ecm_shape index
+    collection_info = node_group.nodes.new("GeometryNodeCollectionInfo")
+    collection_info.name = "Collection Info"
+    collection_info.transform_space = 'ORIGINAL'
+    #Separate Children
+    collection_info.inputs[1].default_value = True
+    #Reset Children
+    collection_info.inputs[2].default_value = True
+
+    #node Named Attribute
+    named_attribute = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute.name = "Named Attribute"
+    named_attribute.data_type = 'INT'
+    #Name
+    named_attribute.inputs[0].default_value = "ecm_shape"
+
+    #node Named Attribute.001
+    named_attribute_001 = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute_001.name = "Named Attribute.001"
+    named_attribute_001.data_type = 'FLOAT'
+    #Name
+    named_attribute_001.inputs[0].default_value = "ecm_angle"
+
+    #node Combine XYZ
+    combine_xyz = node_group.nodes.new("ShaderNodeCombineXYZ")
+    combine_xyz.name = "Combine XYZ"
+    #X
+    combine_xyz.inputs[0].default_value = 0.0
+    #Y
+    combine_xyz.inputs[1].default_value = 0.0
+
+    #node Instance on Points
+    instance_on_points = node_group.nodes.new("GeometryNodeInstanceOnPoints")
+    instance_on_points.name = "Instance on Points"
+    #Selection
+    instance_on_points.inputs[1].default_value = True
+    #Pick Instance
+    instance_on_points.inputs[3].default_value = True
+    #Scale
+    instance_on_points.inputs[6].default_value = (1.0, 1.0, 1.0)
+
+
+    #Set locations
+    group_input.location = (-600.0, 0.0)
+    group_output.location = (300.0, 0.0)
+    collection_info.location = (-350.0, -80.0)
+    named_attribute.location = (-350.0, -300.0)
+    named_attribute_001.location = (-550.0, -460.0)
+    combine_xyz.location = (-350.0, -460.0)
+    instance_on_points.location = (40.0, 0.0)
+
+    #Set dimensions
+    group_input.width, group_input.height = 140.0, 100.0
+    group_output.width, group_output.height = 140.0, 100.0
+    collection_info.width, collection_info.height = 140.0, 100.0
+    named_attribute.width, named_attribute.height = 140.0, 100.0
+    named_attribute_001.width, named_attribute_001.height = 140.0, 100.0
+    combine_xyz.width, combine_xyz.height = 140.0, 100.0
+    instance_on_points.width, instance_on_points.height = 140.0, 100.0
+
+    #initialize node_group links
+    #group_input.Geometry -> instance_on_points.Points
+    node_group.links.new(group_input.outputs[0], instance_on_points.inputs[0])
+    #group_input.Shapes -> collection_info.Collection
+    node_group.links.new(group_input.outputs[1], collection_info.inputs[0])
+    #collection_info.Instances -> instance_on_points.Instance
+    node_group.links.new(collection_info.outputs[0], instance_on_points.inputs[2])
+    #named_attribute.Attribute -> instance_on_points.Instance Index
+    node_group.links.new(named_attribute.outputs[0], instance_on_points.inputs[4])
+    #named_attribute_001.Attribute -> combine_xyz.Z
+    node_group.links.new(named_attribute_001.outputs[0], combine_xyz.inputs[2])
+    #combine_xyz.Vector -> instance_on_points.Rotation
+    node_group.links.new(combine_xyz.outputs[0], instance_on_points.inputs[5])
+    #instance_on_points.Instances -> group_output.Geometry
+    node_group.links.new(instance_on_points.outputs[0], group_output.inputs[0])
+
+    node_group["ecm_version"] = ECM_INSTANCE_GRAPH_VERSION
+    node_group["ecm_fingerprint"] = ecm_node_group_fingerprint(node_group)
     return node_group
 
 
+def _ecm_copy_spline(spline, curve, origin, angle):
+    """Copy ``spline`` into ``curve``, moved by ``-origin`` and then rotated by ``-angle`` about Z"""
+    rotation = Matrix.Rotation(-angle, 3, 'Z')
+    origin = Vector(origin)
+
+    copy = curve.splines.new(spline.type)
+    for attr in ("use_cyclic_u", "use_endpoint_u", "use_bezier_u", "order_u", "resolution_u", "use_smooth", "material_index"):
+        setattr(copy, attr, getattr(spline, attr))
+    if spline.type == 'BEZIER':
+        copy.bezier_points.add(len(spline.bezier_points) - 1)
+        for source, target in zip(spline.bezier_points, copy.bezier_points):
+            #types first, auto handles would otherwise be recalculated over the copied ones
+            target.handle_left_type = source.handle_left_type
+            target.handle_right_type = source.handle_right_type
+            target.co = rotation @ (source.co - origin)
+            target.handle_left = rotation @ (source.handle_left - origin)
+            target.handle_right = rotation @ (source.handle_right - origin)
+            target.tilt, target.radius = source.tilt, source.radius
+    else:
+        copy.points.add(len(spline.points) - 1)
+        for source, target in zip(spline.points, copy.points):
+            target.co = (*(rotation @ (source.co.xyz - origin)), source.co.w)
+            target.tilt, target.radius = source.tilt, source.radius
+    return copy
+
+
+def _ecm_layer_collection(layer_collection, collection):
+    if layer_collection.collection == collection:
+        return layer_collection
+    for child in layer_collection.children:
+        found = _ecm_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+
+class ECM_InstanceShapes(bpy.types.Operator):
+    """Extrude repeated spline shapes once and instance them"""
+    bl_idname = "object.ecm_instance_shapes"
+    bl_label = "Instance Repeated Shapes"
+    bl_description = ("Find splines of the active curve that repeat the same shape, moved or rotated, "
+                      "extrude every shape once and instance it. The original object is hidden")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Largest difference between control points that still counts as the same shape",
+        default=0.0001, min=0.0000001, soft_max=0.01, subtype='DISTANCE', precision=5,
+    )
+
+    def execute(self, context):
+        from . import numpy_engine
+
+        obj = context.object
+        if obj is None or obj.type != 'CURVE':
+            self.report({'ERROR'}, "Please select a curve object")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        keys, origins, angles = numpy_engine.spline_shapes(obj.data, self.tolerance)
+        groups = {}
+        for index, key in enumerate(keys):
+            if key is not None:
+                groups.setdefault(key, []).append(index)
+        shapes = [indices for indices in groups.values() if len(indices) > 1]
+        if not shapes:
+            self.report({'INFO'}, "No repeated shapes found in %d spline(s)" % len(keys))
+            return {'CANCELLED'}
+
+        node_group = ecm_extrudecurve_node_group()
+        source_mod = ecm_find_modifier(obj)
+        values = {}
+        if source_mod is not None:
+            values = {name: value for name, (value, _use_attribute, _attribute_name) in _ecm_modifier_inputs(source_mod).items()}
+        collections = obj.users_collection
+
+        #one extruded object per unique shape, in a collection kept out of the view layer
+        shapes_collection = bpy.data.collections.new(obj.name + " ECM Shapes")
+        collections[0].children.link(shapes_collection)
+        layer_collection = _ecm_layer_collection(context.view_layer.layer_collection, shapes_collection)
+        if layer_collection is not None:
+            layer_collection.exclude = True
+        for number, indices in enumerate(shapes):
+            first = indices[0]
+            curve = obj.data.copy()
+            curve.name = "%s Shape.%04d" % (obj.data.name, number)
+            curve.splines.clear()
+            _ecm_copy_spline(obj.data.splines[first], curve, origins[first], angles[first])
+            shape_obj = bpy.data.objects.new("%s Shape.%04d" % (obj.name, number), curve)
+            shapes_collection.objects.link(shape_obj)
+            mod = shape_obj.modifiers.new(name=ECM_MODIFIER_NAME, type="NODES")
+            mod.node_group = node_group
+            ecm_set_modifier_inputs(mod, values)
+
+        #one point per repeat, carrying the shape index and rotation
+        instanced = [index for indices in shapes for index in indices]
+        shape_index = [number for number, indices in enumerate(shapes) for _index in indices]
+        mesh = bpy.data.meshes.new(obj.name + " ECM Instances")
+        mesh.vertices.add(len(instanced))
+        mesh.vertices.foreach_set("co", origins[instanced].astype("float32").ravel())
+        mesh.attributes.new("ecm_shape", 'INT', 'POINT').data.foreach_set("value", shape_index)
+        mesh.attributes.new("ecm_angle", 'FLOAT', 'POINT').data.foreach_set("value", angles[instanced].astype("float32"))
+        instancer = bpy.data.objects.new(obj.name + " ECM Instances", mesh)
+        instancer.matrix_world = obj.matrix_world
+        for collection in collections:
+            collection.objects.link(instancer)
+        mod = instancer.modifiers.new(name="ECM Instances", type="NODES")
+        mod.node_group = ecm_instance_node_group()
+        ecm_set_modifier_inputs(mod, {"Shapes": shapes_collection})
+
+        #the splines that are not repeated keep a regular extrusion
+        remaining = len(keys) - len(instanced)
+        if remaining:
+            curve = obj.data.copy()
+            curve.name = obj.data.name + " Unique"
+            for index in sorted(instanced, reverse=True):
+                curve.splines.remove(curve.splines[index])
+            unique_obj = bpy.data.objects.new(obj.name + " Unique", curve)
+            unique_obj.matrix_world = obj.matrix_world
+            for collection in collections:
+                collection.objects.link(unique_obj)
+            mod = unique_obj.modifiers.new(name=ECM_MODIFIER_NAME, type="NODES")
+            mod.node_group = node_group
+            ecm_set_modifier_inputs(mod, values)
+
+        obj.hide_set(True)
+        obj.hide_render = True
+        elapsed = time.perf_counter() - start
+        self.report({'INFO'}, "%d spline(s) as %d instance(s) of %d shape(s), %d left unique, %.2f s" % (
+            len(keys), len(instanced), len(shapes), remaining, elapsed))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Geometry Cache
+# ------------------------------------------------------------------------
+_ecm_geometry_cache = None
+#(ECM object, stand-in mesh object, its hide_render) of the frame being rendered in the background
+_ecm_render_proxies = []
+
+
+def ecm_geometry_cache():
+    """Return the geometry cache set in the preferences or $ECM_CACHE_DIR, None when disabled"""
+    global _ecm_geometry_cache
+    from .geometry_cache import GeometryCache
+
+    prefs = ecm_preferences()
+    directory = os.environ.get("ECM_CACHE_DIR") or (bpy.path.abspath(prefs.cache_directory) if prefs is not None else "")
+    if not directory:
+        return None
+    size = int(os.environ.get("ECM_CACHE_SIZE") or (prefs.cache_size if prefs is not None else ECM_GEOMETRY_CACHE_MB))
+    if _ecm_geometry_cache is None or _ecm_geometry_cache.directory != directory:
+        _ecm_geometry_cache = GeometryCache(directory, 0)
+    _ecm_geometry_cache.max_bytes = size * 1024 * 1024
+    return _ecm_geometry_cache
+
+
+def ecm_cache_key(obj, mod, fingerprints=None):
+    """Return the cache key of the render result of ``mod`` on ``obj``, None when it can't be cached
+
+    The key covers the curve data (see ecm_curve_fingerprint()), all the
+    modifier inputs (viewport only ones at their render values), the node
+    group and the Blender version. Only objects whose single modifier is
+    ECM are cached, the cache holds the ECM output and not what further
+    modifiers make of it.
+    ``fingerprints`` memoizes node group hashes across calls.
+    """
+    from .geometry_cache import cache_key
+
+    if obj.type != 'CURVE' or mod.node_group is None or len(obj.modifiers) != 1:
+        return None
+    if fingerprints is None:
+        fingerprints = {}
+    if mod.node_group.name not in fingerprints:
+        fingerprints[mod.node_group.name] = ecm_node_group_fingerprint(mod.node_group)
+    inputs = _ecm_modifier_inputs(mod)
+    for name, value in ECM_RENDER_INPUTS.items():
+        if name in inputs:
+            inputs[name] = (value, None, None)
+    return cache_key(bpy.app.version, fingerprints[mod.node_group.name], ecm_curve_fingerprint(obj.data),
+                     sorted(inputs.items()))
+
+
+def ecm_evaluate_cached(context, objects):
+    """Return ``[(ExtrusionArrays, face material indices)]`` of the ECM ``objects`` at render quality
+
+    Results found in the geometry cache are read from it, and their
+    modifiers are disabled while the others are evaluated. The others are
+    evaluated once with their render inputs and stored.
+    """
+    from . import numpy_engine
+
+    cache = ecm_geometry_cache()
+    mods = [ecm_find_modifier(obj) for obj in objects]
+    keys = [None] * len(objects)
+    results = [None] * len(objects)
+    if cache is not None:
+        fingerprints = {}
+        for i, (obj, mod) in enumerate(zip(objects, mods)):
+            keys[i] = ecm_cache_key(obj, mod, fingerprints)
+            entry = cache.get(keys[i]) if keys[i] is not None else None
+            if entry is not None:
+                arrays = numpy_engine.ExtrusionArrays(*(entry[name] for name in numpy_engine.ExtrusionArrays._fields))
+                results[i] = (arrays, numpy.array(entry["material_index"]))
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    skipped = [mods[i] for i, result in enumerate(results) if result is not None and mods[i].show_viewport]
+    for mod in skipped:
+        mod.show_viewport = False
+    restore = ecm_force_render_inputs([mods[i] for i in misses])
+    depsgraph = context.evaluated_depsgraph_get()
+    for i in misses:
+        obj_eval = objects[i].evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        arrays = numpy_engine.read_mesh(mesh)
+        material_index = numpy.empty(len(mesh.polygons), dtype=numpy.int32)
+        mesh.polygons.foreach_get("material_index", material_index)
+        obj_eval.to_mesh_clear()
+        results[i] = (arrays, material_index)
+        if keys[i] is not None:
+            cache.put(keys[i], dict(arrays._asdict(), material_index=material_index), evict=False)
+    for mod, values in restore:
+        ecm_set_modifier_inputs(mod, values)
+    for mod in skipped:
+        mod.show_viewport = True
+    if cache is not None and misses:
+        cache.evict()
+    return results
+
+
+@bpy.app.handlers.persistent
+def ecm_render_cache_swap(scene, _depsgraph=None):
+    """Render the cacheable ECM objects of a background render frame from the geometry cache
+
+    Runs before every frame: each object is swapped for a plain mesh
+    object holding its cached (or freshly cached) result for that frame,
+    so the render never evaluates the modifier. Only done in background
+    mode, where the render runs on the main thread.
+    """
+    from . import numpy_engine
+
+    if not bpy.app.background:
+        return
+    cache = ecm_geometry_cache()
+    if cache is None:
+        return
+    #stand-ins a previous frame didn't get to remove
+    ecm_render_cache_restore(scene)
+    #the view layer is still at the previous frame of an animation here
+    scene.frame_set(scene.frame_current)
+    objects = []
+    for obj in scene.objects:
+        mod = ecm_find_modifier(obj)
+        if mod is not None and mod.show_render and not obj.hide_render and len(obj.modifiers) == 1:
+            objects.append(obj)
+    if not objects:
+        return
+
+    for obj, (arrays, material_index) in zip(objects, ecm_evaluate_cached(bpy.context, objects)):
+        mesh = numpy_engine.write_mesh(bpy.data.meshes.new(obj.name + " ECM Cache"), arrays)
+        for material in obj.data.materials:
+            mesh.materials.append(material)
+        mesh.polygons.foreach_set("material_index", material_index)
+        mesh.update()
+        proxy = bpy.data.objects.new(mesh.name, mesh)
+        proxy.matrix_world = obj.matrix_world
+        for collection in obj.users_collection:
+            collection.objects.link(proxy)
+        _ecm_render_proxies.append((obj, proxy, obj.hide_render))
+        obj.hide_render = True
+    print("ECM cache: %d object(s) of frame %d rendered from the geometry cache, %s" % (
+        len(objects), scene.frame_current, cache.summary()))
+
+
+@bpy.app.handlers.persistent
+def ecm_render_cache_restore(scene, _depsgraph=None):
+    """Remove the stand-in meshes of ecm_render_cache_swap() after every frame and when the render ends
+
+    Safe to run more than once, and with objects or stand-ins that were
+    removed in the meantime.
+    """
+    while _ecm_render_proxies:
+        obj, proxy, hide_render = _ecm_render_proxies.pop()
+        try:
+            mesh = proxy.data
+            bpy.data.objects.remove(proxy)
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        except ReferenceError:
+            pass
+        try:
+            obj.hide_render = hide_render
+        except ReferenceError:
+            pass
+
+
+# ------------------------------------------------------------------------
+# Bake to Mesh
+# ------------------------------------------------------------------------
+class ECM_BakeMeshes(bpy.types.Operator):
+    """Convert the selected ECM objects to meshes in one pass"""
+    bl_idname = "object.ecm_bake_meshes"
+    bl_label = "Bake ECM to Mesh"
+    bl_description = ("Evaluate the selected ECM objects once and write their extrusions as mesh objects, "
+                      "one per curve or joined into a single mesh")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    join: bpy.props.BoolProperty(
+        name="Join",
+        description="Write a single mesh in world space, with an ecm_source face attribute indexing the "
+                    "source objects listed in its ecm_sources property",
+        default=False,
+    )
+    remove_source: bpy.props.BoolProperty(
+        name="Remove Curves",
+        description="Delete the curve objects instead of hiding them",
+        default=False,
+    )
+
+    def execute(self, context):
+        from . import numpy_engine
+
+        sources = [obj for obj in context.selected_objects if obj.type == 'CURVE' and ecm_find_modifier(obj) is not None]
+        if not sources:
+            self.report({'ERROR'}, "Please select a curve object with an ECM modifier")
+            return {'CANCELLED'}
+
+        start = time.perf_counter()
+        evaluated = ecm_evaluate_cached(context, sources)
+        parts = [arrays for arrays, _material_index in evaluated]
+        material_indices = [material_index for _arrays, material_index in evaluated]
+
+        if self.join:
+            matrices = [numpy.array(obj.matrix_world) for obj in sources]
+            arrays, face_part = numpy_engine.join_arrays(parts, matrices)
+            mesh = numpy_engine.write_mesh(bpy.data.meshes.new("ECM Baked"), arrays)
+            #one slot per distinct material, remapped from every source's own slots,
+            #sources without materials get an empty slot instead of another source's first one
+            materials = []
+            for obj, material_index in zip(sources, material_indices):
+                slots = []
+                for material in obj.data.materials or [None]:
+                    if material not in materials:
+                        materials.append(material)
+                    slots.append(materials.index(material))
+                material_index[:] = numpy.asarray(slots)[numpy.clip(material_index, 0, len(slots) - 1)]
+            for material in materials:
+                mesh.materials.append(material)
+            mesh.polygons.foreach_set("material_index", numpy.concatenate(material_indices))
+            mesh.attributes.new("ecm_source", 'INT', 'FACE').data.foreach_set("value", face_part)
+            mesh["ecm_sources"] = [obj.name for obj in sources]
+            mesh.update()
+            baked = [bpy.data.objects.new("ECM Baked", mesh)]
+            for collection in sources[0].users_collection:
+                collection.objects.link(baked[0])
+        else:
+            baked = []
+            for obj, arrays, material_index in zip(sources, parts, material_indices):
+                mesh = numpy_engine.write_mesh(bpy.data.meshes.new(obj.name), arrays)
+                for material in obj.data.materials:
+                    mesh.materials.append(material)
+                mesh.polygons.foreach_set("material_index", material_index)
+                mesh.update()
+                baked_obj = bpy.data.objects.new(obj.name + " Mesh", mesh)
+                baked_obj.matrix_world = obj.matrix_world
+                for collection in obj.users_collection:
+                    collection.objects.link(baked_obj)
+                baked.append(baked_obj)
+
+        for obj in sources:
+            if self.remove_source:
+                bpy.data.objects.remove(obj)
+            else:
+                obj.hide_set(True)
+                obj.hide_render = True
+        for obj in baked:
+            obj.select_set(True)
+        context.view_layer.objects.active = baked[0]
+
+        elapsed = time.perf_counter() - start
+        vertices = sum(len(arrays.positions) for arrays in parts)
+        rate = vertices / elapsed if elapsed > 0.0 else float(vertices)
+        self.report({'INFO'}, "Baked %d object(s) to %d mesh(es), %d vertices in %.2f s (%.0f vertices/s)" % (
+            len(sources), len(baked), vertices, elapsed, rate))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Collection Extrusion
+# ------------------------------------------------------------------------
+ECM_COLLECTION_GROUP_NAME = "ECM_ExtrudeCollection"
+#bump whenever ecm_collection_node_group() changes, like ECM_GRAPH_VERSION
+ECM_COLLECTION_GRAPH_VERSION = 1
+ECM_HEIGHT_GROUP_NAME = "ECM_Height"
+#bump whenever ecm_height_node_group() changes, like ECM_GRAPH_VERSION
+ECM_HEIGHT_GRAPH_VERSION = 1
+ECM_HEIGHT_MODIFIER_NAME = "ECM Height"
+
+
+def ecm_height_node_group():
+    """Return the current ECM_Height Geometry Node group, building it when missing
+
+    It stores a Height on every point of the curve it modifies, which the
+    collection group uses instead of its own Height for that object.
+    """
+    node_group = ecm_current_node_group(ECM_HEIGHT_GROUP_NAME, ECM_HEIGHT_GRAPH_VERSION)
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = ECM_HEIGHT_GROUP_NAME)
+    node_group.description = "Give this curve object its own height in an Extrude Collection (ECM) modifier"
+    node_group.is_modifier = True
+
+    #initialize node_group interface
+    #Socket Geometry
+    geometry_socket = node_group.interface.new_socket(name = "Geometry", in_out='OUTPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket.attribute_domain = 'POINT'
+
+    #Socket Geometry
+    geometry_socket_1 = node_group.interface.new_socket(name = "Geometry", in_out='INPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket_1.attribute_domain = 'POINT'
+
+    #Socket Height
+    height_socket = node_group.interface.new_socket(name = "Height", in_out='INPUT', socket_type = 'NodeSocketFloat')
+    height_socket.default_value = 1.0
+    height_socket.min_value = -3.4028234663852886e+38
+    height_socket.max_value = 3.4028234663852886e+38
+    height_socket.subtype = 'NONE'
+    height_socket.attribute_domain = 'POINT'
+    height_socket.description = "Extrusion distance in Z of this object, replaces the Height of the collection"
+
+    #initialize node_group nodes
+    #node Group Input
+    group_input = node_group.nodes.new("NodeGroupInput")
+    group_input.name = "Group Input"
+
+    #node Group Output
+    group_output = node_group.nodes.new("NodeGroupOutput")
+    group_output.name = "Group Output"
+    group_output.is_active_output = True
+
+    #node Store Named Attribute
+    store_named_attribute = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute.name = "Store Named Attribute"
+    store_named_attribute.data_type = 'FLOAT'
+    store_named_attribute.domain = 'POINT'
+    #Selection
+    store_named_attribute.inputs[1].default_value = True
+    #Name
+    store_named_attribute.inputs[2].default_value = "ecm_height"
+
+    #node Store Named Attribute.001
+    #realizing the collection fills the attributes of other objects with 0, so a 0 height needs telling apart
+    store_named_attribute_001 = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute_001.name = "Store Named Attribute.001"
+    store_named_attribute_001.data_type = 'BOOLEAN'
+    store_named_attribute_001.domain = 'POINT'
+    #Selection
+    store_named_attribute_001.inputs[1].default_value = True
+    #Name
+    store_named_attribute_001.inputs[2].default_value = "ecm_height_set"
+    #Value
+    store_named_attribute_001.inputs[3].default_value = True
+
+
+    #Set locations
+    group_input.location = (-400.0, 0.0)
+    group_output.location = (200.0, 0.0)
+    store_named_attribute.location = (-200.0, 0.0)
+    store_named_attribute_001.location = (0.0, 0.0)
+
+    #Set dimensions
+    group_input.width, group_input.height = 140.0, 100.0
+    group_output.width, group_output.height = 140.0, 100.0
+    store_named_attribute.width, store_named_attribute.height = 140.0, 100.0
+    store_named_attribute_001.width, store_named_attribute_001.height = 140.0, 100.0
+
+    #initialize node_group links
+    #group_input.Geometry -> store_named_attribute.Geometry
+    node_group.links.new(group_input.outputs[0], store_named_attribute.inputs[0])
+    #group_input.Height -> store_named_attribute.Value
+    node_group.links.new(group_input.outputs[1], store_named_attribute.inputs[3])
+    #store_named_attribute.Geometry -> store_named_attribute_001.Geometry
+    node_group.links.new(store_named_attribute.outputs[0], store_named_attribute_001.inputs[0])
+    #store_named_attribute_001.Geometry -> group_output.Geometry
+    node_group.links.new(store_named_attribute_001.outputs[0], group_output.inputs[0])
+
+    node_group["ecm_version"] = ECM_HEIGHT_GRAPH_VERSION
+    node_group["ecm_fingerprint"] = ecm_node_group_fingerprint(node_group)
+    return node_group
+
+
+def ecm_set_object_height(obj, height):
+    """Give ``obj`` its own Height in collection extrusions, through an ECM_Height modifier"""
+    mod = obj.modifiers.get(ECM_HEIGHT_MODIFIER_NAME)
+    if mod is None or mod.type != 'NODES':
+        mod = obj.modifiers.new(name=ECM_HEIGHT_MODIFIER_NAME, type="NODES")
+    mod.node_group = ecm_height_node_group()
+    ecm_set_modifier_inputs(mod, {"Height": height})
+    return mod
+
+
+def ecm_collection_node_group():
+    """Return the current ECM_ExtrudeCollection Geometry Node group, building it when missing"""
+    node_group = ecm_current_node_group(ECM_COLLECTION_GROUP_NAME, ECM_COLLECTION_GRAPH_VERSION)
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type = 'GeometryNodeTree', name = ECM_COLLECTION_GROUP_NAME)
+    node_group.description = ("Extrude every curve object of a collection in one evaluation, scaling Height by each "
+                              "object's Z scale. Objects with an ECM_Height modifier use its Height instead")
+    node_group.is_modifier = True
+
+    #initialize node_group interface
+    #Socket Geometry
+    geometry_socket = node_group.interface.new_socket(name = "Geometry", in_out='OUTPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket.attribute_domain = 'POINT'
+
+    #Socket Geometry
+    geometry_socket_1 = node_group.interface.new_socket(name = "Geometry", in_out='INPUT', socket_type = 'NodeSocketGeometry')
+    geometry_socket_1.attribute_domain = 'POINT'
+
+    #Socket Collection
+    collection_socket = node_group.interface.new_socket(name = "Collection", in_out='INPUT', socket_type = 'NodeSocketCollection')
+    collection_socket.attribute_domain = 'POINT'
+    collection_socket.description = "Curve objects to extrude"
+
+    #Socket Height
+    height_socket = node_group.interface.new_socket(name = "Height", in_out='INPUT', socket_type = 'NodeSocketFloat')
+    height_socket.default_value = 1.0
+    height_socket.min_value = -3.4028234663852886e+38
+    height_socket.max_value = 3.4028234663852886e+38
+    height_socket.subtype = 'NONE'
+    height_socket.attribute_domain = 'POINT'
+    height_socket.description = "Extrusion distance in Z, multiplied by the Z scale of every object"
+
+    #Socket Segments
+    segments_socket = node_group.interface.new_socket(name = "Segments", in_out='INPUT', socket_type = 'NodeSocketInt')
+    segments_socket.default_value = 1
+    segments_socket.min_value = 1
+    segments_socket.max_value = 1000
+    segments_socket.subtype = 'NONE'
+    segments_socket.attribute_domain = 'POINT'
+    segments_socket.description = "Divisions along the extrusion"
+
+    #Socket Top Cap
+    top_cap_socket = node_group.interface.new_socket(name = "Top Cap", in_out='INPUT', socket_type = 'NodeSocketBool')
+    top_cap_socket.default_value = True
+    top_cap_socket.attribute_domain = 'POINT'
+    top_cap_socket.description = "Close the top end"
+
+    #Socket Bottom Cap
+    bottom_cap_socket = node_group.interface.new_socket(name = "Bottom Cap", in_out='INPUT', socket_type = 'NodeSocketBool')
+    bottom_cap_socket.default_value = True
+    bottom_cap_socket.attribute_domain = 'POINT'
+    bottom_cap_socket.description = "Close the bottom end"
+
+    #initialize node_group nodes
+    #node Group Input
+    group_input = node_group.nodes.new("NodeGroupInput")
+    group_input.name = "Group Input"
+
+    #node Group Output
+    group_output = node_group.nodes.new("NodeGroupOutput")
+    group_output.name = "Group Output"
+    group_output.is_active_output = True
+
+    #node Collection Info
+    collection_info = node_group.nodes.new("GeometryNodeCollectionInfo")
+    collection_info.name = "Collection Info"
+    collection_info.transform_space = 'RELATIVE'
+    #Separate Children
+    collection_info.inputs[1].default_value = True
+    #Reset Children
+    collection_info.inputs[2].default_value = False
+
+    #node Index
+    index = node_group.nodes.new("GeometryNodeInputIndex")
+    index.name = "Index"
+
+    #node Store Named Attribute
+    #the extrusion group fills and welds every ecm_object on its own, so touching or nested objects stay apart
+    store_named_attribute = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute.name = "Store Named Attribute"
+    store_named_attribute.data_type = 'INT'
+    store_named_attribute.domain = 'INSTANCE'
+    #Selection
+    store_named_attribute.inputs[1].default_value = True
+    #Name
+    store_named_attribute.inputs[2].default_value = "ecm_object"
+
+    #node Instance Scale
+    instance_scale = node_group.nodes.new("GeometryNodeInputInstanceScale")
+    instance_scale.name = "Instance Scale"
+
+    #node Separate XYZ
+    separate_xyz = node_group.nodes.new("ShaderNodeSeparateXYZ")
+    separate_xyz.name = "Separate XYZ"
+
+    #node Math
+    math = node_group.nodes.new("ShaderNodeMath")
+    math.name = "Math"
+    math.operation = 'ABSOLUTE'
+    math.use_clamp = False
+
+    #node Store Named Attribute.001
+    #realizing passes the instance attributes on to every curve point of that object
+    store_named_attribute_001 = node_group.nodes.new("GeometryNodeStoreNamedAttribute")
+    store_named_attribute_001.name = "Store Named Attribute.001"
+    store_named_attribute_001.data_type = 'FLOAT'
+    store_named_attribute_001.domain = 'INSTANCE'
+    #Selection
+    store_named_attribute_001.inputs[1].default_value = True
+    #Name
+    store_named_attribute_001.inputs[2].default_value = "ecm_height_factor"
+
+    #node Realize Instances
+    realize_instances = node_group.nodes.new("GeometryNodeRealizeInstances")
+    realize_instances.name = "Realize Instances"
+
+    #node Named Attribute
+    named_attribute = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute.name = "Named Attribute"
+    named_attribute.data_type = 'FLOAT'
+    #Name
+    named_attribute.inputs[0].default_value = "ecm_height_factor"
+
+    #node Math.001
+    math_001 = node_group.nodes.new("ShaderNodeMath")
+    math_001.name = "Math.001"
+    math_001.operation = 'MULTIPLY'
+    math_001.use_clamp = False
+
+    #node Named Attribute.001
+    named_attribute_001 = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute_001.name = "Named Attribute.001"
+    named_attribute_001.data_type = 'FLOAT'
+    #Name
+    named_attribute_001.inputs[0].default_value = "ecm_height"
+
+    #node Named Attribute.002
+    named_attribute_002 = node_group.nodes.new("GeometryNodeInputNamedAttribute")
+    named_attribute_002.name = "Named Attribute.002"
+    named_attribute_002.data_type = 'BOOLEAN'
+    #Name
+    named_attribute_002.inputs[0].default_value = "ecm_height_set"
+
+    #node Switch
+    #objects with an ECM_Height modifier bring their own height, see ecm_height_node_group()
+    switch = node_group.nodes.new("GeometryNodeSwitch")
+    switch.label = "Object Height"
+    switch.name = "Switch"
+    switch.input_type = 'FLOAT'
+
+    #node Group
+    #every object extruded in one go, Height is a field so each one keeps its own
+    group = node_group.nodes.new("GeometryNodeGroup")
+    group.name = "Group"
+    group.node_tree = ecm_extrudecurve_node_group()
+
+    #node Remove Named Attribute
+    #ecm_object is removed by the extrusion group already
+    remove_named_attribute = node_group.nodes.new("GeometryNodeRemoveAttribute")
+    remove_named_attribute.name = "Remove Named Attribute"
+    remove_named_attribute.pattern_mode = 'WILDCARD'
+    #Name
+    remove_named_attribute.inputs[1].default_value = "ecm_height*"
+
+
+    #Set locations
+    group_input.location = (-1000.0, 0.0)
+    group_output.location = (600.0, 0.0)
+    collection_info.location = (-800.0, 100.0)
+    index.location = (-800.0, -120.0)
+    store_named_attribute.location = (-600.0, 100.0)
+    instance_scale.location = (-800.0, -240.0)
+    separate_xyz.location = (-600.0, -240.0)
+    math.location = (-400.0, -240.0)
+    store_named_attribute_001.location = (-400.0, 100.0)
+    realize_instances.location = (-200.0, 100.0)
+    named_attribute.location = (-400.0, -400.0)
+    math_001.location = (-200.0, -300.0)
+    named_attribute_001.location = (-200.0, -480.0)
+    named_attribute_002.location = (-200.0, -640.0)
+    switch.location = (0.0, -300.0)
+    group.location = (200.0, 100.0)
+    remove_named_attribute.location = (400.0, 100.0)
+
+    #Set dimensions
+    group_input.width, group_input.height = 140.0, 100.0
+    group_output.width, group_output.height = 140.0, 100.0
+    collection_info.width, collection_info.height = 140.0, 100.0
+    index.width, index.height = 140.0, 100.0
+    store_named_attribute.width, store_named_attribute.height = 140.0, 100.0
+    instance_scale.width, instance_scale.height = 140.0, 100.0
+    separate_xyz.width, separate_xyz.height = 140.0, 100.0
+    math.width, math.height = 140.0, 100.0
+    store_named_attribute_001.width, store_named_attribute_001.height = 140.0, 100.0
+    realize_instances.width, realize_instances.height = 140.0, 100.0
+    named_attribute.width, named_attribute.height = 140.0, 100.0
+    math_001.width, math_001.height = 140.0, 100.0
+    named_attribute_001.width, named_attribute_001.height = 140.0, 100.0
+    named_attribute_002.width, named_attribute_002.height = 140.0, 100.0
+    switch.width, switch.height = 140.0, 100.0
+    group.width, group.height = 140.0, 100.0
+    remove_named_attribute.width, remove_named_attribute.height = 140.0, 100.0
+
+    #initialize node_group links
+    #group_input.Collection -> collection_info.Collection
+    node_group.links.new(group_input.outputs[1], collection_info.inputs[0])
+    #collection_info.Instances -> store_named_attribute.Geometry
+    node_group.links.new(collection_info.outputs[0], store_named_attribute.inputs[0])
+    #index.Index -> store_named_attribute.Value
+    node_group.links.new(index.outputs[0], store_named_attribute.inputs[3])
+    #instance_scale.Scale -> separate_xyz.Vector
+    node_group.links.new(instance_scale.outputs[0], separate_xyz.inputs[0])
+    #separate_xyz.Z -> math.Value
+    node_group.links.new(separate_xyz.outputs[2], math.inputs[0])
+    #store_named_attribute.Geometry -> store_named_attribute_001.Geometry
+    node_group.links.new(store_named_attribute.outputs[0], store_named_attribute_001.inputs[0])
+    #math.Value -> store_named_attribute_001.Value
+    node_group.links.new(math.outputs[0], store_named_attribute_001.inputs[3])
+    #store_named_attribute_001.Geometry -> realize_instances.Geometry
+    node_group.links.new(store_named_attribute_001.outputs[0], realize_instances.inputs[0])
+    #group_input.Height -> math_001.Value
+    node_group.links.new(group_input.outputs[2], math_001.inputs[0])
+    #named_attribute.Attribute -> math_001.Value
+    node_group.links.new(named_attribute.outputs[0], math_001.inputs[1])
+    #named_attribute_002.Attribute -> switch.Switch
+    node_group.links.new(named_attribute_002.outputs[0], switch.inputs[0])
+    #math_001.Value -> switch.False
+    node_group.links.new(math_001.outputs[0], switch.inputs[1])
+    #named_attribute_001.Attribute -> switch.True
+    node_group.links.new(named_attribute_001.outputs[0], switch.inputs[2])
+    #realize_instances.Geometry -> group.Geometry
+    node_group.links.new(realize_instances.outputs[0], group.inputs[0])
+    #switch.Output -> group.Height
+    node_group.links.new(switch.outputs[0], group.inputs[1])
+    #group_input.Segments -> group.Segments
+    node_group.links.new(group_input.outputs[3], group.inputs[2])
+    #group_input.Top Cap -> group.Top Cap
+    node_group.links.new(group_input.outputs[4], group.inputs[3])
+    #group_input.Bottom Cap -> group.Bottom Cap
+    node_group.links.new(group_input.outputs[5], group.inputs[4])
+    #group.Geometry -> remove_named_attribute.Geometry
+    node_group.links.new(group.outputs[0], remove_named_attribute.inputs[0])
+    #remove_named_attribute.Geometry -> group_output.Geometry
+    node_group.links.new(remove_named_attribute.outputs[0], group_output.inputs[0])
+
+    node_group["ecm_version"] = ECM_COLLECTION_GRAPH_VERSION
+    node_group["ecm_fingerprint"] = ecm_node_group_fingerprint(node_group)
+    return node_group
+
+
+class ECM_ExtrudeCollection(bpy.types.Operator):
+    """Extrude every curve of the active collection with a single modifier"""
+    bl_idname = "object.ecm_extrude_collection"
+    bl_label = "Extrude Collection (ECM)"
+    bl_description = ("Add one object whose modifier extrudes every curve object of the active collection "
+                      "in a single evaluation. The Z scale of each curve object scales its height, an ecm_height "
+                      "custom property replaces it")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    height: bpy.props.FloatProperty(name="Height", description="Extrusion distance in Z", default=1.0)
+    segments: bpy.props.IntProperty(name="Segments", description="Divisions along the extrusion", default=1, min=1, max=1000)
+    top_cap: bpy.props.BoolProperty(name="Top Cap", description="Close the top end", default=True)
+    bottom_cap: bpy.props.BoolProperty(name="Bottom Cap", description="Close the bottom end", default=True)
+    use_height_property: bpy.props.BoolProperty(
+        name="Height from Property",
+        description="Extrude curve objects with an ecm_height custom property by that height, through an "
+                    "ECM Height modifier that stores it as an attribute. Run again after changing the property",
+        default=True,
+    )
+
+    def execute(self, context):
+        collection = context.collection
+        curves = [obj for obj in collection.all_objects if obj.type == 'CURVE']
+        if not curves:
+            self.report({'ERROR'}, "The active collection has no curve objects")
+            return {'CANCELLED'}
+
+        if self.use_height_property:
+            for obj in curves:
+                if "ecm_height" in obj:
+                    ecm_set_object_height(obj, float(obj["ecm_height"]))
+
+        #the host has to live outside the collection it reads, or it would read itself
+        mesh = bpy.data.meshes.new(collection.name + " ECM")
+        host = bpy.data.objects.new(collection.name + " ECM", mesh)
+        context.scene.collection.objects.link(host)
+        mod = host.modifiers.new(name=ECM_MODIFIER_NAME, type="NODES")
+        mod.node_group = ecm_collection_node_group()
+        ecm_set_modifier_inputs(mod, {
+            "Collection": collection,
+            "Height": self.height,
+            "Segments": self.segments,
+            "Top Cap": self.top_cap,
+            "Bottom Cap": self.bottom_cap,
+        })
+
+        layer_collection = _ecm_layer_collection(context.view_layer.layer_collection, collection)
+        if layer_collection is not None and layer_collection != context.view_layer.layer_collection:
+            layer_collection.exclude = True
+
+        extruded = sum(1 for obj in curves if ecm_find_modifier(obj) is not None)
+        if extruded:
+            self.report({'WARNING'}, "%d curve object(s) already have an ECM modifier, remove it to extrude them here" % extruded)
+        else:
+            self.report({'INFO'}, "Extruding %d curve object(s) with one modifier on %s" % (len(curves), host.name))
+        return {'FINISHED'}
+
+
+# ------------------------------------------------------------------------
+# Profiling
+# ------------------------------------------------------------------------
+#stages of the graph in evaluation order: label, node whose output is timed, output index
+ECM_PROFILE_STAGES = (
+    ("Resample + Simplify", "Repeat Output", 0),
+    ("Fill Curve", "Fill Curve", 0),
+    ("Side Walls", "Switch.005", 0),
+    ("Caps + Join", "Join Geometry", 0),
+    ("Weld", "Switch.006", 0),
+)
+
+
+def _ecm_truncated_copy(node_group, node_name, output_index):
+    """Copy ``node_group`` with its output taken from another node, or None when the node is missing"""
+    node = node_group.nodes.get(node_name)
+    if node is None:
+        return None
+    copy = node_group.copy()
+    copy.name = node_group.name + " (profile)"
+    output = next(n for n in copy.nodes if n.bl_idname == 'NodeGroupOutput' and n.is_active_output)
+    for link in list(output.inputs[0].links):
+        copy.links.remove(link)
+    copy.links.new(copy.nodes[node_name].outputs[output_index], output.inputs[0])
+    return copy
+
+
+def _ecm_time_evaluation(depsgraph, objects, repeats):
+    """Median time of re-evaluating ``objects``, after one untimed warm-up run"""
+    times = []
+    for run in range(repeats + 1):
+        for obj in objects:
+            obj.update_tag()
+        start = time.perf_counter()
+        depsgraph.update()
+        if run:
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def ecm_profile(context, objects, repeats=5):
+    """Time the ECM graph stage by stage on ``objects``
+
+    The Python API doesn't expose the per-node timings of the node editor,
+    so every stage is timed by evaluating the graph with its output taken
+    from the stage's last node. Lazy evaluation then only runs what that
+    node depends on. A stage's cost is its cumulative time minus the one of
+    the stage before, which can't be measured on its own since it needs the
+    geometry of the stages before it. Differences below zero (timing noise,
+    or a stage whose switch skips work timed before) are reported as 0 ms
+    and flagged as clamped. Returns a JSON-ready dict with the stages
+    ranked by cost.
+    """
+    mods = [ecm_find_modifier(obj) for obj in objects]
+    originals = [mod.node_group for mod in mods]
+    depsgraph = context.evaluated_depsgraph_get()
+    stages = []
+    copies = {}
+    try:
+        for label, node_name, output_index in ECM_PROFILE_STAGES:
+            for node_group in set(originals):
+                copies[node_group] = _ecm_truncated_copy(node_group, node_name, output_index)
+            if all(copy is not None for copy in copies.values()):
+                for mod, node_group in zip(mods, originals):
+                    mod.node_group = copies[node_group]
+                stages.append([label, node_name, _ecm_time_evaluation(depsgraph, objects, repeats)])
+                for mod, node_group in zip(mods, originals):
+                    mod.node_group = node_group
+            for copy in copies.values():
+                if copy is not None:
+                    bpy.data.node_groups.remove(copy)
+            copies.clear()
+        stages.append(["Output", "Group Output", _ecm_time_evaluation(depsgraph, objects, repeats)])
+    finally:
+        for mod, node_group in zip(mods, originals):
+            mod.node_group = node_group
+        #copies of the stage that failed
+        for copy in copies.values():
+            if copy is not None:
+                bpy.data.node_groups.remove(copy)
+
+    total = stages[-1][2]
+    rows = []
+    previous = 0.0
+    for label, node_name, cumulative in stages:
+        difference = cumulative - previous
+        cost = max(difference, 0.0)
+        previous = max(previous, cumulative)
+        rows.append({
+            "stage": label,
+            "node": node_name,
+            "cumulative_ms": cumulative * 1000.0,
+            "ms": cost * 1000.0,
+            "difference_ms": difference * 1000.0,
+            "clamped": difference < 0.0,
+            "share": cost / total if total > 0.0 else 0.0,
+        })
+    return {
+        "blender": bpy.app.version_string,
+        "graph_version": ECM_GRAPH_VERSION,
+        "objects": [obj.name for obj in objects],
+        "repeats": repeats,
+        "total_ms": total * 1000.0,
+        "note": ("ms is the cumulative time of a stage minus the longest one before it, "
+                 "negative differences are clamped to 0 (see clamped and difference_ms)"),
+        "stages": sorted(rows, key=lambda row: row["ms"], reverse=True),
+    }
+
+
+class ECM_Profile(bpy.types.Operator):
+    """Time the stages of the ECM graph on the selected objects"""
+    bl_idname = "object.ecm_profile"
+    bl_label = "Profile ECM"
+    bl_description = ("Re-evaluate the ECM objects several times and rank the graph stages by cost. "
+                      "The report is stored as JSON in the ecm_profile.json text")
+    bl_options = {'REGISTER'}
+
+    target: bpy.props.EnumProperty(
+        name="Objects",
+        items=(
+            ('SELECTED', "Selected", "Selected objects with an ECM modifier"),
+            ('SCENE', "Scene", "Every object with an ECM modifier in the scene"),
+        ),
+        default='SELECTED',
+    )
+    repeats: bpy.props.IntProperty(name="Repeats", description="Timed evaluations per stage", default=5, min=1, max=1000)
+    filepath: bpy.props.StringProperty(
+        name="File Path",
+        description="Also write the JSON report to this file, e.g. when running in background mode",
+        subtype='FILE_PATH',
+    )
+
+    def execute(self, context):
+        candidates = context.scene.objects if self.target == 'SCENE' else context.selected_objects
+        objects = [obj for obj in candidates if ecm_find_modifier(obj) is not None]
+        if not objects:
+            self.report({'ERROR'}, "Please select an object with an ECM modifier")
+            return {'CANCELLED'}
+
+        report = ecm_profile(context, objects, self.repeats)
+        text = json.dumps(report, indent=2)
+        block = bpy.data.texts.get("ecm_profile.json") or bpy.data.texts.new("ecm_profile.json")
+        block.from_string(text)
+        if self.filepath:
+            with open(bpy.path.abspath(self.filepath), "w", encoding="utf-8") as f:
+                f.write(text)
+        if bpy.app.background:
+            print(text)
+
+        ranked = ", ".join("%s %.1f ms" % (row["stage"], row["ms"]) for row in report["stages"][:3])
+        clamped = sum(row["clamped"] for row in report["stages"])
+        if clamped:
+            ranked += " (%d stage(s) measured below the one before, clamped to 0 ms)" % clamped
+        self.report({'INFO'}, "ECM %.1f ms over %d object(s): %s" % (report["total_ms"], len(objects), ranked))
+        return {'FINISHED'}
+
+
 # ------------------------------------------------------------------------
 #  Add Modifier Menu Registration
 # ------------------------------------------------------------------------
@@ -432,6 +3701,14 @@ class OBJECT_MT_splinedynamics_menu(bpy.types.Menu):
     def draw(self, context):
         layout = self.layout
         layout.operator("object.ecm_extrudecurve", text="Extrude Curve (ECM)", icon="MOD_SOLIDIFY")
+        layout.operator("object.ecm_extrude_collection", icon="OUTLINER_COLLECTION")
+        layout.operator("object.ecm_upgrade_modifiers", icon="FILE_REFRESH")
+        layout.operator("object.ecm_cache_caps", text="Cache ECM Caps", icon="FILE_CACHE").action = 'BAKE'
+        layout.operator("object.ecm_cache_caps", text="Free ECM Cap Cache", icon="TRASH").action = 'FREE'
+        layout.operator("object.ecm_instance_shapes", icon="LINKED")
+        layout.operator("object.ecm_simplify_report", icon="INFO")
+        layout.operator("object.ecm_profile", icon="TIME")
+        layout.operator("object.ecm_bake_meshes", icon="MESH_DATA")
 
 
 def menu_func(self, context):
@@ -480,7 +3757,15 @@ def add_ecm_menu(self, context):
 # ------------------------------------------------------------------------
 
 classes = (
+    ECM_AddonPreferences,
     ECM_ExtrudeCurve,
+    ECM_UpgradeModifiers,
+    ECM_CacheCaps,
+    ECM_SimplifyReport,
+    ECM_InstanceShapes,
+    ECM_BakeMeshes,
+    ECM_ExtrudeCollection,
+    ECM_Profile,
     OBJECT_MT_splinedynamics_menu,
     NODE_OT_add_ecm_group,
     NODE_MT_ecm_nodes_menu,
@@ -492,9 +3777,23 @@ def register():
         bpy.utils.register_class(cls)
     bpy.types.NODE_MT_add.append(add_ecm_menu)
     bpy.types.OBJECT_MT_modifier_add.append(menu_func)
+    bpy.app.handlers.depsgraph_update_post.append(ecm_cap_cache_update)
+    bpy.app.handlers.depsgraph_update_post.append(ecm_node_group_update)
+    bpy.app.handlers.render_pre.append(ecm_render_cache_swap)
+    bpy.app.handlers.render_post.append(ecm_render_cache_restore)
+    bpy.app.handlers.render_complete.append(ecm_render_cache_restore)
+    bpy.app.handlers.render_cancel.append(ecm_render_cache_restore)
 
 
 def unregister():
+    bpy.app.handlers.render_cancel.remove(ecm_render_cache_restore)
+    bpy.app.handlers.render_complete.remove(ecm_render_cache_restore)
+    bpy.app.handlers.render_post.remove(ecm_render_cache_restore)
+    bpy.app.handlers.render_pre.remove(ecm_render_cache_swap)
+    bpy.app.handlers.depsgraph_update_post.remove(ecm_node_group_update)
+    bpy.app.handlers.depsgraph_update_post.remove(ecm_cap_cache_update)
+    if bpy.app.timers.is_registered(_ecm_rebake_stale_caches):
+        bpy.app.timers.unregister(_ecm_rebake_stale_caches)
     bpy.types.OBJECT_MT_modifier_add.remove(menu_func)
     bpy.types.NODE_MT_add.remove(add_ecm_menu)
     for cls in reversed(classes):
@@ -0,0 +1,143 @@
+"""On-disk cache of ECM results, keyed by the input curve and parameters.
+
+Every entry is a directory of plain .npy files, one per mesh array, so a
+hit is a handful of memory-mapped reads instead of a Geometry Nodes
+evaluation. The cache is bounded by a total size and evicts the least
+recently used entries first (access times are kept in the entries' mtime,
+so render farm nodes sharing one directory share the ordering). Entries are
+written to a temporary directory and renamed into place, which keeps
+concurrent writers from seeing each other's half written files. The last
+file written is a marker listing the arrays, entries without it (copied
+or synced half way, or left by an older version) count as misses.
+
+The module doesn't use bpy, the add-on computes the keys (see ecm_cache_key()).
+"""
+
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+
+#written last, lists the arrays of a complete entry
+COMPLETE_MARKER = "complete"
+
+
+def cache_key(*parts):
+    """Hash ``parts`` (strings, bytes or anything with a stable repr) into an entry name"""
+    digest = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = (part if isinstance(part, str) else repr(part)).encode()
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class GeometryCache:
+    """A directory of cached mesh arrays with a size cap and LRU eviction
+
+    ``stats`` counts hits, misses, stores and evictions of this instance.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return ``{name: read-only memory-mapped array}`` for ``key``, or None on a miss
+
+        Incomplete or unreadable entries are misses and are removed, so that
+        the next put() can store the key again.
+        """
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, COMPLETE_MARKER)) as f:
+                names = f.read().split()
+            arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode='r') for name in names}
+            os.utime(path)
+        except (OSError, ValueError):
+            #complete entries are never changed in place, one that can't be read stays broken
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return arrays
+
+    def put(self, key, arrays, evict=True):
+        """Store ``{name: array}`` under ``key``
+
+        With ``evict``, the cache is trimmed to its size cap right away,
+        callers storing many entries in a row can call evict() once instead.
+        """
+        path = self._path(key)
+        partial = os.path.join(self.directory, ".partial-%s" % uuid.uuid4().hex)
+        os.makedirs(partial)
+        try:
+            for name, values in arrays.items():
+                np.save(os.path.join(partial, name + ".npy"), np.ascontiguousarray(values))
+            with open(os.path.join(partial, COMPLETE_MARKER), "w") as f:
+                f.write("\n".join(arrays) + "\n")
+            os.replace(partial, path)
+        except OSError:
+            #another process stored the same key first
+            shutil.rmtree(partial, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        self.stats["stores"] += 1
+        if evict:
+            self.evict()
+
+    def entries(self):
+        """Return ``(last access, size in bytes, path)`` for every entry, oldest first"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except OSError:
+                continue
+        entries.sort()
+        return entries
+
+    def size(self):
+        return sum(size for _access, size, _path in self.entries())
+
+    def evict(self, max_bytes=None):
+        """Remove the least recently used entries until the cache fits ``max_bytes``"""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _access, size, _path in entries)
+        for _access, size, path in entries:
+            if total <= budget:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.stats["evictions"] += 1
+        #leftovers of writers that died mid-store
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.startswith(".partial-") and entry.stat().st_mtime < time.time() - 3600.0:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def clear(self):
+        self.evict(0)
+
+    def summary(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = 100.0 * self.stats["hits"] / lookups if lookups else 0.0
+        return "%d hits, %d misses (%.0f%% hit rate), %d stored, %d evicted" % (
+            self.stats["hits"], self.stats["misses"], rate, self.stats["stores"], self.stats["evictions"])
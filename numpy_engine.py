@@ -0,0 +1,562 @@
+"""NumPy reference implementation of the ECM extrusion.
+
+Builds the same solid as the ECM_ExtrudeCurve node group (side walls split
+into Segments, top and bottom caps, faces pointing out of the solid)
+straight from arrays, without evaluating Geometry Nodes. Used by batch and
+bake jobs, and as a reference to check the node group output against.
+
+The vertices, bounds, volume and orientation agree with the node group,
+and so do the faces, except on the caps of nested splines: those are
+triangulated here, while Fill Curve merges its triangles into a few n-gons
+(see _caps()). tests/test_numpy_engine.py checks exactly this against
+tools/regression_reference.json.
+"""
+
+import collections
+import hashlib
+
+import numpy as np
+from mathutils.geometry import tessellate_polygon
+
+
+ExtrusionArrays = collections.namedtuple(
+    "ExtrusionArrays",
+    ("positions", "edges", "face_offsets", "corner_verts", "corner_edges"),
+)
+ExtrusionArrays.__doc__ = """Mesh arrays in Blender's layout
+
+positions     (V, 3) float32 vertex positions
+edges         (E, 2) int32 vertex pairs
+face_offsets  (F + 1,) int32 first corner of every face, plus the total
+corner_verts  (C,) int32 vertex of every face corner
+corner_edges  (C,) int32 edge from every corner to the next one
+"""
+
+
+# ------------------------------------------------------------------------
+# Curve input
+# ------------------------------------------------------------------------
+def curve_arrays(curve):
+    """Return the evaluated points of a Curve datablock as arrays
+
+    Returns ``(positions, offsets, cyclic)``: the evaluated positions of all
+    splines one after the other, the first point of every spline followed by
+    the total, and the cyclic flag of every spline. Bezier splines are
+    evaluated with their resolution the same way Geometry Nodes does, with a
+    single point for segments between two vector handles.
+    """
+    chunks = []
+    counts = []
+    cyclic = []
+    for spline in curve.splines:
+        if spline.type == 'BEZIER':
+            points = _evaluate_bezier(spline)
+        elif spline.type == 'POLY':
+            co = np.empty(len(spline.points) * 4, dtype=np.float32)
+            spline.points.foreach_get("co", co)
+            points = co.reshape(-1, 4)[:, :3]
+        else:
+            raise ValueError("%s splines are not supported by the reference engine" % spline.type.title())
+        chunks.append(points)
+        counts.append(len(points))
+        cyclic.append(spline.use_cyclic_u)
+
+    positions = np.concatenate(chunks) if chunks else np.empty((0, 3), dtype=np.float32)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return positions.astype(np.float32, copy=False), offsets, np.array(cyclic, dtype=bool)
+
+
+def _evaluate_bezier(spline):
+    points = spline.bezier_points
+    count = len(points)
+    co = np.empty(count * 3, dtype=np.float32)
+    left = np.empty(count * 3, dtype=np.float32)
+    right = np.empty(count * 3, dtype=np.float32)
+    points.foreach_get("co", co)
+    points.foreach_get("handle_left", left)
+    points.foreach_get("handle_right", right)
+    co, left, right = co.reshape(-1, 3), left.reshape(-1, 3), right.reshape(-1, 3)
+    if count < 2:
+        return co
+
+    segment_count = count if spline.use_cyclic_u else count - 1
+    start = np.arange(segment_count)
+    end = (start + 1) % count
+    left_vector = np.array([p.handle_left_type == 'VECTOR' for p in points])
+    right_vector = np.array([p.handle_right_type == 'VECTOR' for p in points])
+    samples = np.where(right_vector[start] & left_vector[end], 1, max(spline.resolution_u, 1))
+
+    segment = np.repeat(start, samples)
+    first_sample = np.cumsum(samples) - samples
+    t = (np.arange(samples.sum()) - np.repeat(first_sample, samples)) / np.repeat(samples, samples)
+    t = t[:, None]
+    s = 1.0 - t
+    evaluated = (
+        s * s * s * co[segment]
+        + 3.0 * s * s * t * right[segment]
+        + 3.0 * s * t * t * left[end[segment]]
+        + t * t * t * co[end[segment]]
+    )
+    if not spline.use_cyclic_u:
+        evaluated = np.concatenate((evaluated, co[-1:]))
+    return evaluated
+
+
+# ------------------------------------------------------------------------
+# Extrusion
+# ------------------------------------------------------------------------
+def simplify(positions, offsets, cyclic, tolerance, passes=8):
+    """Drop points that barely change the outline, like the Simplify zone of the node group
+
+    Every pass removes the odd points of each spline that lie within
+    ``tolerance / passes`` of the segment between their neighbours, so the
+    result never strays further than ``tolerance`` from the input. Splines
+    keep at least three points and open splines keep their last point.
+    Returns ``(positions, offsets)``, the cyclic flags don't change.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    cyclic = np.asarray(cyclic, dtype=bool)
+    if tolerance <= 0.0:
+        return positions, offsets
+
+    limit = tolerance / passes
+    for _pass in range(passes):
+        sizes = np.diff(offsets)
+        spline = np.repeat(np.arange(len(sizes)), sizes)
+        start = offsets[:-1][spline]
+        size = sizes[spline]
+        local = np.arange(len(positions)) - start
+        previous = positions[start + (local - 1) % size]
+        direction = positions[start + (local + 1) % size] - previous
+        relative = positions - previous
+        length_squared = np.einsum("ij,ij->i", direction, direction)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(length_squared > 0.0, np.einsum("ij,ij->i", relative, direction) / length_squared, 0.0)
+        deviation = np.linalg.norm(relative - direction * np.clip(t, 0.0, 1.0)[:, None], axis=1)
+
+        remove = (local % 2 == 1) & (deviation <= limit) & (size > 4) & (cyclic[spline] | (local + 1 < size))
+        if not remove.any():
+            break
+        positions = positions[~remove]
+        offsets = np.zeros_like(offsets)
+        np.cumsum(sizes - np.bincount(spline[remove], minlength=len(sizes)), out=offsets[1:])
+    return positions, offsets
+
+
+def extrude(positions, offsets, cyclic, height=1.0, segments=1, top_cap=True, bottom_cap=True):
+    """Extrude splines given as arrays, like the ECM_ExtrudeCurve node group
+
+    ``positions``, ``offsets`` and ``cyclic`` are laid out as returned by
+    :func:`curve_arrays`. Like Fill Curve, splines are flattened onto the XY
+    plane and always closed; an open spline whose last point repeats its
+    first one loses the duplicate. Splines with fewer than three points are
+    skipped. Unlike Fill Curve, splines crossing each other are not split.
+
+    The side walls and caps share their vertices, which are laid out one
+    ring of all splines after the other, from the bottom up.
+    """
+    segments = max(int(segments), 1)
+    xy, offsets = _clean_splines(np.asarray(positions, dtype=np.float64)[:, :2], np.asarray(offsets), np.asarray(cyclic, dtype=bool))
+    point_count = len(xy)
+    spline_count = len(offsets) - 1
+    starts = offsets[:-1]
+    sizes = np.diff(offsets)
+    spline_of_point = np.repeat(np.arange(spline_count), sizes)
+
+    next_point = np.arange(1, point_count + 1)
+    next_point[offsets[1:] - 1] = starts
+
+    cross = xy[:, 0] * xy[next_point, 1] - xy[next_point, 0] * xy[:, 1]
+    area = 0.5 * np.add.reduceat(cross, starts) if spline_count else np.empty(0)
+    depth, nested = _nesting(xy, offsets)
+    #the solid lies inside outlines and outside holes
+    solid_on_left = (area > 0.0) == (depth % 2 == 0)
+
+    #vertices
+    rows = segments + 1
+    z = np.linspace(0.0, float(height), rows)
+    out_positions = np.empty((rows, point_count, 3), dtype=np.float32)
+    out_positions[:, :, :2] = xy
+    out_positions[:, :, 2] = z[:, None]
+    out_positions = out_positions.reshape(-1, 3)
+
+    #side walls, faces point to the right of the spline direction unless reversed
+    row = np.arange(segments)[:, None] * point_count
+    a = row + np.arange(point_count)
+    b = row + next_point
+    c = b + point_count
+    d = a + point_count
+    walls = np.stack((a, b, c, d), axis=-1)
+    reverse = ~solid_on_left[spline_of_point]
+    walls[:, reverse] = walls[:, reverse][:, :, ::-1]
+    walls = walls.reshape(-1, 4)
+
+    face_sizes = [np.full(len(walls), 4)]
+    corners = [walls.ravel()]
+
+    if top_cap or bottom_cap:
+        cap_sizes, cap_corners = _caps(xy, offsets, area, nested)
+        if bottom_cap:
+            #caps come out counter-clockwise, the bottom one has to face down
+            bottom = _reverse_faces(cap_sizes, cap_corners)
+            face_sizes.append(cap_sizes)
+            corners.append(bottom)
+        if top_cap:
+            face_sizes.append(cap_sizes)
+            corners.append(cap_corners + segments * point_count)
+
+    face_sizes = np.concatenate(face_sizes)
+    corner_verts = np.concatenate(corners).astype(np.int32)
+    face_offsets = np.zeros(len(face_sizes) + 1, dtype=np.int32)
+    np.cumsum(face_sizes, out=face_offsets[1:])
+
+    if height < 0.0:
+        corner_verts = _reverse_faces(face_sizes, corner_verts)
+
+    edges, corner_edges = _edges(face_offsets, corner_verts)
+    return ExtrusionArrays(out_positions, edges, face_offsets, corner_verts, corner_edges)
+
+
+def _clean_splines(xy, offsets, cyclic):
+    sizes = np.diff(offsets)
+    keep = np.ones(len(xy), dtype=bool)
+    last = offsets[1:] - 1
+    open_closed = (~cyclic) & (sizes > 1)
+    duplicate = open_closed & np.all(np.isclose(xy[offsets[:-1]], xy[last]), axis=1)
+    keep[last[duplicate]] = False
+    sizes = sizes - duplicate
+
+    valid = sizes >= 3
+    keep &= np.repeat(valid, np.diff(offsets))
+    new_offsets = np.zeros(int(valid.sum()) + 1, dtype=np.int64)
+    np.cumsum(sizes[valid], out=new_offsets[1:])
+    return xy[keep], new_offsets
+
+
+def _nesting(xy, offsets, chunk=1024):
+    """Count the splines containing each spline, and flag splines involved in nesting"""
+    spline_count = len(offsets) - 1
+    depth = np.zeros(spline_count, dtype=np.int64)
+    nested = np.zeros(spline_count, dtype=bool)
+    if spline_count < 2:
+        return depth, nested
+
+    starts = offsets[:-1]
+    lower = np.minimum.reduceat(xy, starts)
+    upper = np.maximum.reduceat(xy, starts)
+    for first in range(0, spline_count, chunk):
+        outer = slice(first, first + chunk)
+        #bounds of the outer spline enclosing the bounds of the inner one
+        candidates = np.all(lower[outer, None] <= lower[None], axis=2) & np.all(upper[outer, None] >= upper[None], axis=2)
+        outer_index, inner_index = np.nonzero(candidates)
+        outer_index += first
+        pairs = outer_index != inner_index
+        for o, i in zip(outer_index[pairs], inner_index[pairs]):
+            if _point_in_polygon(xy[offsets[i]], xy[offsets[o]:offsets[o + 1]]):
+                depth[i] += 1
+                nested[i] = nested[o] = True
+    return depth, nested
+
+
+def _point_in_polygon(point, polygon):
+    x, y = point
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+def _caps(xy, offsets, area, nested):
+    """Counter-clockwise cap faces indexing the bottom ring
+
+    Splines that neither contain nor sit inside another spline become a
+    single n-gon, like with Fill Curve. Nested splines are triangulated
+    together so holes stay open. Fill Curve merges such triangles into
+    n-gons, which isn't reproduced, so these caps cover the same area with
+    more faces than the node group's.
+    """
+    starts = offsets[:-1]
+    sizes = np.diff(offsets)
+    point_index = np.arange(len(xy))
+    spline_of_point = np.repeat(np.arange(len(sizes)), sizes)
+
+    simple = ~nested
+    local = point_index - starts[spline_of_point]
+    reversed_index = starts[spline_of_point] + sizes[spline_of_point] - 1 - local
+    ccw_order = np.where(area[spline_of_point] < 0.0, reversed_index, point_index)
+    ngon_corners = ccw_order[simple[spline_of_point]]
+    ngon_sizes = sizes[simple]
+
+    if not nested.any():
+        return ngon_sizes, ngon_corners
+
+    nested_splines = np.nonzero(nested)[0]
+    loops = [
+        np.column_stack((xy[offsets[s]:offsets[s + 1]], np.zeros(sizes[s]))).tolist()
+        for s in nested_splines
+    ]
+    loop_points = np.concatenate([point_index[offsets[s]:offsets[s + 1]] for s in nested_splines])
+    triangles = np.array(tessellate_polygon(loops), dtype=np.int64).reshape(-1, 3)
+    triangles = loop_points[triangles]
+    p0, p1, p2 = xy[triangles[:, 0]], xy[triangles[:, 1]], xy[triangles[:, 2]]
+    clockwise = ((p1[:, 0] - p0[:, 0]) * (p2[:, 1] - p0[:, 1]) - (p2[:, 0] - p0[:, 0]) * (p1[:, 1] - p0[:, 1])) < 0.0
+    triangles[clockwise] = triangles[clockwise][:, ::-1]
+
+    return (
+        np.concatenate((ngon_sizes, np.full(len(triangles), 3))),
+        np.concatenate((ngon_corners, triangles.ravel())),
+    )
+
+
+def _reverse_faces(face_sizes, corner_verts):
+    """Reverse the winding of every face, keeping its first corner"""
+    face_sizes = np.asarray(face_sizes)
+    face_starts = np.cumsum(face_sizes) - face_sizes
+    face_of_corner = np.repeat(np.arange(len(face_sizes)), face_sizes)
+    local = np.arange(len(corner_verts)) - face_starts[face_of_corner]
+    source = face_starts[face_of_corner] + (face_sizes[face_of_corner] - local) % face_sizes[face_of_corner]
+    return corner_verts[source]
+
+
+def _edges(face_offsets, corner_verts):
+    next_corner = np.arange(1, len(corner_verts) + 1)
+    next_corner[face_offsets[1:] - 1] = face_offsets[:-1]
+    pairs = np.sort(np.column_stack((corner_verts, corner_verts[next_corner])), axis=1)
+    edges, corner_edges = np.unique(pairs, axis=0, return_inverse=True)
+    return edges.astype(np.int32), corner_edges.reshape(-1).astype(np.int32)
+
+
+# ------------------------------------------------------------------------
+# Repeated shapes
+# ------------------------------------------------------------------------
+def spline_shapes(curve, tolerance=1e-4):
+    """Key the splines of a Curve datablock by their shape, up to translation and rotation about Z
+
+    Returns ``(keys, origins, angles)`` with one entry per spline. Splines
+    sharing a key have the same shape: mapping their control points with
+    ``Rz(-angle) @ (p - origin)`` gives the same canonical points to within
+    ``tolerance``, once they are put in the order of _canonical_order(), so
+    copies starting at another point of a cyclic spline or running the other
+    way round share the key as well. The key is None for splines that
+    contain or sit inside another spline, since Fill Curve only handles
+    those together, and for degenerate splines. Nesting is tested on the
+    control polygon.
+    """
+    spline_count = len(curve.splines)
+    keys = [None] * spline_count
+    origins = np.zeros((spline_count, 3))
+    angles = np.zeros(spline_count)
+    controls = [_control_points(spline) for spline in curve.splines]
+    if not controls:
+        return keys, origins, angles
+
+    sizes = [len(co) for co, _shape, _extra in controls]
+    offsets = np.zeros(spline_count + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    xy = np.concatenate([co[:, :2] for co, _shape, _extra in controls]).astype(np.float64)
+    _depth, nested = _nesting(xy, offsets)
+
+    for index, (spline, (co, shape, extra)) in enumerate(zip(curve.splines, controls)):
+        if nested[index] or len(co) < 2:
+            continue
+        origin = co.mean(axis=0)
+        order, flipped = _canonical_order(co - origin, spline.use_cyclic_u, tolerance)
+        offset = co[order] - origin
+        shape, extra = shape[order], extra[order]
+        if flipped and spline.type == 'BEZIER':
+            #running the other way round swaps the handles
+            shape, extra = shape[:, (0, 2, 1)], extra[:, ::-1]
+        far = np.nonzero(np.hypot(offset[:, 0], offset[:, 1]) > tolerance)[0]
+        if not len(far):
+            continue
+        #the first control point off the centroid in canonical order fixes the rotation
+        angle = np.arctan2(offset[far[0], 1], offset[far[0], 0])
+        c, s = np.cos(-angle), np.sin(-angle)
+        relative = shape - origin
+        canonical = np.stack((
+            c * relative[..., 0] - s * relative[..., 1],
+            s * relative[..., 0] + c * relative[..., 1],
+            relative[..., 2],
+        ), axis=-1)
+        header = repr((
+            spline.type, spline.use_cyclic_u, spline.resolution_u, spline.order_u,
+            spline.use_endpoint_u, spline.use_bezier_u, len(co),
+        )).encode()
+        digest = hashlib.sha1(header)
+        digest.update(np.round(canonical / tolerance).astype(np.int64).tobytes())
+        digest.update(np.ascontiguousarray(extra).tobytes())
+        keys[index] = digest.digest()
+        origins[index] = origin
+        angles[index] = angle
+    return keys, origins, angles
+
+
+def _canonical_order(offset, cyclic, tolerance):
+    """Order the points of a spline independently of its start point and direction
+
+    ``offset`` holds the control points relative to the spline's centroid.
+    Every point is described by its distance to the centroid, its height and
+    the step to the next point along and across the direction to the
+    centroid, rounded to ``tolerance``. That doesn't change when the spline
+    is moved or rotated about Z and, unlike distances alone, tells mirror
+    images apart. The order is the rotation of the point sequence, in either
+    direction, whose descriptions sort first. Open splines keep one of their
+    ends first. Returns ``(order, reversed)``.
+    """
+    count = len(offset)
+    best = None
+    for flipped in (False, True):
+        order = np.arange(count)[::-1] if flipped else np.arange(count)
+        points = offset[order]
+        step = np.roll(points, -1, axis=0) - points
+        features = np.round(np.column_stack((
+            np.hypot(points[:, 0], points[:, 1]),
+            points[:, 2],
+            points[:, 0] * step[:, 0] + points[:, 1] * step[:, 1],
+            points[:, 0] * step[:, 1] - points[:, 1] * step[:, 0],
+        )) / tolerance).astype(np.int64)
+        if cyclic:
+            smallest = features[np.lexsort(features.T[::-1])[0]]
+            starts = np.nonzero((features == smallest).all(axis=1))[0]
+        else:
+            starts = (0,)
+        start = starts[0]
+        for candidate in starts[1:]:
+            rotated = np.roll(features, -candidate, axis=0)
+            current = np.roll(features, -start, axis=0)
+            if _sorts_before(rotated, current):
+                start = candidate
+            elif not _sorts_before(current, rotated):
+                #the same sequence again, the outline is symmetric and every later start repeats an earlier one
+                break
+        features, order = np.roll(features, -start, axis=0), np.roll(order, -start)
+        if best is None or _sorts_before(features, best[0]):
+            best = (features, order, flipped)
+    return best[1], best[2]
+
+
+def _sorts_before(a, b):
+    """Whether the rows of ``a`` sort before the rows of ``b``"""
+    differ = np.nonzero(a != b)
+    if not len(differ[0]):
+        return False
+    row, column = differ[0][0], differ[1][0]
+    return a[row, column] < b[row, column]
+
+
+#handle types as numbers, so they can be reordered with the points
+ECM_HANDLE_TYPES = ('FREE', 'VECTOR', 'ALIGNED', 'AUTO')
+
+
+def _control_points(spline):
+    """Control point positions, every position defining the shape per point, and other per point data
+
+    Returns ``(co, shape, extra)`` shaped ``(N, 3)``, ``(N, K, 3)`` and
+    ``(N, J)``. For Bezier splines the shape holds the point and its left
+    and right handle and ``extra`` the handle types, otherwise the weights.
+    """
+    if spline.type == 'BEZIER':
+        points = spline.bezier_points
+        arrays = []
+        for attr in ("co", "handle_left", "handle_right"):
+            values = np.empty(len(points) * 3, dtype=np.float32)
+            points.foreach_get(attr, values)
+            arrays.append(values.reshape(-1, 3).astype(np.float64))
+        handle_types = np.array([
+            (ECM_HANDLE_TYPES.index(p.handle_left_type), ECM_HANDLE_TYPES.index(p.handle_right_type))
+            for p in points
+        ], dtype=np.int64).reshape(-1, 2)
+        return arrays[0], np.stack(arrays, axis=1), handle_types
+
+    points = spline.points
+    co = np.empty(len(points) * 4, dtype=np.float32)
+    points.foreach_get("co", co)
+    co = co.reshape(-1, 4).astype(np.float64)
+    return co[:, :3], co[:, None, :3], np.round(co[:, 3:], 6)
+
+
+# ------------------------------------------------------------------------
+# Mesh input and output
+# ------------------------------------------------------------------------
+def read_mesh(mesh):
+    """Read the geometry of ``mesh`` into :class:`ExtrusionArrays` through bulk foreach_get calls"""
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    face_offsets = np.empty(len(mesh.polygons) + 1, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", face_offsets[:-1])
+    face_offsets[-1] = len(mesh.loops)
+    corner_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", corner_verts)
+    corner_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", corner_edges)
+    return ExtrusionArrays(positions.reshape(-1, 3), edges.reshape(-1, 2), face_offsets, corner_verts, corner_edges)
+
+
+def join_arrays(parts, matrices=None):
+    """Join several :class:`ExtrusionArrays` into one
+
+    With ``matrices``, the positions of every part are transformed by its
+    4x4 matrix first, and parts with a mirroring matrix get their faces
+    reversed so normals keep pointing out. Returns ``(arrays, face_part)``,
+    where ``face_part`` holds the index of the part every face came from.
+    """
+    positions, edges, face_offsets, corner_verts, corner_edges, face_part = [], [], [], [], [], []
+    vertex_start = edge_start = corner_start = 0
+    for index, part in enumerate(parts):
+        part_positions = part.positions
+        part_corner_verts, part_edges, part_corner_edges = part.corner_verts, part.edges, part.corner_edges
+        if matrices is not None:
+            matrix = np.asarray(matrices[index], dtype=np.float64)
+            part_positions = (part_positions @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+            if np.linalg.det(matrix[:3, :3]) < 0.0:
+                part_corner_verts = _reverse_faces(np.diff(part.face_offsets), part.corner_verts)
+                part_edges, part_corner_edges = _edges(part.face_offsets, part_corner_verts)
+        positions.append(part_positions)
+        edges.append(part_edges + vertex_start)
+        face_offsets.append(part.face_offsets[:-1] + corner_start)
+        corner_verts.append(part_corner_verts + vertex_start)
+        corner_edges.append(part_corner_edges + edge_start)
+        face_part.append(np.full(len(part.face_offsets) - 1, index, dtype=np.int32))
+        vertex_start += len(part_positions)
+        edge_start += len(part_edges)
+        corner_start += len(part_corner_verts)
+    face_offsets.append(np.array([corner_start]))
+
+    arrays = ExtrusionArrays(
+        np.concatenate(positions) if positions else np.empty((0, 3), dtype=np.float32),
+        np.concatenate(edges).astype(np.int32) if edges else np.empty((0, 2), dtype=np.int32),
+        np.concatenate(face_offsets).astype(np.int32),
+        np.concatenate(corner_verts).astype(np.int32) if corner_verts else np.empty(0, dtype=np.int32),
+        np.concatenate(corner_edges).astype(np.int32) if corner_edges else np.empty(0, dtype=np.int32),
+    )
+    return arrays, np.concatenate(face_part) if face_part else np.empty(0, dtype=np.int32)
+
+
+def write_mesh(mesh, arrays):
+    """Replace the geometry of ``mesh`` with ``arrays`` through bulk foreach_set calls"""
+    mesh.clear_geometry()
+    mesh.vertices.add(len(arrays.positions))
+    mesh.vertices.foreach_set("co", arrays.positions.ravel())
+    mesh.edges.add(len(arrays.edges))
+    mesh.edges.foreach_set("vertices", arrays.edges.ravel())
+    mesh.loops.add(len(arrays.corner_verts))
+    mesh.loops.foreach_set("vertex_index", arrays.corner_verts)
+    mesh.loops.foreach_set("edge_index", arrays.corner_edges)
+    mesh.polygons.add(len(arrays.face_offsets) - 1)
+    mesh.polygons.foreach_set("loop_start", arrays.face_offsets[:-1])
+    mesh.update()
+    return mesh
+
+
+def extrude_curve_to_mesh(curve, mesh, height=1.0, segments=1, top_cap=True, bottom_cap=True, tolerance=0.0):
+    """Extrude a Curve datablock into ``mesh`` without evaluating Geometry Nodes"""
+    positions, offsets, cyclic = curve_arrays(curve)
+    positions, offsets = simplify(positions, offsets, cyclic, tolerance)
+    arrays = extrude(positions, offsets, cyclic, height, segments, top_cap, bottom_cap)
+    return write_mesh(mesh, arrays)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+#the modules are imported as plain modules, without the add-on package and bpy registration
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
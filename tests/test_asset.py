@@ -0,0 +1,30 @@
+"""Check that the bundled node group asset matches ecm_build_node_group(), run with ``python -m pytest tests``
+
+Needs Blender (``$BLENDER`` or ``blender`` on the PATH) or the bpy module, skipped otherwise.
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def blender_command():
+    blender = os.environ.get("BLENDER") or shutil.which("blender")
+    if blender:
+        return [blender, "--background", "--factory-startup", "--python"]
+    if importlib.util.find_spec("bpy") is not None:
+        return [sys.executable]
+    pytest.skip("needs Blender or the bpy module")
+
+
+def test_asset_matches_builder():
+    script = os.path.join(ROOT, "tools", "build_asset.py")
+    result = subprocess.run(blender_command() + [script, "--", "--check"], capture_output=True, text=True, timeout=600)
+    #the bpy module can crash on exit, so go by the printed verdict rather than the exit code
+    assert "is up to date" in result.stdout, result.stdout + result.stderr
@@ -0,0 +1,32 @@
+"""Unit tests of the input and output naming of tools/batch_extrude.py, run with ``python -m pytest tests``"""
+
+import os
+
+from tools.batch_extrude import input_files, output_paths
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_recursive_inputs_mirror_their_directories(tmp_path):
+    for name in ("a/plan.svg", "b/plan.svg", "top.dxf", "notes.txt"):
+        touch(str(tmp_path / "in" / name))
+    files = list(input_files([str(tmp_path / "in")], recursive=True))
+    assert [relative for _path, relative in files] == ["top.dxf", os.path.join("a", "plan.svg"), os.path.join("b", "plan.svg")]
+
+    jobs, clashes = output_paths(files, str(tmp_path / "out"), "obj")
+    assert clashes == []
+    assert [output for _path, output in jobs] == [
+        str(tmp_path / "out" / "top.obj"), str(tmp_path / "out" / "a" / "plan.obj"), str(tmp_path / "out" / "b" / "plan.obj")]
+
+
+def test_inputs_with_the_same_output_fail(tmp_path):
+    for name in ("plan.dxf", "plan.svg"):
+        touch(str(tmp_path / "in" / name))
+    files = list(input_files([str(tmp_path / "in"), str(tmp_path / "in" / "plan.svg")], recursive=False))
+    jobs, clashes = output_paths(files, str(tmp_path / "out"), "baked")
+    assert jobs == [(str(tmp_path / "in" / "plan.dxf"), str(tmp_path / "out" / "plan.blend"))]
+    assert [(os.path.basename(path), earlier) for path, _output, earlier in clashes] == [
+        ("plan.svg", str(tmp_path / "in" / "plan.dxf")), ("plan.svg", str(tmp_path / "in" / "plan.dxf"))]
@@ -0,0 +1,157 @@
+"""Unit tests of the on-disk geometry cache, run with ``python -m pytest tests``"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from geometry_cache import COMPLETE_MARKER, GeometryCache, cache_key
+
+
+def arrays(size=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "positions": rng.random((size, 3), dtype=np.float32),
+        "corner_verts": rng.integers(0, size, size * 4, dtype=np.int32),
+    }
+
+
+def age(cache, key, seconds):
+    """Pretend ``key`` was last used ``seconds`` ago"""
+    stamp = time.time() - seconds
+    os.utime(os.path.join(cache.directory, key), (stamp, stamp))
+
+
+# ------------------------------------------------------------------------
+# Keys
+# ------------------------------------------------------------------------
+def test_cache_key_is_stable():
+    assert cache_key("curve", b"\x00\x01", (1.0, 2)) == cache_key("curve", b"\x00\x01", (1.0, 2))
+    assert len(cache_key("curve")) == 40
+
+
+def test_cache_key_tells_parts_apart():
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+    assert cache_key("a", "b") != cache_key("b", "a")
+    assert cache_key(1) != cache_key(1.0)
+
+
+# ------------------------------------------------------------------------
+# Get and put
+# ------------------------------------------------------------------------
+def test_get_returns_what_put_stored(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    stored = arrays()
+    cache.put("entry", stored)
+    loaded = cache.get("entry")
+    assert set(loaded) == set(stored)
+    for name, values in stored.items():
+        assert loaded[name].dtype == values.dtype
+        assert np.array_equal(loaded[name], values)
+        assert not loaded[name].flags.writeable
+    assert cache.stats == {"hits": 1, "misses": 0, "stores": 1, "evictions": 0}
+
+
+def test_missing_key_is_a_miss(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    assert cache.get("missing") is None
+    assert cache.stats["misses"] == 1
+
+
+def test_incomplete_entry_is_a_miss_and_can_be_stored_again(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("entry", arrays())
+    os.remove(os.path.join(str(tmp_path), "entry", COMPLETE_MARKER))
+    assert cache.get("entry") is None
+    assert not os.path.exists(os.path.join(str(tmp_path), "entry"))
+    cache.put("entry", arrays(seed=1))
+    assert np.array_equal(cache.get("entry")["positions"], arrays(seed=1)["positions"])
+
+
+def test_entry_missing_an_array_is_a_miss(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("entry", arrays())
+    os.remove(os.path.join(str(tmp_path), "entry", "positions.npy"))
+    assert cache.get("entry") is None
+
+
+def test_second_put_of_a_key_keeps_the_first(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("entry", arrays(seed=0))
+    cache.put("entry", arrays(seed=1))
+    assert np.array_equal(cache.get("entry")["positions"], arrays(seed=0)["positions"])
+    assert not [name for name in os.listdir(str(tmp_path)) if name.startswith(".partial-")]
+
+
+def test_get_marks_the_entry_as_used(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("entry", arrays())
+    age(cache, "entry", 600.0)
+    before = os.path.getmtime(os.path.join(str(tmp_path), "entry"))
+    cache.get("entry")
+    assert os.path.getmtime(os.path.join(str(tmp_path), "entry")) > before
+
+
+# ------------------------------------------------------------------------
+# Eviction
+# ------------------------------------------------------------------------
+def test_evict_removes_least_recently_used_first(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    for i, key in enumerate("abcd"):
+        cache.put(key, arrays(seed=i), evict=False)
+        age(cache, key, 100.0 - i)
+    #using "a" makes "b" the oldest
+    cache.get("a")
+    entry_size = cache.size() // 4
+    cache.evict(entry_size * 2)
+    assert sorted(os.listdir(str(tmp_path))) == ["a", "d"]
+    assert cache.stats["evictions"] == 2
+
+
+def test_put_trims_to_the_size_cap(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("a", arrays(seed=0))
+    entry_size = cache.size()
+    age(cache, "a", 100.0)
+    cache.max_bytes = entry_size
+    cache.put("b", arrays(seed=1))
+    assert os.listdir(str(tmp_path)) == ["b"]
+    assert cache.size() <= cache.max_bytes
+
+
+def test_entries_are_oldest_first(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    for i, key in enumerate("abc"):
+        cache.put(key, arrays(seed=i), evict=False)
+        age(cache, key, 10.0 * i)
+    assert [os.path.basename(path) for _access, _size, path in cache.entries()] == ["c", "b", "a"]
+
+
+def test_evict_removes_stale_partial_entries_only(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    stale = os.path.join(str(tmp_path), ".partial-stale")
+    fresh = os.path.join(str(tmp_path), ".partial-fresh")
+    os.makedirs(stale)
+    os.makedirs(fresh)
+    stamp = time.time() - 7200.0
+    os.utime(stale, (stamp, stamp))
+    cache.evict()
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+
+
+def test_clear_empties_the_cache(tmp_path):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.put("a", arrays())
+    cache.put("b", arrays(seed=1))
+    cache.clear()
+    assert cache.entries() == []
+    assert cache.get("a") is None
+
+
+@pytest.mark.parametrize("hits, misses, expected", ((0, 0, "0%"), (3, 1, "75%")))
+def test_summary_reports_the_hit_rate(tmp_path, hits, misses, expected):
+    cache = GeometryCache(str(tmp_path), 1 << 20)
+    cache.stats.update(hits=hits, misses=misses)
+    assert "(%s hit rate)" % expected in cache.summary()
@@ -0,0 +1,289 @@
+"""Unit tests of the NumPy reference engine, run with ``python -m pytest tests``"""
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+#mathutils comes with Blender, or with the bpy module outside of it
+pytest.importorskip("bpy")
+import bpy  # noqa: E402
+import numpy_engine  # noqa: E402
+
+
+def outline(cx, cy, radius, points, clockwise=False, z=0.0):
+    angles = 2.0 * np.pi * np.arange(points) / points * (-1.0 if clockwise else 1.0)
+    return np.column_stack((cx + radius * np.cos(angles), cy + radius * np.sin(angles), np.full(points, z)))
+
+
+def splines(*outlines, cyclic=True):
+    positions = np.concatenate(outlines)
+    offsets = np.zeros(len(outlines) + 1, dtype=np.int64)
+    np.cumsum([len(o) for o in outlines], out=offsets[1:])
+    return positions, offsets, np.full(len(outlines), cyclic)
+
+
+def faces(arrays):
+    offsets = arrays.face_offsets
+    return [arrays.corner_verts[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def signed_volume(arrays):
+    """Positive for a closed solid whose faces point out"""
+    co = arrays.positions.astype(np.float64)
+    volume = 0.0
+    for face in faces(arrays):
+        for i in range(1, len(face) - 1):
+            volume += np.dot(co[face[0]], np.cross(co[face[i]], co[face[i + 1]])) / 6.0
+    return volume
+
+
+def is_closed(arrays):
+    """Every edge is used by exactly two faces, in opposite directions"""
+    directed = {}
+    for face in faces(arrays):
+        for a, b in zip(face, np.roll(face, -1)):
+            directed[(a, b)] = directed.get((a, b), 0) + 1
+    return all(count == 1 and directed.get((b, a)) == 1 for (a, b), count in directed.items())
+
+
+def polygon_area(xy):
+    return 0.5 * float(np.sum(xy[:, 0] * np.roll(xy[:, 1], -1) - np.roll(xy[:, 0], -1) * xy[:, 1]))
+
+
+# ------------------------------------------------------------------------
+# Simplify
+# ------------------------------------------------------------------------
+def densified_square(steps, noise=0.0, seed=0):
+    corners = np.array(((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)))
+    points = []
+    for a, b in zip(corners, np.roll(corners, -1, axis=0)):
+        t = np.arange(steps)[:, None] / steps
+        points.append(a + (b - a) * t)
+    xy = np.concatenate(points)
+    xy += np.random.default_rng(seed).uniform(-noise, noise, xy.shape)
+    return np.column_stack((xy, np.zeros(len(xy))))
+
+
+def distance_to_square(xy):
+    inside = np.clip(xy, 0.0, 1.0)
+    return np.minimum.reduce((np.abs(inside[:, 0]), np.abs(inside[:, 0] - 1.0), np.abs(inside[:, 1]), np.abs(inside[:, 1] - 1.0))) + np.linalg.norm(xy - inside, axis=1)
+
+
+def test_simplify_zero_tolerance_keeps_points():
+    positions, offsets, cyclic = splines(densified_square(8))
+    result, result_offsets = numpy_engine.simplify(positions, offsets, cyclic, 0.0)
+    assert np.array_equal(result, positions)
+    assert np.array_equal(result_offsets, offsets)
+
+
+def test_simplify_drops_collinear_points_and_keeps_corners():
+    positions, offsets, cyclic = splines(densified_square(16))
+    result, result_offsets = numpy_engine.simplify(positions, offsets, cyclic, 1e-3)
+    assert len(result) < len(positions)
+    assert result_offsets[-1] == len(result)
+    for corner in ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)):
+        assert np.any(np.all(np.isclose(result[:, :2], corner), axis=1))
+
+
+@pytest.mark.parametrize("tolerance", (1e-3, 1e-2, 5e-2))
+def test_simplify_stays_within_tolerance(tolerance):
+    noise = 1e-3
+    positions, offsets, cyclic = splines(densified_square(32, noise=noise))
+    result, _offsets = numpy_engine.simplify(positions, offsets, cyclic, tolerance)
+    #every kept point is an input point, so it can't stray further than the noise, and
+    #every dropped point lies within the tolerance of the simplified outline
+    assert np.all(distance_to_square(result[:, :2]) <= noise)
+    kept = {tuple(p) for p in result}
+    dropped = np.array([p for p in positions if tuple(p) not in kept])
+    closed = np.concatenate((result[:, :2], result[:1, :2]))
+    a, b = closed[:-1], closed[1:]
+    for point in dropped[:, :2]:
+        t = np.clip(np.einsum("ij,ij->i", point - a, b - a) / np.einsum("ij,ij->i", b - a, b - a), 0.0, 1.0)
+        assert np.min(np.linalg.norm(a + (b - a) * t[:, None] - point, axis=1)) <= tolerance + 1e-9
+
+
+def test_simplify_keeps_small_and_open_ends():
+    open_line = np.column_stack((np.linspace(0.0, 1.0, 9), np.zeros(9), np.zeros(9)))
+    triangle = outline(5.0, 0.0, 1.0, 3)
+    positions, offsets, _cyclic = splines(open_line, triangle)
+    result, result_offsets = numpy_engine.simplify(positions, offsets, np.array((False, True)), 0.1)
+    assert np.allclose(result[result_offsets[1] - 1], open_line[-1])
+    assert np.allclose(result[result_offsets[0]], open_line[0])
+    assert result_offsets[2] - result_offsets[1] == 3
+
+
+# ------------------------------------------------------------------------
+# Holes and orientation
+# ------------------------------------------------------------------------
+def test_nesting_detects_holes():
+    positions, offsets, _cyclic = splines(outline(0.0, 0.0, 2.0, 16), outline(0.0, 0.0, 1.0, 16), outline(5.0, 0.0, 1.0, 8))
+    depth, nested = numpy_engine._nesting(positions[:, :2], offsets)
+    assert depth.tolist() == [0, 1, 0]
+    assert nested.tolist() == [True, True, False]
+
+
+def test_nesting_ignores_overlapping_bounds():
+    #an L shape whose bounds contain the square, which lies outside of it
+    l_shape = np.array(((0.0, 0.0, 0.0), (3.0, 0.0, 0.0), (3.0, 1.0, 0.0), (1.0, 1.0, 0.0), (1.0, 3.0, 0.0), (0.0, 3.0, 0.0)))
+    square = outline(2.25, 2.25, 0.5, 4)
+    positions, offsets, _cyclic = splines(l_shape, square)
+    depth, nested = numpy_engine._nesting(positions[:, :2], offsets)
+    assert depth.tolist() == [0, 0]
+    assert not nested.any()
+
+
+@pytest.mark.parametrize("clockwise", (False, True))
+@pytest.mark.parametrize("height", (1.0, -1.0))
+@pytest.mark.parametrize("segments", (1, 3))
+def test_extrude_faces_point_out(clockwise, height, segments):
+    positions, offsets, cyclic = splines(outline(0.0, 0.0, 1.0, 4, clockwise=clockwise))
+    arrays = numpy_engine.extrude(positions, offsets, cyclic, height=height, segments=segments)
+    assert is_closed(arrays)
+    assert signed_volume(arrays) == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("outer_clockwise, inner_clockwise", ((False, True), (False, False), (True, True)))
+def test_extrude_hole_walls_face_into_the_hole(outer_clockwise, inner_clockwise):
+    outer = outline(0.0, 0.0, 2.0, 4, clockwise=outer_clockwise)
+    inner = outline(0.0, 0.0, 1.0, 4, clockwise=inner_clockwise)
+    positions, offsets, cyclic = splines(outer, inner)
+    arrays = numpy_engine.extrude(positions, offsets, cyclic, height=1.0)
+    assert is_closed(arrays)
+    assert signed_volume(arrays) == pytest.approx(polygon_area(outer[:, :2]) * (-1.0 if outer_clockwise else 1.0) - 2.0)
+
+
+def test_extrude_without_caps_keeps_wall_orientation():
+    positions, offsets, cyclic = splines(outline(0.0, 0.0, 1.0, 4, clockwise=True))
+    capped = numpy_engine.extrude(positions, offsets, cyclic)
+    walls = numpy_engine.extrude(positions, offsets, cyclic, top_cap=False, bottom_cap=False)
+    assert len(walls.face_offsets) - 1 == 4
+    assert np.array_equal(walls.corner_verts, capped.corner_verts[:len(walls.corner_verts)])
+
+
+# ------------------------------------------------------------------------
+# Caps
+# ------------------------------------------------------------------------
+def test_caps_of_simple_splines_are_ngons():
+    positions, offsets, _cyclic = splines(outline(0.0, 0.0, 1.0, 6), outline(3.0, 0.0, 1.0, 5, clockwise=True))
+    xy = positions[:, :2]
+    area = np.array([polygon_area(xy[offsets[i]:offsets[i + 1]]) for i in range(2)])
+    sizes, corners = numpy_engine._caps(xy, offsets, area, np.zeros(2, dtype=bool))
+    assert sizes.tolist() == [6, 5]
+    assert polygon_area(xy[corners[:6]]) > 0.0
+    assert polygon_area(xy[corners[6:]]) > 0.0
+
+
+def test_caps_with_hole_are_triangulated_around_it():
+    outer, inner = outline(0.0, 0.0, 2.0, 8), outline(0.0, 0.0, 1.0, 8, clockwise=True)
+    positions, offsets, _cyclic = splines(outer, inner)
+    xy = positions[:, :2]
+    area = np.array([polygon_area(xy[offsets[i]:offsets[i + 1]]) for i in range(2)])
+    sizes, corners = numpy_engine._caps(xy, offsets, area, np.ones(2, dtype=bool))
+    assert np.all(sizes == 3)
+    triangles = xy[corners.reshape(-1, 3)]
+    areas = [polygon_area(t) for t in triangles]
+    #counter-clockwise, covering the ring and nothing of the hole
+    assert min(areas) > 0.0
+    assert sum(areas) == pytest.approx(polygon_area(outer[:, :2]) - polygon_area(inner[::-1, :2]))
+    centers = triangles.mean(axis=1)
+    assert np.all(np.linalg.norm(centers, axis=1) > math.cos(math.pi / 8.0) - 1e-9)
+
+
+def test_reverse_faces_keeps_first_corner():
+    reversed_corners = numpy_engine._reverse_faces([3, 4], np.array([0, 1, 2, 3, 4, 5, 6]))
+    assert reversed_corners.tolist() == [0, 2, 1, 3, 6, 5, 4]
+
+
+# ------------------------------------------------------------------------
+# Repeated shapes
+# ------------------------------------------------------------------------
+def poly_curve(*point_lists, cyclic=True):
+    curve = bpy.data.curves.new("ECM_Test", type='CURVE')
+    curve.dimensions = '3D'
+    for points in point_lists:
+        spline = curve.splines.new('POLY')
+        spline.points.add(len(points) - 1)
+        for point, co in zip(spline.points, points):
+            point.co = tuple(co) + (1.0,)
+        spline.use_cyclic_u = cyclic
+    return curve
+
+
+def moved(points, offset, angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return [(c * x - s * y + offset, s * x + c * y, z) for x, y, z in points]
+
+
+#mirror symmetric, so point distances alone can't tell the directions apart
+HOUSE = [(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 1.0, 0.0), (1.0, 1.5, 0.0), (0.0, 1.0, 0.0)]
+
+
+def test_spline_shapes_ignore_start_point_and_direction():
+    copies = [
+        HOUSE,
+        moved(HOUSE[2:] + HOUSE[:2], 10.0, 0.7),
+        moved(HOUSE[::-1], 20.0, 1.3),
+        moved(HOUSE[::-1][3:] + HOUSE[::-1][:3], 30.0, 2.0),
+    ]
+    curve = poly_curve(*copies)
+    try:
+        keys, origins, angles = numpy_engine.spline_shapes(curve)
+    finally:
+        bpy.data.curves.remove(curve)
+    assert keys[0] is not None
+    assert len(set(keys)) == 1
+    #origin and angle map every copy onto the same points
+    canonical = [
+        sorted((np.round(moved(np.asarray(points) - origin, 0.0, -angle), 4) + 0.0).tolist())
+        for points, origin, angle in zip(copies, origins, angles)
+    ]
+    assert all(points == canonical[0] for points in canonical)
+
+
+def test_spline_shapes_tell_different_shapes_apart():
+    mirrored = [(x, -y, z) for x, y, z in HOUSE]
+    stretched = [(2.0 * x, y, z) for x, y, z in HOUSE]
+    curve = poly_curve(HOUSE, moved(mirrored, 10.0, 0.0), moved(stretched, 20.0, 0.0))
+    try:
+        keys, _origins, _angles = numpy_engine.spline_shapes(curve)
+    finally:
+        bpy.data.curves.remove(curve)
+    #the house is its own mirror image up to rotation, the stretched one is not
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+
+
+# ------------------------------------------------------------------------
+# Node group references
+# ------------------------------------------------------------------------
+#shapes whose caps Fill Curve leaves as one n-gon per spline, nested splines get n-gons the engine doesn't reproduce
+NGON_CAP_SHAPES = ("square", "circle", "open", "multiple")
+
+
+@pytest.mark.parametrize("shape", ["square", "circle", "open", "multiple", "hole"])
+def test_extrude_matches_node_group_references(shape):
+    """The engine builds the solid of tools/regression_reference.json, face for face where the caps are n-gons"""
+    from tools import regression
+
+    with open(regression.REFERENCE_PATH) as f:
+        references = json.load(f)["cases"]
+    for name, params in regression.cases():
+        if params["shape"] != shape or params["instanced"]:
+            continue
+        obj = regression.make_shape(shape)
+        curve = obj.data
+        mesh = bpy.data.meshes.new(name)
+        try:
+            numpy_engine.extrude_curve_to_mesh(curve, mesh, params["height"], params["segments"],
+                                               params["top_cap"], params["bottom_cap"])
+            result = regression.measure(mesh)
+        finally:
+            bpy.data.objects.remove(obj)
+            bpy.data.curves.remove(curve)
+            bpy.data.meshes.remove(mesh)
+        reference = references[name]
+        if shape not in NGON_CAP_SHAPES and (params["top_cap"] or params["bottom_cap"]):
+            reference = dict(reference, faces=result["faces"])
+        assert regression.compare(result, reference) == [], name
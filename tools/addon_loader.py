@@ -0,0 +1,27 @@
+"""Load the add-on from this checkout inside a background Blender session."""
+
+import importlib.util
+import os
+import sys
+
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_MODULE = "ecm_extrudecurve"
+
+
+def load_addon(register=True):
+    """Import the add-on package from the checkout, registering it once"""
+    module = sys.modules.get(ADDON_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            ADDON_MODULE,
+            os.path.join(ADDON_DIR, "__init__.py"),
+            submodule_search_locations=[ADDON_DIR],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[ADDON_MODULE] = module
+        spec.loader.exec_module(module)
+    if register and not getattr(module, "_ecm_tools_registered", False):
+        module.register()
+        module._ecm_tools_registered = True
+    return module
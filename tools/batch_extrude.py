@@ -0,0 +1,445 @@
+"""Extrude many curve files with a pool of background Blender processes.
+
+Run with a plain Python 3, Blender is started by the script:
+
+    python3 tools/batch_extrude.py --output-dir out/ --height 3 --segments 4 incoming/*.svg
+
+Every input (.blend, .svg or .dxf) gets ECM on all of its curve objects and
+is written to the output directory as a .blend with live modifiers, a baked
+.blend, .obj or .glb (see --format). Inputs found in a directory keep their
+path relative to it, so ``a/plan.svg`` becomes ``out/a/plan.blend``; an
+input whose output another input of the run already writes (``plan.svg``
+next to ``plan.dxf``) fails instead. Files are handed out one at a time to
+``--jobs`` long running Blender workers, so a file that fails or crashes its
+worker only costs that file: a crashed worker is restarted for the rest.
+A throughput summary per worker is printed at the end and, with --report,
+written as JSON.
+
+The same file is the worker script, Blender runs it with ``-- --worker``.
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+
+INPUT_EXTENSIONS = (".blend", ".svg", ".dxf")
+OUTPUT_EXTENSIONS = {"blend": ".blend", "baked": ".blend", "obj": ".obj", "glb": ".glb"}
+PROTOCOL_PREFIX = "ECM_BATCH "
+
+
+# ------------------------------------------------------------------------
+# Worker (inside Blender)
+# ------------------------------------------------------------------------
+def clear_scene():
+    """Remove everything the previous file imported"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+
+def import_curves(path):
+    """Load ``path`` and return its curve objects"""
+    import addon_utils
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".blend":
+        bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+        return [obj for obj in bpy.context.scene.objects if obj.type == 'CURVE']
+
+    clear_scene()
+    before = set(bpy.data.objects)
+    if ext == ".svg":
+        addon_utils.enable("io_curve_svg", default_set=False)
+        bpy.ops.import_curve.svg(filepath=path)
+    else:
+        addon_utils.enable("io_import_dxf", default_set=False)
+        if not hasattr(bpy.ops.import_scene, "dxf"):
+            raise RuntimeError("DXF import needs the Import AutoCAD DXF add-on, run with --user-prefs")
+        bpy.ops.import_scene.dxf(filepath=path)
+    return [obj for obj in bpy.data.objects if obj not in before and obj.type == 'CURVE']
+
+
+def apply_ecm(addon, curves, options):
+    """Add the ECM modifier to every curve without one in one operator call
+
+    Curves that already have ECM keep their modifier and its settings.
+    Returns the curves that got the modifier.
+    """
+    curves = [obj for obj in curves if addon.ecm_find_modifier(obj) is None]
+    if not curves:
+        return curves
+    with bpy.context.temp_override(selected_objects=curves, object=curves[0], active_object=curves[0]):
+        result = bpy.ops.object.ecm_extrudecurve(
+            target='SELECTED',
+            height=options["height"],
+            segments=options["segments"],
+            top_cap=options["top_cap"],
+            bottom_cap=options["bottom_cap"],
+        )
+    if result != {'FINISHED'}:
+        raise RuntimeError("object.ecm_extrudecurve failed")
+    if options["inputs"]:
+        for obj in curves:
+            addon.ecm_set_modifier_inputs(addon.ecm_find_modifier(obj), options["inputs"])
+    return curves
+
+
+def bake(curves, join):
+    """Bake the extruded curves to meshes, returning the new mesh objects"""
+    before = set(bpy.data.objects)
+    with bpy.context.temp_override(selected_objects=curves, object=curves[0], active_object=curves[0]):
+        result = bpy.ops.object.ecm_bake_meshes(join=join, remove_source=True)
+    if result != {'FINISHED'}:
+        raise RuntimeError("object.ecm_bake_meshes failed")
+    return [obj for obj in bpy.data.objects if obj not in before]
+
+
+def process_file(addon, path, output, options):
+    """Extrude ``path`` and write it to ``output``, returning its result record"""
+    start = time.perf_counter()
+    curves = import_curves(path)
+    if not curves:
+        raise RuntimeError("no curve objects")
+    added = apply_ecm(addon, curves, options)
+
+    fmt = options["format"]
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    vertices = None
+    if fmt != "blend":
+        meshes = bake(curves, options["join"])
+        vertices = sum(len(obj.data.vertices) for obj in meshes)
+    if fmt in ("blend", "baked"):
+        bpy.ops.wm.save_as_mainfile(filepath=output, copy=True, compress=True)
+    elif fmt == "obj":
+        bpy.ops.wm.obj_export(filepath=output, export_selected_objects=False, export_materials=False)
+    else:
+        bpy.ops.export_scene.gltf(filepath=output, export_format='GLB', export_apply=True)
+
+    return {
+        "path": path,
+        "ok": True,
+        "output": output,
+        "objects": len(curves),
+        "already_extruded": len(curves) - len(added),
+        "vertices": vertices,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def send(record):
+    sys.stdout.write(PROTOCOL_PREFIX + json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+def worker_main(options):
+    """Read ``{"path", "output"}`` jobs from stdin, one JSON object per line, and answer with a result line each"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from addon_loader import load_addon
+
+    addon = load_addon()
+    send({"ready": True, "pid": os.getpid()})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            record = process_file(addon, job["path"], job["output"], options)
+        except Exception as exc:
+            record = {"path": job["path"], "ok": False, "error": str(exc)}
+        send(record)
+
+
+# ------------------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------------------
+class Worker:
+    """One background Blender process, restarted when it dies"""
+
+    def __init__(self, slot, args, options):
+        self.slot = slot
+        self.args = args
+        self.options = options
+        self.process = None
+        self.tail = []
+        self.files = self.failed = self.objects = self.restarts = 0
+        self.busy = 0.0
+
+    def command(self):
+        command = [self.args.blender, "--background"]
+        if not self.args.user_prefs:
+            command.append("--factory-startup")
+        command += ["--threads", str(self.args.threads), "--python", os.path.abspath(__file__),
+                    "--", "--worker", json.dumps(self.options)]
+        return command
+
+    def start(self):
+        env = dict(os.environ)
+        if self.args.cache:
+            env["ECM_CACHE_DIR"] = os.path.abspath(self.args.cache)
+            env["ECM_CACHE_SIZE"] = str(self.args.cache_size)
+        self.process = subprocess.Popen(
+            self.command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1, env=env,
+        )
+        if self.read() is None:
+            self.process = None
+            raise RuntimeError("worker %d did not start: %s" % (self.slot, " | ".join(self.tail)))
+
+    def read(self):
+        """Next protocol record from the worker, None once it has exited"""
+        for line in self.process.stdout:
+            if line.startswith(PROTOCOL_PREFIX):
+                return json.loads(line[len(PROTOCOL_PREFIX):])
+            self.tail = (self.tail + [line.rstrip()])[-10:]
+        self.process.wait()
+        return None
+
+    def run(self, path, output):
+        if self.process is None:
+            self.start()
+        self.tail = []
+        timer = threading.Timer(self.args.timeout, self.process.kill) if self.args.timeout else None
+        start = time.perf_counter()
+        if timer:
+            timer.start()
+        try:
+            self.process.stdin.write(json.dumps({"path": path, "output": output}) + "\n")
+            self.process.stdin.flush()
+            record = self.read()
+        except (BrokenPipeError, OSError):
+            record = None
+        finally:
+            if timer:
+                timer.cancel()
+        self.busy += time.perf_counter() - start
+
+        if record is None:
+            code = self.process.poll()
+            error = "worker exited with code %s" % code
+            if self.tail:
+                error += ": " + " | ".join(self.tail[-3:])
+            record = {"path": path, "ok": False, "error": error}
+            self.process = None
+            self.restarts += 1
+        record["worker"] = self.slot
+        self.files += 1
+        if record["ok"]:
+            self.objects += record["objects"]
+        else:
+            self.failed += 1
+        return record
+
+    def stop(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process = None
+
+    def summary(self):
+        return {
+            "worker": self.slot,
+            "files": self.files,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "objects": self.objects,
+            "busy_seconds": self.busy,
+            "files_per_second": self.files / self.busy if self.busy > 0.0 else 0.0,
+            "objects_per_second": self.objects / self.busy if self.busy > 0.0 else 0.0,
+        }
+
+
+def input_files(paths, recursive):
+    """Yield ``(absolute path, path relative to the directory it was found in)``
+
+    Files given directly are relative to their own directory.
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path), os.path.basename(path)
+            continue
+        if recursive:
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(INPUT_EXTENSIONS):
+                        full = os.path.join(root, name)
+                        yield os.path.abspath(full), os.path.relpath(full, path)
+        else:
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(INPUT_EXTENSIONS):
+                    yield os.path.abspath(os.path.join(path, name)), name
+
+
+def output_paths(files, output_dir, fmt):
+    """Return ``(jobs, clashes)`` for the ``(path, relative path)`` pairs of input_files()
+
+    ``jobs`` lists ``(path, output)``, the relative path mirrored under
+    ``output_dir`` with the extension of ``fmt``. ``clashes`` lists
+    ``(path, output, earlier path)`` for the inputs whose output an earlier
+    input already writes, they are not processed.
+    """
+    jobs, clashes, claimed = [], [], {}
+    for path, relative in files:
+        output = os.path.join(output_dir, os.path.splitext(relative)[0] + OUTPUT_EXTENSIONS[fmt])
+        key = os.path.normcase(os.path.abspath(output))
+        if key in claimed:
+            clashes.append((path, output, claimed[key]))
+        else:
+            claimed[key] = path
+            jobs.append((path, output))
+    return jobs, clashes
+
+
+def input_value(text):
+    """NAME=VALUE for --set, VALUE parsed as JSON when possible"""
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected NAME=VALUE, got %r" % text)
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def parse_args(argv):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        prog="python3 tools/batch_extrude.py",
+        description="Extrude every curve of many files with ECM, using a pool of background Blender processes.",
+    )
+    parser.add_argument("paths", nargs="+", help=".blend, .svg or .dxf files or directories")
+    parser.add_argument("--output-dir", "-o", required=True, help="directory for the results")
+    parser.add_argument("--format", choices=sorted(OUTPUT_EXTENSIONS), default="baked",
+                        help="blend keeps the modifiers, baked/obj/glb write meshes")
+    parser.add_argument("--join", action="store_true", help="bake the curves of a file into a single mesh")
+    parser.add_argument("--recursive", "-r", action="store_true", help="descend into subdirectories")
+    parser.add_argument("--height", type=float, default=1.0)
+    parser.add_argument("--segments", type=int, default=1)
+    parser.add_argument("--no-top-cap", dest="top_cap", action="store_false")
+    parser.add_argument("--no-bottom-cap", dest="bottom_cap", action="store_false")
+    parser.add_argument("--set", dest="inputs", type=input_value, action="append", default=[],
+                        metavar="NAME=VALUE", help="any other modifier input, e.g. \"Simplify Tolerance=0.001\"")
+    parser.add_argument("--jobs", "-j", type=int, default=cores, help="Blender processes, one per core by default")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="threads per Blender process, cores / jobs by default")
+    parser.add_argument("--timeout", type=float, default=0.0, help="seconds before a file's worker is killed")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--user-prefs", action="store_true",
+                        help="keep the user's preferences and extensions (e.g. for DXF import)")
+    parser.add_argument("--cache", help="geometry cache directory shared by the workers, reused across runs")
+    parser.add_argument("--cache-size", type=int, default=2048, help="geometry cache size limit in MB")
+    parser.add_argument("--report", help="write per-file results and the worker summary as JSON")
+    args = parser.parse_args(argv)
+    args.jobs = max(1, args.jobs)
+    if args.threads <= 0:
+        args.threads = max(1, cores // args.jobs)
+    return args
+
+
+def main_driver(argv):
+    args = parse_args(argv)
+    if shutil.which(args.blender) is None:
+        sys.exit("batch_extrude: Blender executable %r not found, use --blender or $BLENDER" % args.blender)
+    files = list(input_files(args.paths, args.recursive))
+    if not files:
+        sys.exit("batch_extrude: no input files")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    options = {
+        "output_dir": os.path.abspath(args.output_dir),
+        "format": args.format,
+        "join": args.join,
+        "height": args.height,
+        "segments": args.segments,
+        "top_cap": args.top_cap,
+        "bottom_cap": args.bottom_cap,
+        "inputs": dict(args.inputs),
+    }
+    jobs, clashes = output_paths(files, options["output_dir"], args.format)
+    results = []
+    for path, output, earlier in clashes:
+        results.append({"path": path, "ok": False, "error": "%s is already written by %s" % (output, earlier)})
+        print("[%*d/%d] FAIL  %s  %s" % (len(str(len(files))), len(results), len(files), results[-1]["error"], path),
+              flush=True)
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    workers = [Worker(slot, args, options) for slot in range(min(args.jobs, len(jobs)))]
+    lock = threading.Lock()
+
+    def drain(worker):
+        while True:
+            try:
+                path, output = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                record = worker.run(path, output)
+            except RuntimeError as exc:
+                record = {"path": path, "ok": False, "error": str(exc), "worker": worker.slot}
+                worker.files += 1
+                worker.failed += 1
+            with lock:
+                results.append(record)
+                if record["ok"]:
+                    status = "ok    %d object(s), %d already extruded, %.2f s" % (
+                        record["objects"], record["already_extruded"], record["seconds"])
+                else:
+                    status = "FAIL  %s" % record["error"]
+                print("[%*d/%d] worker %d  %s  %s" % (len(str(len(files))), len(results), len(files),
+                                                      worker.slot, status, path), flush=True)
+        worker.stop()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=drain, args=(worker,)) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    summaries = [worker.summary() for worker in workers]
+    print("\nworker  files  failed  restarts  objects  busy s  objects/s")
+    for s in summaries:
+        print("%6d  %5d  %6d  %8d  %7d  %6.1f  %9.1f" % (
+            s["worker"], s["files"], s["failed"], s["restarts"], s["objects"], s["busy_seconds"], s["objects_per_second"]))
+    failed = sum(s["failed"] for s in summaries) + len(clashes)
+    objects = sum(s["objects"] for s in summaries)
+    print("batch_extrude: %d file(s), %d failed, %d object(s) in %.1f s (%.1f files/s, %.1f objects/s) with %d worker(s)" % (
+        len(files), failed, objects, elapsed, len(files) / elapsed, objects / elapsed, len(workers)))
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "options": options,
+                "jobs": len(workers),
+                "threads": args.threads,
+                "seconds": elapsed,
+                "workers": summaries,
+                "results": sorted(results, key=lambda r: r["path"]),
+            }, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    if bpy is not None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+        if argv[:1] != ["--worker"] or len(argv) != 2:
+            sys.exit("batch_extrude: run with plain python3, Blender workers are started by the script")
+        worker_main(json.loads(argv[1]))
+    else:
+        main_driver(sys.argv[1:])
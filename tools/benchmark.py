@@ -0,0 +1,246 @@
+"""Headless benchmark for the ECM_ExtrudeCurve node group.
+
+Run from a shell, no display needed:
+
+    blender --background --factory-startup --python tools/benchmark.py -- --output results.json
+
+Every case builds a synthetic curve object, adds the modifier through the
+``object.ecm_extrudecurve`` operator and times the depsgraph evaluation.
+Results are written as JSON or CSV (picked from the output extension) so
+runs of different releases can be compared.
+
+Background Blender only evaluates the viewport depsgraph, so Is Viewport is
+true in every case. The viewport only inputs (Viewport Segments, Auto LOD,
+Instanced Preview) are kept at the values renders use, which makes the
+viewport follow the same path through the node group as a render.
+Memory is the resident set size right before and after the evaluation,
+while the evaluated mesh is still held by the depsgraph.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from addon_loader import load_addon  # noqa: E402
+
+
+# ------------------------------------------------------------------------
+# Scene setup
+# ------------------------------------------------------------------------
+def reset_scene():
+    """Remove every object and orphaned datablock from the previous case"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for curve in list(bpy.data.curves):
+        bpy.data.curves.remove(curve)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+def make_curve_object(points, splines, name="ECM_Benchmark"):
+    """Create a curve object with cyclic poly splines laid out on a grid
+
+    Each spline is a wavy outline of ``points`` points so that the fill has
+    real work to do instead of triangulating a regular polygon.
+    """
+    curve = bpy.data.curves.new(name, type='CURVE')
+    curve.dimensions = '3D'
+    columns = max(1, math.ceil(math.sqrt(splines)))
+    for i in range(splines):
+        ox = (i % columns) * 3.0
+        oy = (i // columns) * 3.0
+        spline = curve.splines.new('POLY')
+        spline.points.add(points - 1)
+        co = []
+        for j in range(points):
+            angle = 2.0 * math.pi * j / points
+            radius = 1.0 + 0.1 * math.sin(7.0 * angle)
+            co.extend((ox + radius * math.cos(angle), oy + radius * math.sin(angle), 0.0, 1.0))
+        spline.points.foreach_set("co", co)
+        spline.use_cyclic_u = True
+    obj = bpy.data.objects.new(name, curve)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def add_modifier(obj):
+    """Add the ECM modifier the same way the menu entry does"""
+    view_layer = bpy.context.view_layer
+    view_layer.objects.active = obj
+    obj.select_set(True)
+    with bpy.context.temp_override(object=obj, active_object=obj):
+        result = bpy.ops.object.ecm_extrudecurve()
+    if result != {'FINISHED'}:
+        raise RuntimeError("object.ecm_extrudecurve failed on %s" % obj.name)
+    return obj.modifiers[-1]
+
+
+# ------------------------------------------------------------------------
+# Measurement
+# ------------------------------------------------------------------------
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB"""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return usage / (1024.0 * 1024.0)
+    return usage / 1024.0
+
+
+def current_rss_mb():
+    """Resident set size of this process right now in MiB, None where it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+
+
+def evaluate(obj, repeat):
+    """Re-evaluate ``obj`` ``repeat`` times and return timings and output counts"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    timings = []
+    for _ in range(repeat):
+        obj.update_tag(refresh={'OBJECT', 'DATA'})
+        start = time.perf_counter()
+        depsgraph.update()
+        timings.append(time.perf_counter() - start)
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    counts = (len(mesh.vertices), len(mesh.polygons)) if mesh is not None else (0, 0)
+    obj_eval.to_mesh_clear()
+    return timings, counts
+
+
+def run_case(points, splines, segments, top_cap, bottom_cap, instanced, repeat):
+    reset_scene()
+    obj = make_curve_object(points, splines)
+    mod = add_modifier(obj)
+    addon = load_addon()
+    addon.ecm_set_modifier_inputs(mod, dict(
+        addon.ECM_RENDER_INPUTS,
+        **{
+            "Segments": segments,
+            "Top Cap": top_cap,
+            "Bottom Cap": bottom_cap,
+            "Instanced Segments": instanced,
+        }))
+
+    # the peak (ru_maxrss) only grows over the whole run, the current size tells what this case holds
+    rss_before = current_rss_mb()
+    timings, (verts, faces) = evaluate(obj, repeat)
+    rss_after = current_rss_mb()
+    return {
+        "points": points,
+        "splines": splines,
+        "segments": segments,
+        "top_cap": top_cap,
+        "bottom_cap": bottom_cap,
+        "instanced": instanced,
+        "repeat": repeat,
+        "time_min": min(timings),
+        "time_median": statistics.median(timings),
+        "time_max": max(timings),
+        "vertices": verts,
+        "faces": faces,
+        "rss_mb": rss_after,
+        "rss_growth_mb": rss_after - rss_before if rss_after is not None else None,
+        "process_peak_rss_mb": peak_rss_mb(),
+    }
+
+
+# ------------------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------------------
+def int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+CAP_MODES = {
+    "both": (True, True),
+    "top": (True, False),
+    "bottom": (False, True),
+    "none": (False, False),
+}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="blender --background --python tools/benchmark.py --",
+        description="Time ECM_ExtrudeCurve evaluation over a parameter sweep.",
+    )
+    parser.add_argument("--output", "-o", default="ecm_benchmark.json",
+                        help="result file, .json or .csv")
+    parser.add_argument("--points", type=int_list, default=[100, 1000, 10000],
+                        help="points per spline, comma separated")
+    parser.add_argument("--splines", type=int_list, default=[1, 16],
+                        help="spline counts, comma separated")
+    parser.add_argument("--segments", type=int_list, default=[1, 10, 100],
+                        help="Segments values, comma separated")
+    parser.add_argument("--caps", default="both,none",
+                        help="cap modes to sweep: " + ", ".join(CAP_MODES))
+    parser.add_argument("--topology", default="grid",
+                        help="grid, instanced or both")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="evaluations per case")
+    return parser.parse_args(argv)
+
+
+def write_results(path, meta, rows):
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w") as f:
+            json.dump({"meta": meta, "results": rows}, f, indent=2)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    load_addon()
+
+    caps = [CAP_MODES[c.strip()] for c in args.caps.split(",") if c.strip()]
+    topologies = {"grid": [False], "instanced": [True], "both": [False, True]}[args.topology]
+
+    meta = {
+        "blender": bpy.app.version_string,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "threads": os.cpu_count(),
+        "evaluation": "viewport, viewport only inputs at their render values",
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    rows = []
+    sweep = itertools.product(args.points, args.splines, args.segments, caps, topologies)
+    for points, splines, segments, (top_cap, bottom_cap), instanced in sweep:
+        row = run_case(points, splines, segments, top_cap, bottom_cap, instanced, args.repeat)
+        rows.append(row)
+        print("ECM bench: points=%d splines=%d segments=%d caps=%d%d instanced=%d  %.4fs  %d verts" % (
+            points, splines, segments, top_cap, bottom_cap, instanced, row["time_median"], row["vertices"]))
+
+    write_results(args.output, meta, rows)
+    print("ECM bench: wrote %d results to %s" % (len(rows), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Regenerate or verify the bundled ECM node group asset.
+
+The node group shipped in assets/ecm_extrudecurve.blend is generated from
+ecm_build_node_group(), which stays the reference definition. Run this
+after every change to the builder:
+
+    blender --background --factory-startup --python tools/build_asset.py
+
+and with ``-- --check`` (for example in CI) to fail when the asset no
+longer matches the builder.
+"""
+
+import argparse
+import os
+import sys
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from addon_loader import load_addon  # noqa: E402
+
+
+def build(addon, path):
+    node_group = addon.ecm_build_node_group()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    bpy.data.libraries.write(path, {node_group}, fake_user=True, compress=True)
+    print("ECM asset: wrote %s" % path)
+
+
+def check(addon, path):
+    if not os.path.isfile(path):
+        print("ECM asset: %s is missing" % path)
+        return False
+    built = addon.ecm_build_node_group()
+    with bpy.data.libraries.load(path, link=True) as (data_from, data_to):
+        data_to.node_groups = [n for n in data_from.node_groups if n == addon.ECM_NODE_GROUP_NAME]
+    if not data_to.node_groups:
+        print("ECM asset: %s has no %s node group" % (path, addon.ECM_NODE_GROUP_NAME))
+        return False
+    found = data_to.node_groups[0]
+    if found.get("ecm_version", 0) != addon.ECM_GRAPH_VERSION:
+        print("ECM asset: graph version %d, expected %d, regenerate the asset" % (found.get("ecm_version", 0), addon.ECM_GRAPH_VERSION))
+        return False
+    if found.get("ecm_fingerprint") != addon.ecm_node_group_fingerprint(built):
+        print("ECM asset: node group differs from the builder, regenerate the asset")
+        return False
+    print("ECM asset: %s is up to date" % path)
+    return True
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender --background --python tools/build_asset.py --")
+    parser.add_argument("--check", action="store_true", help="only verify the asset against the builder")
+    args = parser.parse_args(argv)
+
+    addon = load_addon(register=False)
+    if args.check:
+        sys.exit(0 if check(addon, addon.ECM_ASSET_PATH) else 1)
+    build(addon, addon.ECM_ASSET_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Golden geometry and performance regression tests for the ECM node group.
+
+Evaluates the modifier over a fixed set of cases (open and cyclic splines,
+several splines, holes, negative Height, Segments from 1 to 1000, every cap
+combination, both side topologies) and compares each result with the
+stored reference: vertex and face counts, bounds, signed volume and how
+much of the surface faces outwards. Every case must also have Segments + 1
+distinct vertex heights, which catches rings welded together even when the
+reference was recorded from such a mesh, and the instanced side topology
+has to give the same counts, bounds and volume as the grid one.
+
+    blender --background --factory-startup --python tools/regression.py
+
+Record new references after an intended change of the output with
+``-- --update``. The reference file is shared and notes the Blender and
+graph version it was recorded with.
+
+Time budgets only mean something on the machine they were measured on, so
+they are kept apart, per machine, in regression_budgets.json. Record them
+with ``-- --update-budgets``. A case fails when it runs over the budget of
+this machine, timing is skipped on machines without budgets and when
+Blender or the graph changed since they were recorded.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from addon_loader import load_addon  # noqa: E402
+from benchmark import add_modifier, reset_scene  # noqa: E402
+
+
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression_reference.json")
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression_budgets.json")
+#relative tolerance of bounds, volume and outward share
+TOLERANCE = 1e-4
+#vertex heights closer than this (relative to the height) count as one ring
+RING_TOLERANCE = 1e-6
+
+
+# ------------------------------------------------------------------------
+# Cases
+# ------------------------------------------------------------------------
+def _outline(cx, cy, radius, points, clockwise=False):
+    co = []
+    for i in range(points):
+        angle = 2.0 * math.pi * i / points * (-1.0 if clockwise else 1.0)
+        co.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle), 0.0))
+    return co
+
+
+SHAPES = {
+    #name: [(points, cyclic, spline type)]
+    "square": [(_outline(0.0, 0.0, 1.0, 4), True, 'POLY')],
+    "circle": [(_outline(0.0, 0.0, 1.0, 8), True, 'BEZIER')],
+    "open": [([(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 1.0, 0.0), (1.0, 2.0, 0.0)], False, 'POLY')],
+    "multiple": [(_outline(3.0 * i, 0.0, 1.0, 6), True, 'POLY') for i in range(3)],
+    "hole": [(_outline(0.0, 0.0, 2.0, 16), True, 'POLY'), (_outline(0.0, 0.0, 1.0, 16, clockwise=True), True, 'POLY')],
+}
+HEIGHTS = (1.0, -1.0)
+SEGMENTS = (1, 2, 10, 1000)
+CAPS = ((True, True), (True, False), (False, True), (False, False))
+TOPOLOGIES = ("grid", "instanced")
+
+
+def case_name(shape, height, segments, top_cap, bottom_cap, topology):
+    return "%s h%+g s%d caps%d%d %s" % (shape, height, segments, top_cap, bottom_cap, topology)
+
+
+def cases():
+    for shape, height, segments, (top_cap, bottom_cap), topology in itertools.product(
+            SHAPES, HEIGHTS, SEGMENTS, CAPS, TOPOLOGIES):
+        yield case_name(shape, height, segments, top_cap, bottom_cap, topology), {
+            "shape": shape,
+            "height": height,
+            "segments": segments,
+            "top_cap": top_cap,
+            "bottom_cap": bottom_cap,
+            "instanced": topology == "instanced",
+        }
+
+
+def make_shape(shape):
+    curve = bpy.data.curves.new("ECM_Regression", type='CURVE')
+    curve.dimensions = '3D'
+    for co, cyclic, spline_type in SHAPES[shape]:
+        spline = curve.splines.new(spline_type)
+        if spline_type == 'BEZIER':
+            spline.bezier_points.add(len(co) - 1)
+            for point, position in zip(spline.bezier_points, co):
+                point.co = position
+                point.handle_left_type = point.handle_right_type = 'AUTO'
+        else:
+            spline.points.add(len(co) - 1)
+            for point, position in zip(spline.points, co):
+                point.co = position + (1.0,)
+        spline.use_cyclic_u = cyclic
+    obj = bpy.data.objects.new("ECM_Regression", curve)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+# ------------------------------------------------------------------------
+# Measurement
+# ------------------------------------------------------------------------
+def measure(mesh):
+    """Counts, bounds and orientation of an evaluated mesh"""
+    result = {"vertices": len(mesh.vertices), "faces": len(mesh.polygons)}
+    if not mesh.vertices:
+        return dict(result, bounds=None, volume=0.0, outward=0.0, rings=0)
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float64)
+    mesh.polygons.foreach_get("normal", normals)
+    normals = normals.reshape(-1, 3)
+    centers = np.empty(len(mesh.polygons) * 3, dtype=np.float64)
+    mesh.polygons.foreach_get("center", centers)
+    centers = centers.reshape(-1, 3)
+    areas = np.empty(len(mesh.polygons), dtype=np.float64)
+    mesh.polygons.foreach_get("area", areas)
+
+    low, high = co.min(axis=0), co.max(axis=0)
+    middle = (low + high) / 2.0
+    #divergence theorem, positive for a closed solid with outward normals
+    volume = float(np.sum(areas * np.einsum("ij,ij->i", centers - middle, normals)) / 3.0)
+    #walls should face away from the outline middle and caps away from the mid height, holes
+    #and concave outlines lower the share, which the reference records
+    walls = np.abs(normals[:, 2]) < 0.5
+    away = np.where(walls,
+                    np.einsum("ij,ij->i", normals[:, :2], centers[:, :2] - middle[:2]),
+                    normals[:, 2] * (centers[:, 2] - middle[2]))
+    outward = float(areas[away > 0.0].sum() / areas.sum()) if areas.sum() > 0.0 else 0.0
+    heights = np.unique(co[:, 2])
+    rings = 1 + int(np.count_nonzero(np.diff(heights) > RING_TOLERANCE * max(1.0, float(np.ptp(heights)))))
+    return dict(result, bounds=[low.tolist(), high.tolist()], volume=volume, outward=outward, rings=rings)
+
+
+def run_case(addon, params, repeat):
+    reset_scene()
+    obj = make_shape(params["shape"])
+    mod = add_modifier(obj)
+    addon.ecm_set_modifier_inputs(mod, {
+        "Height": params["height"],
+        "Segments": params["segments"],
+        "Top Cap": params["top_cap"],
+        "Bottom Cap": params["bottom_cap"],
+        "Instanced Segments": params["instanced"],
+    })
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    timings = []
+    for _ in range(repeat):
+        obj.update_tag(refresh={'OBJECT', 'DATA'})
+        start = time.perf_counter()
+        depsgraph.update()
+        timings.append(time.perf_counter() - start)
+    obj_eval = obj.evaluated_get(depsgraph)
+    result = measure(obj_eval.to_mesh())
+    obj_eval.to_mesh_clear()
+    result["seconds"] = statistics.median(timings)
+    return result
+
+
+# ------------------------------------------------------------------------
+# Comparison
+# ------------------------------------------------------------------------
+def _close(a, b):
+    return abs(a - b) <= TOLERANCE * max(1.0, abs(a), abs(b))
+
+
+def check_rings(result, params):
+    """Return a problem when the side walls don't have one ring of vertices per segment boundary"""
+    if result["vertices"] and result["rings"] != params["segments"] + 1:
+        return ["rings %d, expected %d (rings welded together?)" % (result["rings"], params["segments"] + 1)]
+    return []
+
+
+def compare(result, reference, budget=None):
+    """Return the differences between ``result`` and ``reference`` as readable strings
+
+    ``budget`` is the time budget of the case on this machine, None skips the timing.
+    """
+    problems = []
+    for key in ("vertices", "faces"):
+        if result[key] != reference[key]:
+            problems.append("%s %d, expected %d" % (key, result[key], reference[key]))
+    if (result["bounds"] is None) != (reference["bounds"] is None):
+        problems.append("bounds %s, expected %s" % (result["bounds"], reference["bounds"]))
+    elif result["bounds"] is not None:
+        found = [v for corner in result["bounds"] for v in corner]
+        expected = [v for corner in reference["bounds"] for v in corner]
+        if not all(_close(a, b) for a, b in zip(found, expected)):
+            problems.append("bounds %s, expected %s" % (result["bounds"], reference["bounds"]))
+    for key in ("volume", "outward"):
+        if not _close(result[key], reference[key]):
+            problems.append("%s %.6g, expected %.6g (flipped normals?)" % (key, result[key], reference[key]))
+    if budget is not None and result["seconds"] > budget:
+        problems.append("%.4f s, over the %.4f s budget" % (result["seconds"], budget))
+    return problems
+
+
+def compare_topologies(results):
+    """Yield ``(case name, problems)`` for the instanced cases of ``results`` that differ from their grid case
+
+    Both side topologies build the same solid, only the way the walls are
+    made differs.
+    """
+    for name, result in results.items():
+        grid = results.get(name[:-len("instanced")] + "grid") if name.endswith(" instanced") else None
+        if grid is not None:
+            problems = compare(result, grid)
+            if problems:
+                yield name, problems
+
+
+# ------------------------------------------------------------------------
+# Time budgets
+# ------------------------------------------------------------------------
+def machine_id():
+    """Name the machine the budgets were measured on"""
+    return "%s %s %s, %d threads" % (platform.node(), platform.system(), platform.machine(), os.cpu_count() or 0)
+
+
+def load_budgets(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["machines"]
+
+
+def machine_budgets(budgets, graph_version):
+    """Return ``({case name: seconds}, None)`` for this machine, or ``(None, why timing is skipped)``"""
+    entry = budgets.get(machine_id())
+    if entry is None:
+        return None, "no budgets for %s, record them with -- --update-budgets" % machine_id()
+    if entry["blender"] != bpy.app.version_string or entry["graph_version"] != graph_version:
+        return None, "budgets recorded with Blender %s and graph version %d, record them again" % (
+            entry["blender"], entry["graph_version"])
+    return entry["cases"], None
+
+
+# ------------------------------------------------------------------------
+# Command line
+# ------------------------------------------------------------------------
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="blender --background --python tools/regression.py --",
+        description="Compare ECM_ExtrudeCurve output and evaluation time against stored references.",
+    )
+    parser.add_argument("--reference", default=REFERENCE_PATH, help="reference file")
+    parser.add_argument("--update", action="store_true", help="record the current results as the new references")
+    parser.add_argument("--budgets", default=BUDGETS_PATH, help="time budget file, budgets are kept per machine")
+    parser.add_argument("--update-budgets", action="store_true",
+                        help="record time budgets for this machine instead of comparing")
+    parser.add_argument("--budget-factor", type=float, default=2.0,
+                        help="with --update-budgets, the time budget as a multiple of the measured time")
+    parser.add_argument("--no-timing", action="store_true", help="skip the time budget checks")
+    parser.add_argument("--repeat", type=int, default=3, help="evaluations per case, the median is timed")
+    parser.add_argument("--filter", "-k", default="", help="only run cases whose name contains this text")
+    return parser.parse_args(argv)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+    addon = load_addon()
+
+    references = {}
+    if os.path.isfile(args.reference):
+        with open(args.reference) as f:
+            stored = json.load(f)
+        references = stored["cases"]
+        if (stored["blender"], stored["graph_version"]) != (bpy.app.version_string, addon.ECM_GRAPH_VERSION):
+            print("ECM regression: references recorded with Blender %s and graph version %d, running Blender %s "
+                  "and graph version %d" % (stored["blender"], stored["graph_version"],
+                                            bpy.app.version_string, addon.ECM_GRAPH_VERSION))
+    elif not args.update:
+        print("ECM regression: %s is missing, record it with -- --update" % args.reference)
+        sys.exit(1)
+
+    budgets = load_budgets(args.budgets)
+    timing = None
+    if not (args.no_timing or args.update or args.update_budgets):
+        timing, reason = machine_budgets(budgets, addon.ECM_GRAPH_VERSION)
+        if timing is None:
+            print("ECM regression: timing skipped, %s" % reason)
+    recorded = {}
+
+    failed = missing = 0
+    measured = {}
+    selected = [(name, params) for name, params in cases() if args.filter in name]
+    for name, params in selected:
+        result = run_case(addon, params, args.repeat)
+        seconds = result.pop("seconds")
+        ring_problems = check_rings(result, params)
+        del result["rings"]
+        measured[name] = dict(result)
+        if args.update or args.update_budgets:
+            if ring_problems:
+                failed += 1
+                print("ECM regression: %-40s FAIL  %s, not recorded" % (name, "; ".join(ring_problems)))
+                continue
+            if args.update:
+                references[name] = result
+            if args.update_budgets:
+                recorded[name] = max(seconds * args.budget_factor, 0.001)
+            print("ECM regression: %-40s recorded" % name)
+            continue
+        if name not in references:
+            missing += 1
+            print("ECM regression: %-40s NO REFERENCE" % name)
+            continue
+        result["seconds"] = seconds
+        problems = ring_problems + compare(result, references[name], timing.get(name) if timing is not None else None)
+        failed += bool(problems)
+        print("ECM regression: %-40s %s" % (name, "FAIL  " + "; ".join(problems) if problems else "ok"))
+
+    mismatched = list(compare_topologies(measured))
+    for name, problems in mismatched:
+        print("ECM regression: %-40s FAIL  against the grid case: %s" % (name, "; ".join(problems)))
+    failed += len(mismatched)
+    if args.update and mismatched:
+        print("ECM regression: grid and instanced results differ, %s left as it was" % args.reference)
+        sys.exit(1)
+
+    if args.update:
+        with open(args.reference, "w") as f:
+            json.dump({
+                "blender": bpy.app.version_string,
+                "graph_version": addon.ECM_GRAPH_VERSION,
+                "cases": dict(sorted(references.items())),
+            }, f, indent=1)
+        print("ECM regression: recorded %d case(s) in %s" % (len(selected) - failed, args.reference))
+    if args.update_budgets:
+        entry = budgets.get(machine_id())
+        if entry is None or (entry["blender"], entry["graph_version"]) != (bpy.app.version_string, addon.ECM_GRAPH_VERSION):
+            entry = {"cases": {}}
+        entry.update(blender=bpy.app.version_string, graph_version=addon.ECM_GRAPH_VERSION)
+        entry["cases"] = dict(sorted(dict(entry["cases"], **recorded).items()))
+        budgets[machine_id()] = entry
+        with open(args.budgets, "w") as f:
+            json.dump({"machines": dict(sorted(budgets.items()))}, f, indent=1)
+        print("ECM regression: recorded %d budget(s) for %s in %s" % (len(recorded), machine_id(), args.budgets))
+    if args.update or args.update_budgets:
+        if failed:
+            print("ECM regression: %d case(s) failed and were not recorded" % failed)
+            sys.exit(1)
+        return
+    print("ECM regression: %d case(s), %d failed, %d without reference" % (len(selected), failed, missing))
+    sys.exit(1 if failed or missing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Upgrade the ECM modifiers of every .blend file in a directory.
+
+Swaps outdated ECM_ExtrudeCurve node groups for the current graph (see
+ecm_upgrade_modifiers()) and saves the files that changed:
+
+    blender --background --factory-startup --python tools/upgrade_files.py -- /path/to/scenes --recursive
+"""
+
+import argparse
+import os
+import sys
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from addon_loader import load_addon  # noqa: E402
+
+
+def blend_files(paths, recursive):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        if recursive:
+            for root, _dirs, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith(".blend"):
+                        yield os.path.join(root, name)
+        else:
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".blend"):
+                    yield os.path.join(path, name)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender --background --python tools/upgrade_files.py --")
+    parser.add_argument("paths", nargs="+", help=".blend files or directories")
+    parser.add_argument("--recursive", "-r", action="store_true", help="descend into subdirectories")
+    parser.add_argument("--include-edited", action="store_true", help="also replace hand edited node groups")
+    parser.add_argument("--dry-run", action="store_true", help="report without saving")
+    args = parser.parse_args(argv)
+
+    addon = load_addon()
+    total = failed = 0
+    for path in blend_files(args.paths, args.recursive):
+        try:
+            bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+            changed = addon.ecm_upgrade_modifiers(args.include_edited)
+            if changed and not args.dry_run:
+                bpy.ops.wm.save_mainfile()
+        except Exception as exc:
+            failed += 1
+            print("ECM upgrade: %s failed: %s" % (path, exc))
+            continue
+        total += changed
+        print("ECM upgrade: %s: %d upgraded" % (path, changed))
+
+    print("ECM upgrade: %d modifier(s) and group node(s) upgraded, %d file(s) failed" % (total, failed))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()